@@ -0,0 +1,103 @@
+"""
+Closed-loop HTTP load test of the API's read routes.
+
+Usage:
+    cd Resume-Screening
+    uvicorn main:app --app-dir resume_screening_automation/backend --workers 1
+    python benchmarks/api_load.py --run-id 12 --job-id 3
+    python benchmarks/api_load.py --run-id 12 --job-id 3 --concurrency 200 --duration 30
+
+Each of --concurrency clients sends its next request as soon as the previous
+one returns, cycling through the paths below (the calls Streamlit makes
+while a run is polled and its results are browsed). Reports requests/sec
+and latency percentiles; any non-2xx response counts as an error.
+
+Needs httpx (pip install httpx) — a dev dependency, not in requirements.txt.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import time
+from dotenv import load_dotenv
+import httpx
+
+
+def _paths(run_id: int, job_id: int) -> list:
+    return [
+        f"/screening/runs/{run_id}",
+        "/jobs",
+        f"/jobs/{job_id}",
+        f"/screening/results/{job_id}?limit=50",
+    ]
+
+
+async def _client(http: httpx.AsyncClient, paths: list, deadline: float, stats: dict):
+    for path in itertools.cycle(paths):
+        if time.perf_counter() >= deadline:
+            return
+        start = time.perf_counter()
+        try:
+            response = await http.get(path)
+            ok = response.is_success
+        except httpx.HTTPError:
+            ok = False
+        stats["latencies"].append((time.perf_counter() - start) * 1000)
+        if not ok:
+            stats["errors"] += 1
+
+
+async def run(base_url: str, api_key: str, paths: list, concurrency: int, duration: float) -> dict:
+    stats = {"latencies": [], "errors": 0}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers={"x-api-key": api_key},
+                                 limits=limits, timeout=60) as http:
+        # Warm up connections and the server's pools before timing
+        await asyncio.gather(*(http.get(path) for path in paths))
+
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            # Stagger the starting path so clients don't all hit the same route at once
+            _client(http, paths[i % len(paths):] + paths[:i % len(paths)], deadline, stats)
+            for i in range(concurrency)
+        ))
+        stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def report(stats: dict, concurrency: int):
+    latencies = sorted(stats["latencies"])
+    if not latencies:
+        print("No requests completed.")
+        return
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    print(f"Concurrency     {concurrency}")
+    print(f"Requests        {len(latencies):,} in {stats['elapsed']:.1f}s ({stats['errors']} errors)")
+    print(f"Requests/sec    {len(latencies) / stats['elapsed']:,.1f}")
+    print(f"Latency (ms)    p50 {statistics.median(latencies):.1f}  p95 {pct(0.95):.1f}  "
+          f"p99 {pct(0.99):.1f}  max {latencies[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--run-id", type=int, required=True, help="an existing run to poll")
+    parser.add_argument("--job-id", type=int, required=True, help="an existing job to read")
+    parser.add_argument("--concurrency", type=int, default=100, help="simultaneous clients (default 100)")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run (default 20)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    API_KEY = os.getenv("API_KEY")
+    if not API_KEY:
+        raise RuntimeError("API_KEY not set in .env")
+
+    stats = asyncio.run(run(args.base_url, API_KEY, _paths(args.run_id, args.job_id),
+                            args.concurrency, args.duration))
+    report(stats, args.concurrency)
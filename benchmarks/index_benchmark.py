@@ -0,0 +1,306 @@
+"""
+Query plans and latency of the hot lookup paths, before and after the
+migration indexes, on synthetic data.
+
+Usage:
+    cd Resume-Screening
+    python benchmarks/index_benchmark.py                 # 1M rows per table
+    python benchmarks/index_benchmark.py --rows 200000 --explain
+
+Everything happens in a scratch schema (index_bench) of DATABASE_URL, which
+is dropped and recreated on every run; the real tables are not touched. Use
+a scratch database all the same — loading 4M rows takes a while and a lot
+of WAL.
+
+Phase "before" has primary keys only. Phase "after" applies the index
+migrations listed in BENCH_MIGRATIONS, read from migrations/, so the numbers
+are for the exact DDL that ships. A migration that drops an index is timed
+across: the lookups run just before it too, so its effect is measured against
+the same "after" numbers. Then each index is dropped in turn, inside a
+transaction that is rolled back, and the lookups are timed without it: an
+index whose absence changes no plan and slows no lookup is not earning its
+write cost.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from migrate import load_migrations, split_statements  # noqa: E402
+
+SCHEMA = "index_bench"
+BENCH_MIGRATIONS = (5, 12, 17, 18, 22)
+
+JOBS = 500               # resume_results spread over this many jobs
+PIPELINE_JOBS = 2000     # candidate_pipeline / email_queue spread
+RESUMES_PER_JOB_ROW = 3  # resume_id range = rows / 3 → re-screened resumes
+
+TABLES = """
+CREATE TABLE resume_results (
+    result_id      SERIAL PRIMARY KEY,
+    resume_id      INTEGER,
+    job_id         INTEGER,
+    extracted_data JSON,
+    score          INTEGER,
+    decision       TEXT,
+    processed_at   TIMESTAMP
+);
+CREATE TABLE email_logs (
+    log_id      SERIAL PRIMARY KEY,
+    email       TEXT NOT NULL,
+    template_id INTEGER NOT NULL,
+    job_id      INTEGER,
+    sent_at     TIMESTAMP
+);
+CREATE TABLE candidate_pipeline (
+    pipeline_id SERIAL PRIMARY KEY,
+    job_id      INTEGER NOT NULL,
+    email       TEXT NOT NULL,
+    full_name   TEXT,
+    score       INTEGER,
+    stage       TEXT NOT NULL DEFAULT 'new',
+    added_at    TIMESTAMP
+);
+CREATE TABLE email_queue (
+    queue_id    SERIAL PRIMARY KEY,
+    email       TEXT NOT NULL,
+    template_id INTEGER NOT NULL,
+    job_id      INTEGER,
+    queued_at   TIMESTAMP,
+    status      TEXT DEFAULT 'pending'
+)
+"""
+
+# 5% failed extractions, 1 legacy (NULL job_id) email log in 5,
+# 2.5% of queued emails still pending
+LOAD = """
+INSERT INTO resume_results (resume_id, job_id, extracted_data, score, decision, processed_at)
+SELECT 1 + (random() * %(resumes)s)::int,
+       1 + i %% {jobs},
+       CASE WHEN random() < 0.05 THEN NULL
+            ELSE json_build_object('experience_years', i %% 15, 'skills', json_build_array('python', 'sql')) END,
+       (random() * 100)::int,
+       CASE WHEN random() < 0.3 THEN 'shortlisted' ELSE 'rejected' END,
+       NOW() - i * INTERVAL '1 second'
+  FROM generate_series(1, %(rows)s) i;
+
+INSERT INTO email_logs (email, template_id, job_id, sent_at)
+SELECT 'cand' || (i / 6) || '@example.com',
+       1 + i %% 6,
+       CASE WHEN i %% 5 = 0 THEN NULL ELSE 1 + i %% {jobs} END,
+       NOW() - i * INTERVAL '1 second'
+  FROM generate_series(1, %(rows)s) i;
+
+INSERT INTO candidate_pipeline (job_id, email, full_name, score, stage, added_at)
+SELECT 1 + i %% {pipeline_jobs}, 'cand' || i || '@example.com', 'Candidate ' || i,
+       (random() * 100)::int, 'new', NOW() - i * INTERVAL '1 second'
+  FROM generate_series(1, %(rows)s) i;
+
+INSERT INTO email_queue (email, template_id, job_id, queued_at, status)
+SELECT 'cand' || i || '@example.com', 1 + i %% 6, 1 + i %% {pipeline_jobs},
+       NOW() - i * INTERVAL '1 second',
+       CASE WHEN i %% 40 = 0 THEN 'pending' WHEN i %% 40 = 1 THEN 'failed' ELSE 'sent' END
+  FROM generate_series(1, %(rows)s) i
+""".format(jobs=JOBS, pipeline_jobs=PIPELINE_JOBS)
+
+
+def _queries(rows: int) -> list:
+    """(label, sql, params factory) — the lookups the app runs per resume / per job."""
+    resumes = max(1, rows // RESUMES_PER_JOB_ROW)
+    emails = max(1, rows // 6)
+    return [
+        ("Already screened for job? (worker prefetch, 50 resumes)",
+         "SELECT resume_id FROM resume_results WHERE job_id = %(job)s "
+         "AND resume_id = ANY(%(ids)s) AND extracted_data IS NOT NULL",
+         lambda r: {"job": r.randint(1, JOBS), "ids": [r.randint(1, resumes) for _ in range(50)]}),
+        ("Screened for job? (talent-pool anti-join probe)",
+         "SELECT 1 FROM resume_results WHERE resume_id = %(resume)s "
+         "AND job_id = %(job)s AND extracted_data IS NOT NULL LIMIT 1",
+         lambda r: {"resume": r.randint(1, resumes), "job": r.randint(1, JOBS)}),
+        ("Stored extractions of one resume (resume_id only)",
+         "SELECT result_id, job_id FROM resume_results WHERE resume_id = %(resume)s "
+         "AND extracted_data IS NOT NULL",
+         lambda r: {"resume": r.randint(1, resumes)}),
+        ("Results page, newest first (keyset)",
+         "SELECT result_id, score FROM resume_results WHERE job_id = %(job)s "
+         "ORDER BY processed_at DESC, result_id DESC LIMIT 500",
+         lambda r: {"job": r.randint(1, JOBS)}),
+        ("Results page, best score first (keyset)",
+         "SELECT result_id, score FROM resume_results WHERE job_id = %(job)s AND score IS NOT NULL "
+         "ORDER BY score DESC, result_id DESC LIMIT 500",
+         lambda r: {"job": r.randint(1, JOBS)}),
+        ("Re-score sources (latest extraction per resume, 3 job versions)",
+         "SELECT max(result_id) FROM resume_results WHERE job_id = ANY(%(jobs)s) "
+         "AND extracted_data IS NOT NULL GROUP BY resume_id",
+         lambda r: {"jobs": r.sample(range(1, JOBS + 1), 3)}),
+        ("Email already sent? (legacy NULL job_id)",
+         "SELECT 1 FROM email_logs WHERE email = %(email)s AND template_id = %(template)s "
+         "AND job_id IS NULL LIMIT 1",
+         lambda r: {"email": f"cand{r.randint(1, emails)}@example.com", "template": r.randint(1, 6)}),
+        ("Pipeline candidates of a job",
+         "SELECT * FROM candidate_pipeline WHERE job_id = %(job)s ORDER BY added_at DESC",
+         lambda r: {"job": r.randint(1, PIPELINE_JOBS)}),
+        ("Pending email queue of a job",
+         "SELECT * FROM email_queue WHERE status = 'pending' AND job_id = %(job)s ORDER BY queued_at",
+         lambda r: {"job": r.randint(1, PIPELINE_JOBS)}),
+    ]
+
+
+def _scan_nodes(plan: dict) -> list:
+    """Leaf scan nodes of an EXPLAIN (FORMAT JSON) plan, e.g. 'Index Scan using ix_…'."""
+    nodes = []
+    if "Scan" in plan["Node Type"] and plan["Node Type"] != "Bitmap Heap Scan":
+        node = plan["Node Type"]
+        if plan.get("Index Name"):
+            node += f" using {plan['Index Name']}"
+        elif plan.get("Relation Name"):
+            node += f" on {plan['Relation Name']}"
+        nodes.append(node)
+    for child in plan.get("Plans") or []:
+        nodes.extend(_scan_nodes(child))
+    return nodes
+
+
+def _measure(cursor, queries: list, repeat: int, seed: int, explain: bool) -> list:
+    results = []
+    for label, sql, params in queries:
+        rng = random.Random(seed)
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params(rng))
+        plan = cursor.fetchone()[0][0]["Plan"]
+        if explain:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params(rng))
+            print(f"\n-- {label}")
+            print("\n".join(line for (line,) in cursor.fetchall()))
+
+        timings = []
+        for _ in range(repeat):
+            args = params(rng)
+            start = time.perf_counter()
+            cursor.execute(sql, args)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results.append({
+            "plan": " + ".join(_scan_nodes(plan)),
+            "p50":  statistics.median(timings),
+            "p95":  timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        })
+    return results
+
+
+def _indexes(cursor) -> list:
+    """Secondary indexes in the scratch schema (primary keys excluded)."""
+    cursor.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = %s AND indexname NOT LIKE '%%_pkey' "
+        "ORDER BY tablename, indexname",
+        (SCHEMA,),
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def _ablate(conn, cursor, queries: list, after: list, repeat: int, seed: int):
+    """
+    Time every lookup with one index dropped, for each index in turn. The
+    drop is rolled back, so nothing is rebuilt. Prints the lookups whose
+    plan changes without the index; an index with none is unused.
+    """
+    print("Without each index (p50 ms, all indexes → without this one)\n")
+    for index in _indexes(cursor):
+        conn.autocommit = False
+        try:
+            cursor.execute(f"DROP INDEX {index}")
+            without = _measure(cursor, queries, repeat, seed, explain=False)
+        finally:
+            conn.rollback()
+            conn.autocommit = True
+        changed = [
+            (label, a, w) for (label, _, _), a, w in zip(queries, after, without)
+            if a["plan"] != w["plan"]
+        ]
+        print(index)
+        if not changed:
+            print("  no lookup's plan changes — unused by these lookups\n")
+            continue
+        for label, a, w in changed:
+            print(f"  {label}: {a['p50']:.2f} → {w['p50']:.2f}   {w['plan']}")
+        print()
+
+
+def run(database_url: str, rows: int, repeat: int, explain: bool, keep: bool):
+    conn = psycopg2.connect(database_url)
+    conn.autocommit = True
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.execute(TABLES)
+
+        print(f"Loading {rows:,} rows into each of 4 tables...")
+        start = time.perf_counter()
+        cursor.execute(LOAD, {"rows": rows, "resumes": max(1, rows // RESUMES_PER_JOB_ROW)})
+        cursor.execute("ANALYZE")
+        print(f"  loaded in {time.perf_counter() - start:.1f}s")
+
+        queries = _queries(rows)
+        before = _measure(cursor, queries, repeat, seed=rows, explain=explain)
+
+        migrations = {version: (name, sql) for version, name, sql in load_migrations()}
+        drops = []
+        for version in BENCH_MIGRATIONS:
+            name, sql = migrations[version]
+            if "DROP INDEX" in sql.upper():
+                cursor.execute("ANALYZE")
+                drops.append((version, name, _measure(cursor, queries, repeat, seed=rows, explain=False)))
+            start = time.perf_counter()
+            for statement in split_statements(sql):
+                cursor.execute(statement)
+            print(f"  [{version:04d}] {name} applied in {time.perf_counter() - start:.1f}s")
+        cursor.execute("ANALYZE")
+
+        after = _measure(cursor, queries, repeat, seed=rows, explain=explain)
+
+        print(f"\nLatency over {repeat} runs per query (ms)\n")
+        for (label, _, _), b, a in zip(queries, before, after):
+            print(label)
+            print(f"  before  p50 {b['p50']:9.2f}  p95 {b['p95']:9.2f}   {b['plan']}")
+            print(f"  after   p50 {a['p50']:9.2f}  p95 {a['p95']:9.2f}   {a['plan']}")
+            print(f"  speed-up  {b['p50'] / max(a['p50'], 1e-6):,.0f}x\n")
+
+        for version, name, kept in drops:
+            print(f"[{version:04d}] {name} (p50 ms, before the migration → after)")
+            for (label, _, _), k, a in zip(queries, kept, after):
+                if k["plan"] != a["plan"]:
+                    print(f"  {label}: {k['p50']:.2f} → {a['p50']:.2f}   {a['plan']}")
+            print()
+
+        _ablate(conn, cursor, queries, after, repeat, seed=rows)
+
+    finally:
+        if not keep:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per table (default 1,000,000)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query (default 20)")
+    parser.add_argument("--explain", action="store_true", help="print EXPLAIN (ANALYZE, BUFFERS) for each query")
+    parser.add_argument("--keep", action="store_true", help=f"leave the {SCHEMA} schema in place")
+    args = parser.parse_args()
+
+    load_dotenv()
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    if not DATABASE_URL:
+        raise RuntimeError("DATABASE_URL not set in .env")
+
+    run(DATABASE_URL, args.rows, args.repeat, args.explain, args.keep)
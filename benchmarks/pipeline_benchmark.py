@@ -0,0 +1,481 @@
+"""
+End-to-end screening throughput on a synthetic resume corpus, fully offline.
+
+Usage:
+    cd Resume-Screening
+    python benchmarks/pipeline_benchmark.py                    # 50, 200, 1000 resumes on SQLite
+    python benchmarks/pipeline_benchmark.py --sizes 100 500 --llm-latency-ms 600 --rate-limit-rate 0.05
+    python benchmarks/pipeline_benchmark.py --database-url postgresql://postgres@localhost/scratch
+    python benchmarks/pipeline_benchmark.py --save baseline.json
+    python benchmarks/pipeline_benchmark.py --compare baseline.json   # exit 1 on a regression
+
+For each size, a ZIP of N seeded synthetic resumes (half PDF, half DOCX) is
+queued with enqueue_zip, as POST /screening/start does. One worker then
+drains it batch by batch with work_once, as `python worker.py` does, with
+its text-extraction process pool. The Groq client is pointed
+(GROQ_BASE_URL) at a local stand-in for the chat completions route. The
+stand-in answers after --llm-latency-ms and turns away a --rate-limit-rate
+fraction of requests with 429 + Retry-After.
+
+Each size runs in a fresh process, so peak RSS is per size. Stage latencies
+are the screening_stage_seconds observations (#42), kept raw for
+percentiles. SCREENING_* settings are read from the environment as usual.
+
+SQLite runs use a temporary file. Postgres runs use a scratch schema
+(pipeline_bench) of --database-url, dropped and recreated for every size;
+the real tables are not touched.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from docx import Document
+
+BACKEND = Path(__file__).resolve().parent.parent / "resume_screening_automation" / "backend"
+sys.path.insert(0, str(BACKEND))
+
+SCHEMA = "pipeline_bench"
+
+SKILLS = ["Python", "SQL", "Java", "JavaScript", "React", "Node.js", "Docker", "AWS",
+          "FastAPI", "Django", "PostgreSQL", "Kubernetes", "Pandas", "TensorFlow", "Git", "Linux"]
+DEGREES = ["B.Tech in Computer Science", "B.E. in Information Technology", "BCA",
+           "M.Tech in Data Science", "B.Sc in Mathematics"]
+DOMAINS = ["web", "backend", "ml", "data", "mobile", "devops"]
+FILLER = ("built maintained designed shipped tested deployed scalable services pipelines "
+          "dashboards teams users latency reliability features customers reports").split()
+
+# Shape of a typical job config: weights sum to 100, some of every section
+BENCH_JOB_CONFIG = {
+    "required_skills": ["Python", "SQL"],
+    "nice_to_have_skills": ["Docker", "AWS", "React"],
+    "education_requirements": ["B.Tech", "B.E."],
+    "candidate_type": "any",
+    "required_experience_years": 1,
+    "project_expectations": {"domains": ["web", "backend"]},
+    "scoring_weights": {"required_skills": 40, "nice_to_have_skills": 20, "projects": 20,
+                        "education": 10, "eligibility": 10},
+}
+
+
+# ── Synthetic corpus ───────────────────────────────────────────────────────────
+
+def resume_lines(i: int, rnd: random.Random) -> list:
+    """One candidate's resume, ~40 lines of plain text."""
+    skills = rnd.sample(SKILLS, rnd.randint(3, 8))
+    year = rnd.randint(2018, 2026)
+    lines = [
+        f"Candidate {i}",
+        f"Email: candidate{i}@example.com",
+        f"Phone: +91 98{rnd.randint(10000000, 99999999)}",
+        "Summary: " + " ".join(rnd.choices(FILLER, k=30)),
+        "Skills: " + ", ".join(skills),
+        f"Education: {rnd.choice(DEGREES)}, University {rnd.randint(1, 200)}, {year}",
+        f"Experience: {rnd.randint(0, 8)} years",
+        "Projects:",
+    ]
+    for p in range(rnd.randint(1, 4)):
+        lines.append(f"- Project {p + 1} [{rnd.choice(DOMAINS)}] using {', '.join(rnd.sample(skills, 2))}")
+        lines.extend(" ".join(rnd.choices(FILLER, k=14)) for _ in range(6))
+    return lines
+
+
+def pdf_bytes(lines: list) -> bytes:
+    """A single-page PDF with the lines in Helvetica (text layer only)."""
+    escaped = [l.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for l in lines]
+    content = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({l}) '" for l in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def docx_bytes(lines: list) -> bytes:
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_corpus(n: int, path: str, seed: int = 0):
+    """ZIP of n resumes, alternating PDF and DOCX, plus one non-resume member."""
+    rnd = random.Random(seed)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(n):
+            lines = resume_lines(i, rnd)
+            if i % 2:
+                archive.writestr(f"resumes/candidate_{i}.docx", docx_bytes(lines))
+            else:
+                archive.writestr(f"resumes/candidate_{i}.pdf", pdf_bytes(lines))
+        archive.writestr("resumes/README.txt", "not a resume")
+
+
+# ── Stand-in Groq server ───────────────────────────────────────────────────────
+
+def _extraction(text: str) -> dict:
+    """What a well-behaved model would extract from a synthetic resume."""
+    def find(pattern):
+        match = re.search(pattern, text)
+        return match.group(1).strip() if match else None
+
+    education = find(r"Education: (.+)")
+    degree, _, rest = (education or "").partition(",")
+    year = find(r"Education: .*, (\d{4})")
+    experience = find(r"Experience: (\d+) years")
+    return {
+        "personal_details": {
+            "full_name": find(r"(Candidate \d+)"),
+            "email":     find(r"Email: (\S+)"),
+            "phone":     find(r"Phone: (.+)"),
+        },
+        "skills": [s.strip() for s in (find(r"Skills: (.+)") or "").split(",") if s.strip()],
+        "education": [{
+            "degree": degree.strip(), "field": "", "institution": rest.rsplit(",", 1)[0].strip(),
+            "passed_out_year": int(year) if year else None,
+        }] if education else [],
+        "projects": [
+            {"title": title, "domain": domain, "tech_stack": [t.strip() for t in stack.split(",")]}
+            for title, domain, stack in re.findall(r"- (Project \d+) \[(\w+)\] using (.+)", text)
+        ],
+        "experience_years": int(experience) if experience else None,
+        "passed_out_year": int(year) if year else None,
+    }
+
+
+def start_mock_groq(latency_ms: float, jitter_ms: float, rate_limit_rate: float,
+                    retry_after: float, seed: int = 0):
+    """
+    OpenAI-compatible POST /openai/v1/chat/completions on 127.0.0.1 (random
+    port), in a daemon thread. Returns (server, base_url, stats).
+    """
+    rnd = random.Random(seed)
+    lock = threading.Lock()
+    stats = {"requests": 0, "rate_limited": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                stats["requests"] += 1
+                limited = rnd.random() < rate_limit_rate
+                delay = max(0.0, latency_ms + rnd.uniform(-jitter_ms, jitter_ms)) / 1000
+                stats["rate_limited"] += limited
+            if limited:
+                self._send(429, {"error": {"message": "Rate limit reached (benchmark)",
+                                           "type": "tokens", "code": "rate_limit_exceeded"}},
+                           {"retry-after": str(retry_after)})
+                return
+
+            time.sleep(delay)
+            prompt = "".join(m["content"] for m in request["messages"])
+            content = json.dumps(_extraction(request["messages"][-1]["content"]))
+            prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+            self._send(200, {
+                "id": f"chatcmpl-bench-{stats['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", stats
+
+
+# ── One run size (child process) ───────────────────────────────────────────────
+
+class _StageRecorder:
+    """Wraps screening_stage_seconds: every observation is kept for percentiles, and still exported."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.values = {}
+
+    def labels(self, stage):
+        return _RecordingChild(self.histogram.labels(stage), self.values.setdefault(stage, []))
+
+
+class _RecordingChild:
+    def __init__(self, child, values: list):
+        self.child = child
+        self.values = values
+
+    def observe(self, seconds: float):
+        self.values.append(seconds)
+        self.child.observe(seconds)
+
+
+def run_size(n: int, seed: int, batch_size: int) -> dict:
+    """Queue and drain one corpus of n resumes in this process; returns its measurements."""
+    from prometheus_client import REGISTRY
+    from db.session import SessionLocal, engine
+    from db.models import Base, JobConfig, ResumeRun
+    from services import metrics
+    from services.resume_ai_extractor import EXTRACTION_MODEL
+    from services.screening_queue import enqueue_zip
+    from services.screening_worker import MAX_CONCURRENCY, TEXT_WORKERS, work_once, _new_text_pool
+    from services.text_extractor import extract_text
+
+    recorder = _StageRecorder(metrics.STAGE_SECONDS)
+    metrics.STAGE_SECONDS = recorder
+    Base.metadata.create_all(engine)
+
+    workdir = tempfile.mkdtemp(prefix="pipeline_bench_")
+    zip_path = os.path.join(workdir, "corpus.zip")
+    make_corpus(n, zip_path, seed)
+
+    db = SessionLocal()
+    job = JobConfig(job_title="Benchmark", job_config=BENCH_JOB_CONFIG)
+    db.add(job)
+    db.commit()
+    run = ResumeRun(job_id=job.job_id, batch_size=batch_size, total_resumes=0,
+                    processed_count=0, failed_count=0, status="queued")
+    db.add(run)
+    db.commit()
+
+    # Start the parser processes before timing — a worker pays that once, not per run
+    text_pool = _new_text_pool()
+    if text_pool is not None:
+        warmup = docx_bytes(["warm up"])
+        list(text_pool.map(extract_text, ["warmup.docx"] * TEXT_WORKERS, [warmup] * TEXT_WORKERS))
+
+    started = time.perf_counter()
+    enqueue_zip(db, run, zip_path)
+    queued = time.perf_counter()
+    quota_exhausted_runs = set()
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="screening") as pool:
+        while work_once(pool, "benchmark", quota_exhausted_runs, run_id=run.run_id, text_pool=text_pool):
+            pass
+    finished = time.perf_counter()
+    parser_rss = 0.0
+    if text_pool is not None:
+        parser_rss = max(_peak_rss_mb(pid) for pid in text_pool._processes)
+        text_pool.shutdown()
+
+    db.refresh(run)
+    db.close()
+    return {
+        "size":           n,
+        "status":         run.status,
+        "processed":      run.processed_count,
+        "failed":         run.failed_count,
+        "enqueue_s":      queued - started,
+        "drain_s":        finished - queued,
+        "wall_s":         finished - started,
+        "resumes_per_s":  n / (finished - started),
+        "rate_limited":   REGISTRY.get_sample_value("groq_rate_limited_total", {"model": EXTRACTION_MODEL}) or 0,
+        "tokens_raw":     REGISTRY.get_sample_value("resume_text_tokens_total", {"kind": "raw"}) or 0,
+        "tokens_sent":    REGISTRY.get_sample_value("resume_text_tokens_total", {"kind": "sent"}) or 0,
+        "peak_rss_mb":    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "peak_parser_rss_mb": parser_rss,
+        "stages":         {stage: _percentiles(values) for stage, values in recorder.values.items()},
+    }
+
+
+def _peak_rss_mb(pid: int) -> float:
+    """
+    Peak RSS of one text-extraction process (VmHWM; Linux only, else 0).
+    RUSAGE_CHILDREN is no use here: it also counts a spawned child's pages
+    from before it exec'd, i.e. a copy of this process.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _percentiles(values: list) -> dict:
+    ordered = sorted(values)
+    return {
+        "n":      len(ordered),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+# ── Driver ─────────────────────────────────────────────────────────────────────
+
+def _database_url(base_url: str, size: int, workdir: str) -> tuple:
+    """(DATABASE_URL for the child, extra env) with an empty database behind it."""
+    if not base_url:
+        return f"sqlite:///{os.path.join(workdir, f'bench_{size}.db')}", {}
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+    scratch = create_engine(base_url)
+    with scratch.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    scratch.dispose()
+    url = make_url(base_url).update_query_dict({"options": f"-csearch_path={SCHEMA}"})
+    # The statement_timeout startup option would replace the search_path one
+    return url.render_as_string(hide_password=False), {"DB_STATEMENT_TIMEOUT_MS": "0"}
+
+
+def run_all(args) -> list:
+    server, groq_url, groq_stats = start_mock_groq(
+        args.llm_latency_ms, args.llm_jitter_ms, args.rate_limit_rate, args.retry_after, args.seed
+    )
+    workdir = tempfile.mkdtemp(prefix="pipeline_bench_")
+    results = []
+    try:
+        for size in args.sizes:
+            database_url, extra_env = _database_url(args.database_url, size, workdir)
+            result_path = os.path.join(workdir, f"result_{size}.json")
+            env = dict(
+                os.environ,
+                DATABASE_URL=database_url,
+                GROQ_BASE_URL=groq_url,
+                GROQ_API_KEY="benchmark",
+                GROQ_RPM=str(args.rpm),
+                GROQ_TPM=str(args.tpm),
+                **extra_env,
+            )
+            print(f"Running {size} resumes...", flush=True)
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child-size", str(size), "--child-result", result_path,
+                 "--seed", str(args.seed), "--batch-size", str(args.batch_size)],
+                env=env, check=True, cwd=str(BACKEND),
+                stdout=None if args.verbose else subprocess.DEVNULL,
+            )
+            with open(result_path) as f:
+                results.append(json.load(f))
+    finally:
+        server.shutdown()
+    print(f"Stand-in Groq: {groq_stats['requests']} requests, {groq_stats['rate_limited']} answered 429\n")
+    return results
+
+
+def report(results: list):
+    print(f"{'Resumes':>8} {'Wall s':>8} {'Enqueue s':>10} {'Resumes/s':>10} {'Failed':>7} "
+          f"{'429s':>5} {'Peak RSS MB':>12} {'Parser RSS MB':>14} {'Tokens/resume':>14} {'Saved':>6}")
+    for r in results:
+        tokens = r["tokens_sent"] / max(r["processed"], 1)
+        saved = 1 - r["tokens_sent"] / r["tokens_raw"] if r["tokens_raw"] else 0
+        print(f"{r['size']:>8} {r['wall_s']:>8.2f} {r['enqueue_s']:>10.2f} {r['resumes_per_s']:>10.1f} "
+              f"{r['failed']:>7} {r['rate_limited']:>5.0f} {r['peak_rss_mb']:>12.0f} {r['peak_parser_rss_mb']:>14.0f} "
+              f"{tokens:>14.0f} {saved:>6.0%}")
+
+    stages = []
+    for r in results:
+        stages += [s for s in r["stages"] if s not in stages]
+    print("\nStage latency, p50 / p95 ms (per resume; db_lookup, score_batch and commit per batch)")
+    print(f"{'Stage':<14}" + "".join(f"{r['size']:>20}" for r in results))
+    for stage in stages:
+        cells = []
+        for r in results:
+            s = r["stages"].get(stage)
+            cells.append(f"{s['p50_ms']:.2f} / {s['p95_ms']:.2f}" if s else "—")
+        print(f"{stage:<14}" + "".join(f"{c:>20}" for c in cells))
+
+
+def compare(results: list, baseline_path: str, tolerance: float) -> bool:
+    """Print changes against a saved run; True if throughput or memory regressed past tolerance."""
+    with open(baseline_path) as f:
+        baseline = {r["size"]: r for r in json.load(f)}
+    regressed = False
+    print(f"\nAgainst {baseline_path} (tolerance {tolerance:.0%}):")
+    for r in results:
+        before = baseline.get(r["size"])
+        if before is None:
+            print(f"{r['size']:>8}  no baseline")
+            continue
+        throughput = r["resumes_per_s"] / before["resumes_per_s"] - 1
+        memory = r["peak_rss_mb"] / before["peak_rss_mb"] - 1
+        bad = throughput < -tolerance or memory > tolerance
+        regressed |= bad
+        print(f"{r['size']:>8}  resumes/s {throughput:+.1%}  peak RSS {memory:+.1%}"
+              + ("  ❌ REGRESSION" if bad else ""))
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="resumes per run")
+    parser.add_argument("--database-url", default=None,
+                        help="Postgres to benchmark against (scratch schema); default: temporary SQLite")
+    parser.add_argument("--batch-size", type=int, default=10, help="run batch_size, as the UI sends (default 10)")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="stand-in Groq latency (default 300)")
+    parser.add_argument("--llm-jitter-ms", type=float, default=100, help="± uniform jitter (default 100)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--rpm", type=int, default=100000, help="client-side GROQ_RPM budget (default: unthrottled)")
+    parser.add_argument("--tpm", type=int, default=100000000, help="client-side GROQ_TPM budget (default: unthrottled)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results as JSON")
+    parser.add_argument("--compare", help="JSON saved by --save to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed throughput drop / memory growth before --compare fails (default 0.15)")
+    parser.add_argument("--verbose", action="store_true", help="show the worker's log")
+    parser.add_argument("--child-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_size:
+        result = run_size(args.child_size, args.seed, args.batch_size)
+        with open(args.child_result, "w") as f:
+            json.dump(result, f)
+        sys.exit(0)
+
+    results = run_all(args)
+    report(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
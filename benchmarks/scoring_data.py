@@ -0,0 +1,175 @@
+"""
+Generated job configs and extracted resumes for the scoring_engine
+benchmarks and property tests, plus the reference scorer they are checked
+against.
+
+Resumes are drawn from the real alias tables (variants, canonical forms,
+degree spellings) mixed with made-up skills, in the shapes the extractor
+returns: case and punctuation noise, missing sections, unknown experience.
+Everything is seeded, so a size always means the same data.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "resume_screening_automation" / "backend"
+sys.path.insert(0, str(BACKEND))
+
+from services.scoring_engine import (  # noqa: E402
+    _degree_canonical, current_tables, expand_skills, normalize, resolve_skill,
+)
+
+_tables = current_tables()
+ALIAS_SKILLS = sorted(set(_tables.skill_aliases) | set(_tables.skill_aliases.values()))
+GENERIC_SKILLS = [f"skill {i}" for i in range(400)]
+DEGREES = sorted(_tables.degree_ids) + ["B.Tech.", "M.Sc", "Ph.D", "BBA", "Bachelor of Arts"]
+DOMAINS = ["web", "backend", "ml", "data", "mobile", "devops", "security", "embedded",
+           "fintech", "healthcare", "games", "cloud"]
+CANDIDATE_TYPES = ["any", "student", "experienced"]
+
+WEIGHTS = {"required_skills": 40, "nice_to_have_skills": 20, "projects": 20,
+           "education": 10, "eligibility": 10}
+
+
+def _spelling(skill: str, rnd: random.Random) -> str:
+    """A skill as a resume might write it: case and dot/slash noise."""
+    roll = rnd.random()
+    if roll < 0.3:
+        return skill.upper()
+    if roll < 0.5:
+        return skill.title()
+    if roll < 0.6:
+        return skill.replace(" ", ".")
+    if roll < 0.65:
+        return f" {skill} "
+    return skill
+
+
+def _skills(n: int, rnd: random.Random) -> list:
+    pool = ALIAS_SKILLS + GENERIC_SKILLS
+    return [_spelling(s, rnd) for s in rnd.sample(pool, min(n, len(pool)))]
+
+
+def make_job_config(rnd: random.Random, required: int = 6, nice: int = 6) -> dict:
+    """A job config with every scoring section, weights summing to 100."""
+    config = {
+        "required_skills": _skills(required, rnd),
+        "nice_to_have_skills": _skills(nice, rnd),
+        "education_requirements": rnd.sample(DEGREES, rnd.randint(0, 3)),
+        "candidate_type": rnd.choice(CANDIDATE_TYPES),
+        "project_expectations": {"domains": rnd.sample(DOMAINS, rnd.randint(0, 4))},
+        "scoring_weights": dict(WEIGHTS),
+    }
+    if rnd.random() < 0.5:
+        config["required_experience_years"] = rnd.choice([0, 1, 2, 3, 5, 1.5])
+    if rnd.random() < 0.3:
+        config["max_experience_years"] = rnd.choice([2, 4, 8, 10])
+    return config
+
+
+def make_resume(rnd: random.Random, skills: int = 20, projects: int = 3) -> dict:
+    """An extracted_data dict as the AI extractor returns it."""
+    data = {
+        "name": f"Candidate {rnd.randint(1, 10 ** 6)}",
+        "skills": _skills(skills, rnd),
+        "education": [{"degree": rnd.choice(DEGREES), "institution": "Some University"}
+                      for _ in range(rnd.randint(0, 3))],
+        "projects": [{"title": f"Project {p}",
+                      "domain": "/".join(rnd.sample(DOMAINS, rnd.randint(1, 2)))}
+                     for p in range(projects)],
+        "experience_years": rnd.choice([None, 0, 0.5, 1, 2, 3, 4.5, 6, 12]),
+    }
+    if rnd.random() < 0.05:
+        data["skills"] = None
+    if rnd.random() < 0.05:
+        del data["education"]
+    return data
+
+
+def make_resumes(count: int, skills: int = 20, projects: int = 3, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    return [make_resume(rnd, skills, projects) for _ in range(count)]
+
+
+def make_corpus(seed: int = 7) -> list:
+    """
+    Resumes across the size range scoring has to handle — skills 5–200,
+    projects 0–30 — for checking scorers against the reference.
+    """
+    rnd = random.Random(seed)
+    return [
+        make_resume(rnd, skills, projects)
+        for skills in (5, 20, 60, 200)
+        for projects in (0, 1, 5, 30)
+        for _ in range(8)
+    ]
+
+
+# ── Reference scorer ───────────────────────────────────────────────────────────
+
+def reference_score(job_config: dict, extracted_data: dict) -> tuple[int, str, bool]:
+    """
+    score_resume as it was before compiled and batch scoring: every set
+    rebuilt per call, resume skills expanded with their aliases, plain set
+    intersections. Kept as the specification the faster scorers must match.
+    """
+    score = 0
+    reasons = []
+    weights = job_config.get("scoring_weights", {})
+
+    required_skills = {resolve_skill(s) for s in job_config.get("required_skills", [])}
+    resume_skills = expand_skills({normalize(s) for s in extracted_data.get("skills") or []})
+    if required_skills:
+        matched = len(required_skills & resume_skills)
+        score += int((matched / len(required_skills)) * weights.get("required_skills", 0))
+        reasons.append(f"Required skills matched {matched}/{len(required_skills)}")
+
+    nice_skills = {resolve_skill(s) for s in job_config.get("nice_to_have_skills", [])}
+    if nice_skills:
+        matched = len(nice_skills & resume_skills)
+        score += int((matched / len(nice_skills)) * weights.get("nice_to_have_skills", 0))
+        reasons.append(f"Nice-to-have skills matched {matched}/{len(nice_skills)}")
+
+    project_score = 0
+    job_domains = {normalize(d) for d in job_config.get("project_expectations", {}).get("domains", [])}
+    for project in extracted_data.get("projects") or []:
+        if any(token in job_domains for token in normalize(project.get("domain", "")).split()):
+            project_score += 10
+    project_score = min(project_score, weights.get("projects", 0))
+    score += project_score
+    reasons.append(f"Project score {project_score}")
+
+    allowed_degrees = {_degree_canonical(normalize(d)) for d in job_config.get("education_requirements", [])}
+    resume_degrees = {
+        _degree_canonical(normalize(e.get("degree", "")))
+        for e in extracted_data.get("education") or []
+    }
+    if allowed_degrees & resume_degrees:
+        score += weights.get("education", 0)
+        reasons.append("Education requirement met")
+
+    candidate_type = job_config.get("candidate_type", "any")
+    required_exp = job_config.get("required_experience_years")
+    max_exp = job_config.get("max_experience_years")
+    raw_exp = extracted_data.get("experience_years")
+    resume_exp = raw_exp if raw_exp is not None else 0
+    disqualify_reason = None
+
+    if candidate_type == "student" and resume_exp > 0:
+        disqualify_reason = f"Not a student (resume shows {resume_exp} yrs experience)"
+    elif candidate_type == "experienced" or required_exp is not None:
+        min_exp = required_exp if required_exp is not None else 1
+        exp_label = "unknown" if raw_exp is None else f"{resume_exp} yrs"
+        if resume_exp < min_exp:
+            disqualify_reason = f"Insufficient experience: {exp_label} (required {min_exp} yrs)"
+        elif max_exp is not None and resume_exp > max_exp:
+            disqualify_reason = f"Overqualified: {exp_label} experience (max {max_exp} yrs)"
+
+    if disqualify_reason is not None:
+        reasons.insert(0, disqualify_reason)
+    else:
+        score += weights.get("eligibility", 0)
+        reasons.append("Eligibility requirement met")
+
+    return min(int(score), 100), "; ".join(reasons), disqualify_reason is not None
@@ -0,0 +1,106 @@
+"""
+Micro-benchmarks of scoring_engine on generated job configs and resumes
+(pytest-benchmark).
+
+Usage:
+    cd Resume-Screening
+    python -m pytest benchmarks/test_scoring_benchmark.py --benchmark-only
+    python -m pytest benchmarks/test_scoring_benchmark.py --benchmark-only -k "score_batch"
+    python -m pytest benchmarks/test_scoring_benchmark.py --benchmark-only --benchmark-autosave
+    python -m pytest benchmarks/test_scoring_benchmark.py --benchmark-only \\
+        --benchmark-compare --benchmark-compare-fail=mean:15%   # fail on a regression
+
+Per resume: normalize, resolve_skill and expand_skills on one resume's
+skills; score_resume (compiles the job every call) and a CompiledJob's
+score(); reference_score for comparison. Sizes span skills 5–200 and
+projects 0–30. Per batch: score_batch, and one CandidateMatrix scored
+against several jobs, as the talent pool does.
+"""
+
+import random
+
+import pytest
+
+from scoring_data import make_job_config, make_resumes, reference_score
+from services.scoring_engine import (
+    CandidateMatrix, compile_job, current_tables, expand_skills, normalize, resolve_skill,
+    score_batch, score_resume,
+)
+
+SKILL_COUNTS = (5, 20, 60, 200)
+PROJECT_COUNTS = (0, 5, 30)
+BATCH_SIZES = (10, 100, 1000)
+
+# Resumes per timed round of the per-resume benchmarks, so one round is long
+# enough to time steadily; stats are per round
+ROUND = 50
+
+
+@pytest.fixture(scope="module")
+def job_config():
+    return make_job_config(random.Random(1), required=8, nice=12)
+
+
+def _skill_sets(skills):
+    return [r["skills"] or [] for r in make_resumes(ROUND, skills=skills, projects=0)]
+
+
+@pytest.mark.parametrize("skills", SKILL_COUNTS)
+def test_normalize(benchmark, skills):
+    skill_sets = _skill_sets(skills)
+    benchmark(lambda: [[normalize(s) for s in ss] for ss in skill_sets])
+
+
+@pytest.mark.parametrize("skills", SKILL_COUNTS)
+def test_resolve_skill(benchmark, skills):
+    skill_sets = _skill_sets(skills)
+    benchmark(lambda: [[resolve_skill(s) for s in ss] for ss in skill_sets])
+
+
+@pytest.mark.parametrize("skills", SKILL_COUNTS)
+def test_expand_skills(benchmark, skills):
+    skill_sets = [{normalize(s) for s in ss} for ss in _skill_sets(skills)]
+    benchmark(lambda: [expand_skills(ss) for ss in skill_sets])
+
+
+@pytest.mark.parametrize("projects", PROJECT_COUNTS)
+@pytest.mark.parametrize("skills", SKILL_COUNTS)
+def test_reference_score(benchmark, job_config, skills, projects):
+    resumes = make_resumes(ROUND, skills, projects)
+    benchmark(lambda: [reference_score(job_config, r) for r in resumes])
+
+
+@pytest.mark.parametrize("projects", PROJECT_COUNTS)
+@pytest.mark.parametrize("skills", SKILL_COUNTS)
+def test_score_resume(benchmark, job_config, skills, projects):
+    resumes = make_resumes(ROUND, skills, projects)
+    benchmark(lambda: [score_resume(job_config, r) for r in resumes])
+
+
+@pytest.mark.parametrize("projects", PROJECT_COUNTS)
+@pytest.mark.parametrize("skills", SKILL_COUNTS)
+def test_compiled_score(benchmark, job_config, skills, projects):
+    resumes = make_resumes(ROUND, skills, projects)
+    job = compile_job(job_config)
+    benchmark(lambda: [job.score(r) for r in resumes])
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+@pytest.mark.parametrize("skills", (20, 200))
+def test_score_batch(benchmark, job_config, skills, batch_size):
+    resumes = make_resumes(batch_size, skills, projects=5)
+    benchmark(lambda: list(score_batch(job_config, resumes).results()))
+
+
+@pytest.mark.parametrize("jobs", (1, 10))
+def test_matrix_many_jobs(benchmark, jobs):
+    rnd = random.Random(2)
+    resumes = make_resumes(1000, skills=20, projects=5)
+    tables = current_tables()
+    compiled = [compile_job(make_job_config(rnd), tables) for _ in range(jobs)]
+
+    def run():
+        matrix = CandidateMatrix(resumes, tables)
+        return [matrix.score(job).scores for job in compiled]
+
+    benchmark(run)
@@ -0,0 +1,160 @@
+"""
+Every scorer in scoring_engine must give exactly the reference result —
+the same (score, reason, disqualified) tuple, or the same exception — for
+any job config and extracted resume.
+
+Usage:
+    cd Resume-Screening
+    python -m pytest benchmarks/test_scoring_properties.py
+    python -m pytest benchmarks/test_scoring_properties.py --hypothesis-seed 0 --hypothesis-show-statistics
+
+Checked: score_resume, a cached CompiledJob, score_batch, and a
+CandidateMatrix built from stored scoring_keys (JSON round-tripped, as the
+talent pool reads them) scored against several jobs.
+"""
+
+import json
+import random
+
+from hypothesis import HealthCheck, given, settings, strategies as st
+import pytest
+
+from scoring_data import (
+    ALIAS_SKILLS, DEGREES, DOMAINS, GENERIC_SKILLS, make_corpus, make_job_config, reference_score,
+)
+from services.scoring_engine import (
+    CandidateMatrix, compile_job, current_tables, score_batch, score_resume, scoring_keys,
+)
+
+settings.register_profile(
+    "scoring", max_examples=300, deadline=None,
+    suppress_health_check=[HealthCheck.too_slow, HealthCheck.data_too_large],
+)
+settings.load_profile("scoring")
+
+
+def outcome(scorer, *args):
+    """A scorer's result, or the type of exception it raised."""
+    try:
+        return scorer(*args)
+    except Exception as e:
+        return type(e)
+
+
+def batch_outcomes(job_config, resumes):
+    try:
+        return list(score_batch(job_config, resumes).results())
+    except Exception as e:
+        return type(e)
+
+
+# ── Strategies ─────────────────────────────────────────────────────────────────
+
+def spelled(words):
+    """Known words as resumes and configs write them: case, dots, slashes, padding."""
+    return st.tuples(st.sampled_from(words), st.sampled_from(["", "upper", "title", "dots", "pad"])).map(
+        lambda p: {"": p[0], "upper": p[0].upper(), "title": p[0].title(),
+                   "dots": p[0].replace(" ", "."), "pad": f" {p[0]} "}[p[1]]
+    )
+
+
+skill = st.one_of(spelled(ALIAS_SKILLS), spelled(GENERIC_SKILLS[:30]), st.text(max_size=12))
+degree = st.one_of(spelled(DEGREES), st.text(max_size=12))
+domain = st.one_of(
+    st.lists(st.sampled_from(DOMAINS), min_size=1, max_size=3).map("/".join),
+    st.sampled_from(["", " ", "Web / Backend", "M.L."]),
+    st.text(max_size=12),
+)
+weight = st.one_of(st.integers(0, 60), st.floats(0, 60), st.just(2 ** 60))
+experience = st.one_of(
+    st.none(), st.integers(-2, 40), st.floats(allow_nan=True, allow_infinity=True),
+    st.just(2 ** 60), st.just("3"),
+)
+
+job_configs = st.fixed_dictionaries(
+    {
+        "required_skills": st.lists(skill, max_size=10),
+        "nice_to_have_skills": st.lists(skill, max_size=10),
+        "scoring_weights": st.dictionaries(
+            st.sampled_from(["required_skills", "nice_to_have_skills", "projects",
+                             "education", "eligibility"]),
+            weight,
+        ),
+    },
+    optional={
+        "education_requirements": st.lists(degree, max_size=4),
+        "candidate_type": st.sampled_from(["any", "student", "experienced", "intern"]),
+        "required_experience_years": st.one_of(st.none(), st.integers(0, 10), st.floats(0, 10)),
+        "max_experience_years": st.one_of(st.none(), st.integers(0, 20), st.floats(0, 20)),
+        "project_expectations": st.fixed_dictionaries({}, optional={"domains": st.lists(domain, max_size=4)}),
+    },
+)
+
+resumes = st.fixed_dictionaries(
+    {},
+    optional={
+        "skills": st.one_of(st.none(), st.lists(skill, max_size=25)),
+        "education": st.one_of(st.none(), st.lists(
+            st.fixed_dictionaries({}, optional={"degree": degree}), max_size=3)),
+        "projects": st.one_of(st.none(), st.lists(
+            st.fixed_dictionaries({}, optional={"domain": st.one_of(domain, st.none(), st.integers())}),
+            max_size=8)),
+        "experience_years": experience,
+    },
+)
+
+
+# ── Properties ─────────────────────────────────────────────────────────────────
+
+@given(job_configs, resumes)
+def test_score_resume_matches_reference(job_config, resume):
+    assert outcome(score_resume, job_config, resume) == outcome(reference_score, job_config, resume)
+
+
+@given(job_configs, resumes)
+def test_compiled_job_matches_reference(job_config, resume):
+    job = compile_job(job_config)
+    assert outcome(job.score, resume) == outcome(reference_score, job_config, resume)
+
+
+@given(job_configs, st.lists(resumes, max_size=12))
+def test_score_batch_matches_reference(job_config, batch):
+    expected = [outcome(reference_score, job_config, r) for r in batch]
+    raised = [e for e in expected if isinstance(e, type)]
+    got = batch_outcomes(job_config, batch)
+    if raised:
+        # The batch fails as a whole, with the first row's exception type
+        assert got in raised
+    else:
+        assert got == expected
+
+
+@given(st.lists(job_configs, min_size=1, max_size=3), st.lists(resumes, max_size=12))
+def test_stored_keys_match_reference(job_configs_, batch):
+    tables = current_tables()
+    keys = []
+    for resume in batch:
+        try:
+            keys.append(json.loads(json.dumps(scoring_keys(resume, tables))))
+        except Exception:
+            keys.append(None)
+    matrix = CandidateMatrix(batch, tables, keys)
+
+    for job_config in job_configs_:
+        expected = [outcome(reference_score, job_config, r) for r in batch]
+        if any(isinstance(e, type) for e in expected):
+            continue
+        assert list(matrix.score(compile_job(job_config, tables)).results()) == expected
+
+
+# ── Generated corpus (skills 5–200, projects 0–30) ────────────────────────────
+
+@pytest.mark.parametrize("seed", range(5))
+def test_corpus_matches_reference(seed):
+    rnd = random.Random(seed)
+    corpus = make_corpus(seed)
+    for _ in range(4):
+        job_config = make_job_config(rnd, required=rnd.choice([1, 5, 20]), nice=rnd.choice([0, 5, 40]))
+        expected = [reference_score(job_config, r) for r in corpus]
+        assert [score_resume(job_config, r) for r in corpus] == expected
+        assert list(score_batch(job_config, corpus).results()) == expected
@@ -1,125 +1,157 @@
 """
-Run this script ONCE to apply the schema changes needed for the pipeline feature.
+Applies the versioned schema migrations in migrations/ to DATABASE_URL.
 
 Usage:
     cd Resume-Screening
-    python migrate.py
-
-It is safe to run multiple times — all statements use IF NOT EXISTS / IF EXISTS.
+    python migrate.py            # apply pending migrations
+    python migrate.py --status   # list applied / pending versions
+
+Each migration is a file named NNNN_description.sql. Applied versions are
+recorded in the schema_migrations table, so every file runs once per
+database. A migration runs in its own transaction together with its
+schema_migrations row, unless its first line is "-- migrate: no-transaction"
+(needed for CREATE INDEX CONCURRENTLY); those run statement by statement and
+must stay re-runnable (IF NOT EXISTS).
+
+Databases set up with the old migrate.py list have no schema_migrations
+table yet. The first run re-applies 0001-0017 once, which is safe because
+they all use IF NOT EXISTS / IF EXISTS, and records them.
 """
 
 import os
+import re
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 import psycopg2
 
-load_dotenv()
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+NO_TRANSACTION = "-- migrate: no-transaction"
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL not set in .env")
+# Held for the whole run so two deploys can't apply the same version at once
+LOCK_ID = 720_017
 
-MIGRATIONS = [
-    # 1. Add result_id to resume_results if it doesn't already exist as a column
-    #    (it already exists as primary key — this is a no-op guard)
-    "SELECT 1",  # placeholder — result_id is already the PK
+_FILE_NAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
 
-    # 2. Add job_id column to email_logs (NULL = legacy record)
-    """
-    ALTER TABLE email_logs
-        ADD COLUMN IF NOT EXISTS job_id INTEGER;
-    """,
 
-    # 3. Drop the old unique constraint (email, template_id)
-    """
-    ALTER TABLE email_logs
-        DROP CONSTRAINT IF EXISTS uq_email_template;
-    """,
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list:
+    """(version, name, sql) for every migration file, in version order."""
+    migrations = {}
+    for path in sorted(directory.iterdir()):
+        match = _FILE_NAME.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise RuntimeError(f"Duplicate migration version {version:04d}: {path.name}")
+        migrations[version] = (version, match.group(2), path.read_text())
+    return [migrations[v] for v in sorted(migrations)]
 
-    # 4. New constraint for records WITH a job_id
-    #    (NULL != NULL in Postgres so this naturally allows multiple legacy NULLs)
-    """
-    DO $$
-    BEGIN
-        IF NOT EXISTS (
-            SELECT 1 FROM pg_constraint
-            WHERE conname = 'uq_email_template_job'
-        ) THEN
-            ALTER TABLE email_logs
-                ADD CONSTRAINT uq_email_template_job
-                UNIQUE (email, template_id, job_id);
-        END IF;
-    END$$;
-    """,
-
-    # 5. Partial unique index for legacy records where job_id IS NULL
-    #    Prevents duplicate (email, template_id) among old records.
-    """
-    CREATE UNIQUE INDEX IF NOT EXISTS uq_email_template_null_job
-        ON email_logs (email, template_id)
-        WHERE job_id IS NULL;
-    """,
 
-    # 6. Create candidate_pipeline table
+def split_statements(sql: str) -> list:
     """
-    CREATE TABLE IF NOT EXISTS candidate_pipeline (
-        pipeline_id      SERIAL PRIMARY KEY,
-        job_id           INTEGER NOT NULL,
-        result_id        INTEGER,
-        email            TEXT NOT NULL,
-        full_name        TEXT,
-        phone            TEXT,
-        score            INTEGER,
-        stage            TEXT NOT NULL DEFAULT 'new',
-        stage_updated_at TIMESTAMP DEFAULT NOW(),
-        added_at         TIMESTAMP DEFAULT NOW(),
-        CONSTRAINT uq_pipeline_email_job UNIQUE (email, job_id)
-    );
-    """,
-
-    # 7. Create email_queue table
+    Split a no-transaction migration into single statements — Postgres runs
+    a multi-statement string in one implicit transaction. Plain `;` split:
+    these files hold no function bodies or string literals with semicolons.
     """
-    CREATE TABLE IF NOT EXISTS email_queue (
-        queue_id         SERIAL PRIMARY KEY,
-        pipeline_id      INTEGER REFERENCES candidate_pipeline(pipeline_id),
-        email            TEXT NOT NULL,
-        full_name        TEXT,
-        template_id      INTEGER NOT NULL,
-        params           JSONB,
-        job_id           INTEGER,
-        stage_after_send TEXT,
-        queued_at        TIMESTAMP DEFAULT NOW(),
-        status           TEXT DEFAULT 'pending',
-        sent_at          TIMESTAMP
-    );
-    """,
-]
-
-
-def run_migrations():
-    conn   = psycopg2.connect(DATABASE_URL)
-    cursor = conn.cursor()
-    conn.autocommit = False
-
+    statements = []
+    for chunk in sql.split(";"):
+        code = "\n".join(line for line in chunk.splitlines() if not line.strip().startswith("--"))
+        if code.strip():
+            statements.append(chunk.strip())
+    return statements
+
+
+def _ensure_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version    INTEGER PRIMARY KEY,
+                name       TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+
+
+def _applied_versions(conn) -> dict:
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT version, applied_at FROM schema_migrations")
+        return dict(cursor.fetchall())
+
+
+def _apply(conn, version: int, name: str, sql: str):
+    record = "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)"
+    if sql.lstrip().startswith(NO_TRANSACTION):
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                for statement in split_statements(sql):
+                    cursor.execute(statement)
+                cursor.execute(record, (version, name))
+        finally:
+            conn.autocommit = False
+    else:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql)
+                cursor.execute(record, (version, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def run_migrations(database_url: str):
+    conn = psycopg2.connect(database_url)
+    conn.autocommit = True
     try:
-        for i, sql in enumerate(MIGRATIONS, 1):
-            sql = sql.strip()
-            if not sql or sql == "SELECT 1":
-                continue
-            print(f"[{i}] Running migration...")
-            cursor.execute(sql)
+        _ensure_table(conn)
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (LOCK_ID,))
+        conn.autocommit = False
 
+        applied = _applied_versions(conn)
         conn.commit()
-        print("\n✅ All migrations applied successfully.")
+        pending = [m for m in load_migrations() if m[0] not in applied]
+        if not pending:
+            print("✅ Schema is up to date.")
+            return
 
-    except Exception as e:
-        conn.rollback()
-        print(f"\n❌ Migration failed: {e}")
-        raise
+        for version, name, sql in pending:
+            print(f"[{version:04d}] Applying {name}...")
+            try:
+                _apply(conn, version, name, sql)
+            except Exception as e:
+                print(f"\n❌ Migration {version:04d}_{name} failed: {e}")
+                raise
 
+        print(f"\n✅ Applied {len(pending)} migration(s).")
+
+    finally:
+        conn.close()  # also releases the advisory lock
+
+
+def show_status(database_url: str):
+    conn = psycopg2.connect(database_url)
+    conn.autocommit = True
+    try:
+        _ensure_table(conn)
+        applied = _applied_versions(conn)
     finally:
-        cursor.close()
         conn.close()
 
+    for version, name, _ in load_migrations():
+        state = f"applied {applied[version]:%Y-%m-%d %H:%M}" if version in applied else "pending"
+        print(f"{version:04d}  {name:<40} {state}")
+
 
 if __name__ == "__main__":
-    run_migrations()
+    load_dotenv()
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    if not DATABASE_URL:
+        raise RuntimeError("DATABASE_URL not set in .env")
+
+    if "--status" in sys.argv[1:]:
+        show_status(DATABASE_URL)
+    else:
+        run_migrations(DATABASE_URL)
@@ -0,0 +1,4 @@
+-- Baseline — resume_results.result_id already exists as the primary key.
+-- Kept as a no-op so versions match the numbering of the old migrate.py list.
+
+SELECT 1;
@@ -0,0 +1,4 @@
+-- Add job_id column to email_logs (NULL = legacy record)
+
+ALTER TABLE email_logs
+    ADD COLUMN IF NOT EXISTS job_id INTEGER;
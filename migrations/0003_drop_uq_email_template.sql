@@ -0,0 +1,4 @@
+-- Drop the old unique constraint (email, template_id)
+
+ALTER TABLE email_logs
+    DROP CONSTRAINT IF EXISTS uq_email_template;
@@ -0,0 +1,14 @@
+-- New constraint for records WITH a job_id
+-- (NULL != NULL in Postgres so this naturally allows multiple legacy NULLs)
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'uq_email_template_job'
+    ) THEN
+        ALTER TABLE email_logs
+            ADD CONSTRAINT uq_email_template_job
+            UNIQUE (email, template_id, job_id);
+    END IF;
+END$$;
@@ -0,0 +1,6 @@
+-- Partial unique index for legacy records where job_id IS NULL
+-- Prevents duplicate (email, template_id) among old records.
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_email_template_null_job
+    ON email_logs (email, template_id)
+    WHERE job_id IS NULL;
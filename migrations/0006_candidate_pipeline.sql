@@ -0,0 +1,15 @@
+-- Create candidate_pipeline table
+
+CREATE TABLE IF NOT EXISTS candidate_pipeline (
+    pipeline_id      SERIAL PRIMARY KEY,
+    job_id           INTEGER NOT NULL,
+    result_id        INTEGER,
+    email            TEXT NOT NULL,
+    full_name        TEXT,
+    phone            TEXT,
+    score            INTEGER,
+    stage            TEXT NOT NULL DEFAULT 'new',
+    stage_updated_at TIMESTAMP DEFAULT NOW(),
+    added_at         TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT uq_pipeline_email_job UNIQUE (email, job_id)
+);
@@ -0,0 +1,15 @@
+-- Create email_queue table
+
+CREATE TABLE IF NOT EXISTS email_queue (
+    queue_id         SERIAL PRIMARY KEY,
+    pipeline_id      INTEGER REFERENCES candidate_pipeline(pipeline_id),
+    email            TEXT NOT NULL,
+    full_name        TEXT,
+    template_id      INTEGER NOT NULL,
+    params           JSONB,
+    job_id           INTEGER,
+    stage_after_send TEXT,
+    queued_at        TIMESTAMP DEFAULT NOW(),
+    status           TEXT DEFAULT 'pending',
+    sent_at          TIMESTAMP
+);
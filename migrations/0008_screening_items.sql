@@ -0,0 +1,16 @@
+-- Create screening_items — durable work queue, one row per resume per run
+
+CREATE TABLE IF NOT EXISTS screening_items (
+    item_id          SERIAL PRIMARY KEY,
+    run_id           INTEGER NOT NULL REFERENCES resume_runs(run_id),
+    job_id           INTEGER NOT NULL REFERENCES job_configs(job_id),
+    seq              INTEGER NOT NULL,
+    file_name        TEXT NOT NULL,
+    content          BYTEA,
+    status           TEXT NOT NULL DEFAULT 'pending',
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    claimed_by       TEXT,
+    claimed_at       TIMESTAMP,
+    finished_at      TIMESTAMP,
+    error_message    TEXT
+);
@@ -0,0 +1,5 @@
+-- Partial index for the worker claim query (only unfinished items)
+
+CREATE INDEX IF NOT EXISTS ix_screening_items_claim
+    ON screening_items (run_id, seq)
+    WHERE status IN ('pending', 'processing');
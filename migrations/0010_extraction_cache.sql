@@ -0,0 +1,12 @@
+-- Create extraction_cache — AI output keyed by (file_hash, model, prompt_hash)
+-- Seed from existing results with: python -m db.migrate_extraction_cache
+
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    cache_id         SERIAL PRIMARY KEY,
+    file_hash        TEXT NOT NULL,
+    model            TEXT NOT NULL,
+    prompt_hash      TEXT NOT NULL,
+    extracted_data   JSON NOT NULL,
+    created_at       TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT uq_extraction_cache_key UNIQUE (file_hash, model, prompt_hash)
+);
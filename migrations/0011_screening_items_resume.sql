@@ -0,0 +1,5 @@
+-- Resume hash + id resolved once per ZIP at enqueue time
+
+ALTER TABLE screening_items
+    ADD COLUMN IF NOT EXISTS file_hash TEXT,
+    ADD COLUMN IF NOT EXISTS resume_id INTEGER REFERENCES resume_files(resume_id);
@@ -0,0 +1,4 @@
+-- Index for the per-batch "already screened for this job?" prefetch
+
+CREATE INDEX IF NOT EXISTS ix_resume_results_job_resume
+    ON resume_results (job_id, resume_id);
@@ -0,0 +1,5 @@
+-- Which text extractor handled each resume, and how long it took
+
+ALTER TABLE screening_items
+    ADD COLUMN IF NOT EXISTS text_extractor TEXT,
+    ADD COLUMN IF NOT EXISTS extract_ms     INTEGER;
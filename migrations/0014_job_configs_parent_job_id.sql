@@ -0,0 +1,13 @@
+-- Job version lineage — backfilled for versions created before the
+-- column existed (same title, previous version number)
+
+ALTER TABLE job_configs
+    ADD COLUMN IF NOT EXISTS parent_job_id INTEGER REFERENCES job_configs(job_id);
+
+UPDATE job_configs c
+   SET parent_job_id = p.job_id
+  FROM job_configs p
+ WHERE c.parent_job_id IS NULL
+   AND c.version > 1
+   AND p.job_title = c.job_title
+   AND p.version = c.version - 1;
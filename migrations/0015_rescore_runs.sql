@@ -0,0 +1,7 @@
+-- Re-score runs: queue items point at a stored result instead of bytes
+
+ALTER TABLE resume_runs
+    ADD COLUMN IF NOT EXISTS run_type TEXT NOT NULL DEFAULT 'screening';
+
+ALTER TABLE screening_items
+    ADD COLUMN IF NOT EXISTS source_result_id INTEGER REFERENCES resume_results(result_id);
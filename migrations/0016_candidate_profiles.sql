@@ -0,0 +1,17 @@
+-- Create candidate_profiles — one extracted profile per resume, with
+-- precomputed scoring keys for talent-pool runs.
+-- Backfill from existing results with: python -m db.migrate_candidate_profiles
+
+CREATE TABLE IF NOT EXISTS candidate_profiles (
+    profile_id       SERIAL PRIMARY KEY,
+    resume_id        INTEGER NOT NULL UNIQUE REFERENCES resume_files(resume_id),
+    full_name        TEXT,
+    email            TEXT,
+    phone            TEXT,
+    experience_years DOUBLE PRECISION,
+    passed_out_year  INTEGER,
+    extracted_data   JSON NOT NULL,
+    scoring_keys     JSON,
+    keys_version     TEXT,
+    updated_at       TIMESTAMP DEFAULT NOW()
+);
@@ -0,0 +1,8 @@
+-- Keyset pagination for GET /screening/results/{job_id} — one index
+-- per sort order, result_id as the tie-breaker
+
+CREATE INDEX IF NOT EXISTS ix_resume_results_job_processed
+    ON resume_results (job_id, processed_at, result_id);
+
+CREATE INDEX IF NOT EXISTS ix_resume_results_job_score
+    ON resume_results (job_id, score, result_id);
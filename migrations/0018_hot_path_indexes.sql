@@ -0,0 +1,27 @@
+-- migrate: no-transaction
+-- Indexes for the per-resume and per-job lookups. Built CONCURRENTLY so a
+-- large table keeps taking writes while they build, which cannot happen
+-- inside a transaction. If a build is interrupted, drop the INVALID index
+-- it leaves behind and run migrate.py again.
+--
+-- (job_id, resume_id) pairs are served by ix_resume_results_resume_extracted
+-- below (0012's ix_resume_results_job_resume was dropped in 0022), and
+-- email_logs (email, template_id) WHERE job_id IS NULL by
+-- uq_email_template_null_job (0005).
+
+-- "Already screened / stored extraction for this resume?" — every such lookup
+-- filters on extracted_data IS NOT NULL. It also serves resume_id-only lookups
+-- and talent-pool anti-joins driven from candidate_profiles.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_resume_results_resume_extracted
+    ON resume_results (resume_id, job_id)
+    WHERE extracted_data IS NOT NULL;
+
+-- Pipeline page: candidates of one job, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidate_pipeline_job
+    ON candidate_pipeline (job_id, added_at);
+
+-- Brevo overflow queue: pending emails per job in queue order. Sent and
+-- cancelled rows pile up and are never read back, so they stay out of it.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_queue_pending
+    ON email_queue (job_id, queued_at)
+    WHERE status = 'pending';
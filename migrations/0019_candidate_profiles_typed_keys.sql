@@ -0,0 +1,26 @@
+-- Scoring keys of candidate_profiles as typed columns instead of one JSON
+-- document: TEXT[] for skills and degree ids (GIN-indexed in 0020), JSONB
+-- for the per-project domain token lists. Backfilled from scoring_keys,
+-- which is then dropped.
+
+ALTER TABLE candidate_profiles
+    ADD COLUMN IF NOT EXISTS skills          TEXT[],
+    ADD COLUMN IF NOT EXISTS degrees         TEXT[],
+    ADD COLUMN IF NOT EXISTS project_domains JSONB;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'candidate_profiles' AND column_name = 'scoring_keys'
+    ) THEN
+        UPDATE candidate_profiles
+           SET skills          = ARRAY(SELECT json_array_elements_text(scoring_keys -> 'skills')),
+               degrees         = ARRAY(SELECT json_array_elements_text(scoring_keys -> 'degrees')),
+               project_domains = (scoring_keys -> 'projects')::jsonb
+         WHERE scoring_keys IS NOT NULL
+           AND skills IS NULL;
+
+        ALTER TABLE candidate_profiles DROP COLUMN scoring_keys;
+    END IF;
+END$$;
@@ -0,0 +1,15 @@
+-- migrate: no-transaction
+-- Profile filters without decoding extracted_data:
+--   skills  && ARRAY['python', 'py']       (any of a skill's alias targets)
+--   degrees && ARRAY['__group_0__']
+--   project_domains @> '[["fintech"]]'     (some project has the token)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidate_profiles_skills
+    ON candidate_profiles USING GIN (skills);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidate_profiles_degrees
+    ON candidate_profiles USING GIN (degrees);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_candidate_profiles_project_domains
+    ON candidate_profiles USING GIN (project_domains jsonb_path_ops);
+
@@ -0,0 +1,11 @@
+-- Groq rate-limit bucket shared by the API and every worker process
+-- (services/rate_limiter.py). One row per budget, created on first use.
+
+CREATE TABLE IF NOT EXISTS groq_budget (
+    name          TEXT PRIMARY KEY,
+    requests      DOUBLE PRECISION NOT NULL,
+    tokens        DOUBLE PRECISION NOT NULL,
+    updated_at    DOUBLE PRECISION NOT NULL,
+    paused_until  DOUBLE PRECISION NOT NULL DEFAULT 0,
+    grant_id      TEXT
+);
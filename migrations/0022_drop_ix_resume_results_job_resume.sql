@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- ix_resume_results_job_resume (0012) no longer serves any lookup better
+-- than the indexes that came after it (benchmarks/index_benchmark.py, 1M rows):
+--   (job_id, resume_id) + extracted_data lookups → ix_resume_results_resume_extracted
+--   results pages by job                         → ix_resume_results_job_processed / _job_score
+--   re-score sources by job_id                   → ix_resume_results_job_score, 21.2 → 15.2 ms p50
+--                                                  when this index is dropped
+-- Dropped CONCURRENTLY so writes to resume_results are not blocked.
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_resume_results_job_resume;
@@ -1,97 +1,109 @@
-from fastapi import APIRouter, HTTPException
-from db.session import SessionLocal
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.session import get_db
 from db.models import JobConfig
 from services.ai_service import generate_job_config
+from services.talent_pool import start_talent_pool_run
 router = APIRouter()
 
-@router.post("")
-def create_job(payload: dict):
-    db = SessionLocal()
+async def _queue_talent_pool(db: AsyncSession, job_id: int) -> dict:
+    """
+    Talent-pool mode: score every stored candidate against a just-saved job.
+    The job is already committed, so a failure here is reported alongside
+    it rather than as an error — a retry would save the job twice.
+    """
     try:
-        job = JobConfig(
-            job_title=payload["job_title"],
-            job_config=payload.get("job_config", {})
-        )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
-        return {"job_id": job.job_id}
-    finally:
-        db.close()
+        run = await db.run_sync(start_talent_pool_run, job_id)
+    except Exception as e:
+        await db.rollback()
+        print(f"[JOB {job_id}] ❌ Saved, but queueing the talent pool failed: {e}")
+        return {"run_id": None, "talent_pool_error": str(e)}
+    return {"run_id": run.run_id}
+
+
+@router.post("")
+async def create_job(payload: dict, db: AsyncSession = Depends(get_db)):
+    job = JobConfig(
+        job_title=payload["job_title"],
+        job_config=payload.get("job_config", {})
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    job_id = job.job_id
+    if payload.get("score_talent_pool"):
+        return {"job_id": job_id, **await _queue_talent_pool(db, job_id)}
+
+    return {"job_id": job_id}
 
 
 @router.get("")
-def list_jobs():
-    db = SessionLocal()
-    try:
-        jobs = db.query(JobConfig).filter(JobConfig.is_active == True).all()
-        return [
-            {
-                "job_id": j.job_id,
-                "job_title": j.job_title,
-                "version": j.version
-            }
-            for j in jobs
-        ]
-    finally:
-        db.close()
+async def list_jobs(db: AsyncSession = Depends(get_db)):
+    jobs = await db.scalars(select(JobConfig).filter(JobConfig.is_active == True))
+    return [
+        {
+            "job_id": j.job_id,
+            "job_title": j.job_title,
+            "version": j.version
+        }
+        for j in jobs
+    ]
 
 
 @router.get("/{job_id}")
-def get_job(job_id: int):
-    db = SessionLocal()
-    try:
-        job = db.query(JobConfig).filter(JobConfig.job_id == job_id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        return {
-            "job_id": job.job_id,
-            "job_title": job.job_title,
-            "job_config": job.job_config,
-            "version": job.version,
-            "is_active": job.is_active
-        }
-    finally:
-        db.close()
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(JobConfig, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job.job_id,
+        "job_title": job.job_title,
+        "job_config": job.job_config,
+        "version": job.version,
+        "is_active": job.is_active
+    }
 
 
 @router.patch("/{job_id}")
-def update_job(job_id: int, payload: dict):
-    db = SessionLocal()
+async def update_job(job_id: int, payload: dict, db: AsyncSession = Depends(get_db)):
+    old_job = await db.scalar(select(JobConfig).filter(
+        JobConfig.job_id == job_id,
+        JobConfig.is_active == True
+    ))
+
+    if not old_job:
+        raise HTTPException(status_code=404, detail="Job not found or already inactive")
+
+    # Deactivate old + create new in a single atomic transaction
+    old_job.is_active = False
+    new_job = JobConfig(
+        job_title=payload.get("job_title", old_job.job_title),
+        job_config=payload.get("job_config", old_job.job_config),
+        version=old_job.version + 1,
+        parent_job_id=old_job.job_id,
+        is_active=True
+    )
+    db.add(new_job)
     try:
-        old_job = db.query(JobConfig).filter(
-            JobConfig.job_id == job_id,
-            JobConfig.is_active == True
-        ).first()
-
-        if not old_job:
-            raise HTTPException(status_code=404, detail="Job not found or already inactive")
-
-        # Deactivate old + create new in a single atomic transaction
-        old_job.is_active = False
-        new_job = JobConfig(
-            job_title=payload.get("job_title", old_job.job_title),
-            job_config=payload.get("job_config", old_job.job_config),
-            version=old_job.version + 1,
-            is_active=True
-        )
-        db.add(new_job)
-        try:
-            db.commit()
-        except Exception:
-            db.rollback()
-            raise HTTPException(status_code=500, detail="Failed to update job config")
-        db.refresh(new_job)
-
-        return {
-            "job_id": new_job.job_id,
-            "version": new_job.version,
-            "job_title": new_job.job_title
-        }
-    finally:
-        db.close()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to update job config")
+    await db.refresh(new_job)
+
+    response = {
+        "job_id": new_job.job_id,
+        "version": new_job.version,
+        "job_title": new_job.job_title
+    }
+    if payload.get("score_talent_pool"):
+        response.update(await _queue_talent_pool(db, new_job.job_id))
+    return response
 
 
+# Sync on purpose: the Groq client blocks, so this runs in the threadpool
 @router.post("/ai-generate")
 def ai_generate_job_config(payload: dict):
     job_description = payload.get("job_description")
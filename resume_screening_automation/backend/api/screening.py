@@ -1,390 +1,398 @@
 import os
+import json
+import time
+import base64
+import asyncio
+import shutil
 import zipfile
 import tempfile
-import hashlib
-from datetime import datetime
-from email_validator import validate_email, EmailNotValidError
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Response, Query, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_, exists, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.session import get_db, get_sync_db, async_session
+from db.models import ResumeRun, ResumeResult, JobConfig, CandidateProfile
+from db.dialect import sortable_timestamp
+from services.screening_queue import enqueue_zip, enqueue_rescore, previous_versions, RESCORE_BATCH_SIZE
+from services.talent_pool import start_talent_pool_run, profile_conditions
+from services.run_events import broker
+from services.metrics import RUNS_STARTED, RUNS_FINISHED
 
+router = APIRouter(prefix="/screening", tags=["Screening"])
 
-def _normalize_email(extracted_data: dict) -> dict:
-    """Set personal_details.email to None if the AI returned a non-email string."""
-    personal = extracted_data.get("personal_details")
-    if not isinstance(personal, dict):
-        return extracted_data
-    raw = str(personal.get("email") or "").strip()
-    try:
-        personal["email"] = validate_email(raw, check_deliverability=False).email
-    except EmailNotValidError:
-        personal["email"] = None
-    return extracted_data
+# Uploads are copied to disk in chunks of this size — never held in memory whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from groq import RateLimitError
+# Largest page GET /results/{job_id} returns
+MAX_RESULTS_PAGE = 5000
 
-from db.session import SessionLocal
-from db.models import ResumeRun, ResumeFile, ResumeResult, JobConfig
-from services.resume_processor import process_single_resume
-from services.scoring_engine import score_resume
+# sort → (key column, descending); result_id breaks ties in the same direction
+RESULT_SORTS = {
+    "recent":     (ResumeResult.processed_at, True),
+    "score_desc": (ResumeResult.score, True),
+    "score_asc":  (ResumeResult.score, False),
+}
 
-router = APIRouter(prefix="/screening", tags=["Screening"])
+# Seconds between keepalive comments on an idle event stream (proxies close
+# silent connections), and between full re-reads of the run from the database
+# (covers events dropped for a slow client or while LISTEN was reconnecting)
+SSE_KEEPALIVE_SECONDS = 15
+RUN_EVENTS_RESYNC_SECONDS = int(os.getenv("RUN_EVENTS_RESYNC_SECONDS", "60"))
 
+FINISHED_RUN_STATUSES = ("completed", "crashed")
+RUN_COUNTERS = ("processed_count", "failed_count", "total_resumes")
 
-def get_or_create_resume(db, resume_path: str) -> int:
-    with open(resume_path, "rb") as f:
-        file_hash = hashlib.md5(f.read()).hexdigest()
 
-    file_name = os.path.basename(resume_path)
+def _encode_cursor(sort: str, key, result_id: int) -> str:
+    """Opaque keyset cursor: the sort and the last row's (key, result_id)."""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([sort, key, result_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-    resume = db.query(ResumeFile).filter_by(file_hash=file_hash).first()
-    if resume:
-        return resume.resume_id
 
-    resume = ResumeFile(
-        file_name=file_name,
-        file_hash=file_hash,
-        file_path=resume_path
-    )
-    db.add(resume)
-    db.commit()
-    db.refresh(resume)
-
-    return resume.resume_id
+def _decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key, result_id = json.loads(raw)
+        if cursor_sort != sort:
+            raise ValueError("cursor was issued for a different sort")
+        if sort == "recent":
+            key = datetime.fromisoformat(key)
+        return key, int(result_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @router.post("/start")
 def start_screening(
-    background_tasks: BackgroundTasks,
     job_id: int = Form(...),
     batch_size: int = Form(...),
-    zip_file: UploadFile = File(...)
+    zip_file: UploadFile = File(...),
+    db: Session = Depends(get_sync_db)
 ):
-    db = SessionLocal()
+    """
+    Queue a ZIP of resumes for screening. The run is durable once this
+    returns: every resume is a `screening_items` row that any worker
+    (`python worker.py`, or the inline worker thread) can claim.
+    Sync on purpose: copying and hashing the ZIP blocks, so it runs in the
+    threadpool instead of the event loop.
+    """
+    if batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be at least 1")
+
+    # Stream the upload to disk in chunks; members are read back one at a time
+    fd, zip_path = tempfile.mkstemp(prefix="screening_", suffix=".zip")
     try:
+        with os.fdopen(fd, "wb") as out:
+            shutil.copyfileobj(zip_file.file, out, UPLOAD_CHUNK_SIZE)
+
+        if not zipfile.is_zipfile(zip_path):
+            raise HTTPException(status_code=400, detail="Uploaded file is not a valid ZIP archive")
+
+        job = db.get(JobConfig, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
         run = ResumeRun(
             job_id=job_id,
             batch_size=batch_size,
             total_resumes=0,
             processed_count=0,
             failed_count=0,
-            status="running"
+            status="queued"
         )
         db.add(run)
         db.commit()
         db.refresh(run)
 
-        # 🔥 IMPORTANT FIX
-        zip_bytes = zip_file.file.read()
-
-        background_tasks.add_task(
-            process_zip_and_screen,
-            run.run_id,
-            job_id,
-            batch_size,
-            zip_file.filename,
-            zip_bytes
-        )
+        try:
+            total = enqueue_zip(db, run, zip_path)
+        except Exception as e:
+            db.rollback()
+            run.status = "crashed"
+            run.ended_at = datetime.utcnow()
+            db.commit()
+            RUNS_FINISHED.labels("crashed").inc()
+            print(f"[RUN {run.run_id}] ❌ Failed to queue ZIP: {e}")
+            raise HTTPException(status_code=500, detail="Failed to queue resumes")
 
-        return {"run_id": run.run_id, "status": "started"}
+        RUNS_STARTED.labels("screening").inc()
+        print(f"[RUN {run.run_id}] Queued {total} resumes")
+        return {"run_id": run.run_id, "status": run.status, "total_resumes": total}
 
     finally:
-        db.close()
-
+        os.remove(zip_path)
+
+
+@router.post("/rescore/{job_id}")
+async def rescore_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Re-score every candidate screened under earlier versions of this job
+    against its current config, without the ZIP and without any LLM call:
+    workers score the stored extracted_data in bulk. Progress is polled
+    through GET /runs/{run_id} (or its /events stream) like any screening run.
+    """
+    job = await db.get(JobConfig, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    source_job_ids = await db.run_sync(previous_versions, job)
+    if not source_job_ids:
+        raise HTTPException(status_code=400, detail="Job has no previous versions to re-score from")
+
+    run = ResumeRun(
+        job_id=job_id,
+        batch_size=RESCORE_BATCH_SIZE,
+        total_resumes=0,
+        processed_count=0,
+        failed_count=0,
+        status="queued",
+        run_type="rescore"
+    )
+    db.add(run)
+    await db.commit()
+    await db.refresh(run)
 
-def process_zip_and_screen(
-    run_id: int,
-    job_id: int,
-    batch_size: int,
-    zip_filename: str,
-    zip_bytes: bytes
-):
-    db = SessionLocal()
+    run_id = run.run_id
     try:
-        run = db.query(ResumeRun).filter_by(run_id=run_id).first()
-        job = db.query(JobConfig).filter_by(job_id=job_id).first()
-
-        if not run or not job:
-            return
-
-        job_config = job.job_config
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            zip_path = os.path.join(tmpdir, zip_filename)
-
-            with open(zip_path, "wb") as f:
-                f.write(zip_bytes)
-
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(tmpdir)
-
-            resume_files = []
-            for root, _, files in os.walk(tmpdir):
-                for file in files:
-                    if file.lower().endswith((".pdf", ".docx")):
-                        resume_files.append(os.path.join(root, file))
-
-            run.total_resumes = len(resume_files)
-            db.commit()
-
-            print(f"[RUN {run_id}] Total resumes found: {len(resume_files)}")
-
-            rate_limit_hit = False
-
-            for i in range(0, len(resume_files), batch_size):
-                batch = resume_files[i:i + batch_size]
-                batch_no = (i // batch_size) + 1
-                total_batches = (len(resume_files) + batch_size - 1) // batch_size
-
-                print(f"[RUN {run_id}] Batch {batch_no}/{total_batches} started")
-
-                for idx, resume_path in enumerate(batch, start=1):
-                    overall_index = i + idx
-                    file_name = os.path.basename(resume_path)
-
-                    if rate_limit_hit:
-                        resume_id = get_or_create_resume(db, resume_path)
-                        existing_result = db.query(ResumeResult).filter(
-                            ResumeResult.resume_id == resume_id,
-                            ResumeResult.job_id == job_id,
-                            ResumeResult.extracted_data.isnot(None)
-                        ).first()
-
-                        if existing_result:
-                            print(f"[RUN {run_id}] Rate limit hit but reusing existing result → {file_name}")
-                            existing_result.run_id = run_id
-                            existing_result.processed_at = datetime.utcnow()
-                            existing_result.ai_status = "reused"
-                            run.processed_count += 1
-                        else:
-                            print(f"[RUN {run_id}] ⏳ Skipping (rate limit already hit) → {file_name}")
-                            run.failed_count += 1
-                            db.add(ResumeResult(
-                                run_id=run_id,
-                                resume_id=resume_id,
-                                job_id=job_id,
-                                ai_status="rate_limited",
-                                error_message="Groq rate limit hit earlier in this run"
-                            ))
-                        db.commit()
-                        continue
-
-                    print(
-                        f"[RUN {run_id}] Processing resume "
-                        f"{overall_index}/{len(resume_files)} → {file_name}"
-                    )
-
-                    resume_id = None
-                    try:
-                        resume_id = get_or_create_resume(db, resume_path)
-
-                        if resume_id is None:
-                            print(f"[RUN {run_id}] ❌ Failed to create resume record → {file_name}")
-                            run.failed_count += 1
-                            continue  
-                        # 🔎 Check if already processed for this job (skip failed rows)
-                        existing_result = db.query(ResumeResult).filter(
-                            ResumeResult.resume_id == resume_id,
-                            ResumeResult.job_id == job_id,
-                            ResumeResult.extracted_data.isnot(None)
-                        ).first()
-
-                        if existing_result:
-                            print(f"[RUN {run_id}] Reusing existing result for job")
-
-                            existing_result.run_id = run_id
-                            existing_result.processed_at = datetime.utcnow()
-                            existing_result.ai_status = "reused"
-
-                            # Backfill passed_out_year if missing but present in stored data
-                            if existing_result.passed_out_year is None and existing_result.extracted_data:
-                                raw_year = existing_result.extracted_data.get("passed_out_year")
-                                existing_result.passed_out_year = int(raw_year) if raw_year is not None else None
-
-                        else:
-                            # 🔎 Check if extracted before (for other jobs)
-                            # Only reuse if extracted_data is not None (skip failed results)
-                            previous_any = db.query(ResumeResult).filter(
-                                ResumeResult.resume_id == resume_id,
-                                ResumeResult.extracted_data.isnot(None)
-                            ).first()
-
-                            if previous_any:
-                                print(f"[RUN {run_id}] Reusing extracted data, re-scoring")
-
-                                extracted_data = previous_any.extracted_data
-
-                            else:
-                                # 🚀 New resume → Call AI
-                                print(f"[RUN {run_id}] Calling AI extraction")
-
-                                extracted = process_single_resume(resume_path)
-                                extracted_data = extracted["extracted_data"]
-
-                            extracted_data = _normalize_email(extracted_data)
-                            personal = extracted_data.get("personal_details") or {}
-
-                            # Score for this job
-                            score, reason, disqualified = score_resume(
-                                job_config,
-                                extracted_data
-                            )
-
-                            decision = "rejected" if disqualified or score < 60 else "shortlisted"
-
-                            raw_year = extracted_data.get("passed_out_year")
-                            if raw_year is None and previous_any is not None:
-                                raw_year = previous_any.passed_out_year
-                            passed_out_year = int(raw_year) if raw_year is not None else None
-
-                            db.add(
-                                ResumeResult(
-                                    run_id=run_id,
-                                    resume_id=resume_id,
-                                    job_id=job_id,
-                                    extracted_data=extracted_data,
-                                    full_name=personal.get("full_name"),
-                                    email=personal.get("email"),
-                                    phone=personal.get("phone"),
-                                    score=score,
-                                    decision=decision,
-                                    decision_reason=reason,
-                                    passed_out_year=passed_out_year,
-                                    ai_status="success"
-                                )
-                            )
-
-                        run.processed_count += 1
-
-                    except RateLimitError as e:
-                        print(f"[RUN {run_id}] ⏳ Groq rate limit hit: {file_name}")
-                        rate_limit_hit = True
-                        db.rollback()
-                        run.failed_count += 1
-                        if resume_id:
-                            try:
-                                db.add(ResumeResult(
-                                    run_id=run_id,
-                                    resume_id=resume_id,
-                                    job_id=job_id,
-                                    ai_status="rate_limited",
-                                    error_message=str(e)
-                                ))
-                                db.commit()
-                            except Exception:
-                                db.rollback()
-                        continue
-
-                    except Exception as e:
-                        print(f"[RUN {run_id}] ❌ Error processing {file_name}: {e}")
-                        db.rollback()
-                        run.failed_count += 1
-                        if resume_id:
-                            try:
-                                db.add(ResumeResult(
-                                    run_id=run_id,
-                                    resume_id=resume_id,
-                                    job_id=job_id,
-                                    ai_status="failed",
-                                    error_message=str(e)
-                                ))
-                                db.commit()
-                            except Exception:
-                                db.rollback()
-                        continue
-
-                    finally:
-                        try:
-                            db.commit()
-                        except Exception:
-                            db.rollback()
-                        
-
+        total = await db.run_sync(enqueue_rescore, run, source_job_ids)
+    except Exception as e:
+        # rollback expires `run`; don't read it back (no lazy loads on an AsyncSession)
+        await db.rollback()
+        run.status = "crashed"
         run.ended_at = datetime.utcnow()
-        run.status = "completed"
-        db.commit()
-        print(f"[RUN {run_id}] Completed")
-
-    finally:
-        try:
-            stale = db.query(ResumeRun).filter_by(run_id=run_id).first()
-            if stale and stale.status == "running":
-                stale.status = "crashed"
-                stale.ended_at = datetime.utcnow()
-                db.commit()
-        except Exception:
-            pass
-        db.close()
+        await db.commit()
+        RUNS_FINISHED.labels("crashed").inc()
+        print(f"[RUN {run_id}] ❌ Failed to queue re-score: {e}")
+        raise HTTPException(status_code=500, detail="Failed to queue re-score")
+
+    RUNS_STARTED.labels("rescore").inc()
+    print(f"[RUN {run_id}] Queued {total} stored extraction(s) for re-scoring from job(s) {source_job_ids}")
+    return {"run_id": run_id, "status": run.status, "total_resumes": total}
+
+
+@router.post("/talent-pool/{job_id}")
+async def screen_talent_pool(job_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Score every stored candidate profile not yet screened for this job —
+    no uploads, no LLM calls. Progress via GET /runs/{run_id}.
+    """
+    job = await db.get(JobConfig, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        run = await db.run_sync(start_talent_pool_run, job_id)
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to queue talent pool")
+    return {"run_id": run.run_id, "status": run.status, "total_resumes": run.total_resumes}
 
 
 @router.get("/runs/{run_id}")
-def get_run_status(run_id: int):
-    db = SessionLocal()
+async def get_run_status(run_id: int, db: AsyncSession = Depends(get_db)):
+    run = await db.get(ResumeRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return _run_state(run)
+
+
+def _run_state(run: ResumeRun) -> dict:
+    return {
+        "run_id":          run.run_id,
+        "status":          run.status,
+        "run_type":        run.run_type,
+        "total_resumes":   run.total_resumes,
+        "processed_count": run.processed_count,
+        "failed_count":    run.failed_count,
+        "started_at":      run.started_at,
+        "ended_at":        run.ended_at,
+    }
+
+
+async def _load_run_state(run_id: int):
+    # Short-lived session: a stream may stay open for the whole run, and must
+    # not hold a pooled connection while it waits for events
+    async with async_session() as db:
+        run = await db.get(ResumeRun, run_id)
+        return _run_state(run) if run else None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_run_events(run_id: int, request: Request):
+    """
+    Server-Sent Events stream of a run's progress, pushed as workers commit.
+
+    `progress` — the run as returned by GET /runs/{run_id}, plus `items`: the
+    outcome of each resume written since the previous event (file_name,
+    status, ai_status, score, decision, error).
+    `done` — the final run state once it completes or crashes; the stream
+    then closes.
+    """
+    # Subscribe before reading the snapshot so no event falls between them
+    queue = broker.subscribe(run_id)
     try:
-        run = db.query(ResumeRun).filter_by(run_id=run_id).first()
-        if not run:
-            raise HTTPException(status_code=404, detail="Run not found")
-        return {
-            "run_id":          run.run_id,
-            "status":          run.status,
-            "total_resumes":   run.total_resumes,
-            "processed_count": run.processed_count,
-            "failed_count":    run.failed_count,
-            "started_at":      run.started_at,
-            "ended_at":        run.ended_at,
-        }
-    finally:
-        db.close()
+        state = await _load_run_state(run_id)
+    except Exception:
+        broker.unsubscribe(run_id, queue)
+        raise
+    if state is None:
+        broker.unsubscribe(run_id, queue)
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    async def events():
+        nonlocal state
+        try:
+            yield _sse("progress", dict(state, items=[]))
+            synced_at = time.monotonic()
+            while state["status"] not in FINISHED_RUN_STATUSES:
+                resync_in = RUN_EVENTS_RESYNC_SECONDS - (time.monotonic() - synced_at)
+                try:
+                    run_event = await asyncio.wait_for(
+                        queue.get(), timeout=max(0, min(SSE_KEEPALIVE_SECONDS, resync_in))
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    if time.monotonic() - synced_at >= RUN_EVENTS_RESYNC_SECONDS:
+                        state = await _load_run_state(run_id) or state
+                        synced_at = time.monotonic()
+                        yield _sse("progress", dict(state, items=[]))
+                    else:
+                        yield ": keepalive\n\n"
+                    continue
+
+                # Events are shared between streams: merge, never mutate.
+                # Commits from several workers can land out of order, and
+                # counters only ever grow.
+                for key, value in run_event.items():
+                    if key in RUN_COUNTERS:
+                        state[key] = max(state[key] or 0, value)
+                    elif key not in ("run_id", "items"):
+                        state[key] = value
+                yield _sse("progress", dict(state, items=run_event.get("items", [])))
+
+            yield _sse("done", await _load_run_state(run_id) or state)
+        finally:
+            broker.unsubscribe(run_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: stop nginx-style proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.patch("/results/{result_id}")
-def patch_result(result_id: int, body: dict):
-    db = SessionLocal()
-    try:
-        result = db.query(ResumeResult).filter_by(result_id=result_id).first()
-        if not result:
-            raise HTTPException(status_code=404, detail="Result not found")
-        if "decision" in body:
-            val = body["decision"]
-            result.decision = val if val in ("shortlisted", "rejected") else result.decision
-        db.commit()
-        return {"result_id": result_id, "decision": result.decision}
-    finally:
-        db.close()
+async def patch_result(result_id: int, body: dict, db: AsyncSession = Depends(get_db)):
+    result = await db.get(ResumeResult, result_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Result not found")
+    if "decision" in body:
+        val = body["decision"]
+        result.decision = val if val in ("shortlisted", "rejected") else result.decision
+    await db.commit()
+    return {"result_id": result_id, "decision": result.decision}
 
 
 @router.get("/results/{job_id}")
-def get_results(job_id: int, limit: int = 500, offset: int = 0):
-    print("Fetching results from DB")
-    db = SessionLocal()
-    try:
-        # Get job title once
-        job = db.query(JobConfig).filter(
-            JobConfig.job_id == job_id
-        ).first()
-
-        if not job:
-            return []
-
-        results = db.query(ResumeResult).filter(
-            ResumeResult.job_id == job_id
-        ).order_by(ResumeResult.processed_at.desc()).offset(offset).limit(limit).all()
-
-        output = []
-        for r in results:
-            output.append({
-                "result_id":       r.result_id,
-                "full_name":       r.full_name,
-                "email":           r.email,
-                "phone":           r.phone,
-                "job_title":       job.job_title,
-                "passed_out_year": r.passed_out_year,
-                "score":           r.score,
-                "decision":        r.decision,
-                "decision_reason": r.decision_reason,
-                "processed_at":    r.processed_at
-            })
-
-        return output
-
-    finally:
-        db.close()
+async def get_results(
+    job_id: int,
+    response: Response,
+    limit: int = 500,
+    cursor: str = None,
+    sort: str = "recent",
+    from_date: date = None,
+    to_date: date = None,
+    decision: str = None,
+    min_score: int = None,
+    min_passed_out_year: int = None,
+    skills: list[str] = Query(None),
+    min_experience: float = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    One page of results, filtered and ordered in SQL. Keyset pagination:
+    pass the `X-Next-Cursor` response header back as `cursor` for the next
+    page; it is absent on the last one. `to_date` is inclusive. Rows with
+    no value for the sort key are skipped (no score: failed resumes).
+    `skills` (repeatable, all required) and `min_experience` match the
+    candidate's profile columns, so resumes without a profile are excluded.
+    """
+    if sort not in RESULT_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {sorted(RESULT_SORTS)}")
+    if decision is not None and decision not in ("shortlisted", "rejected"):
+        raise HTTPException(status_code=400, detail="decision must be 'shortlisted' or 'rejected'")
+    limit = max(1, min(limit, MAX_RESULTS_PAGE))
+
+    # Get job title once
+    job_title = await db.scalar(select(JobConfig.job_title).filter(JobConfig.job_id == job_id))
+    if job_title is None:
+        return []
+
+    query = select(
+        ResumeResult.result_id,
+        ResumeResult.full_name,
+        ResumeResult.email,
+        ResumeResult.phone,
+        ResumeResult.passed_out_year,
+        ResumeResult.score,
+        ResumeResult.decision,
+        ResumeResult.decision_reason,
+        ResumeResult.processed_at,
+    ).filter(ResumeResult.job_id == job_id)
+
+    if from_date is not None:
+        query = query.filter(ResumeResult.processed_at >= from_date)
+    if to_date is not None:
+        query = query.filter(ResumeResult.processed_at < to_date + timedelta(days=1))
+    if decision is not None:
+        query = query.filter(ResumeResult.decision == decision)
+    if min_score is not None:
+        query = query.filter(ResumeResult.score >= min_score)
+    if min_passed_out_year is not None:
+        query = query.filter(ResumeResult.passed_out_year >= min_passed_out_year)
+
+    conditions = profile_conditions(db, skills or (), min_experience)
+    if conditions:
+        query = query.filter(exists().where(
+            CandidateProfile.resume_id == ResumeResult.resume_id, *conditions
+        ))
+
+    key_column, descending = RESULT_SORTS[sort]
+    query = query.filter(key_column.isnot(None))
+
+    sort_key = key_column
+    if sort == "recent":
+        sort_key = sortable_timestamp(db, key_column)
+
+    keyset = tuple_(sort_key, ResumeResult.result_id)
+    if cursor:
+        key, result_id = _decode_cursor(cursor, sort)
+        if sort == "recent":
+            key = sortable_timestamp(db, bindparam("cursor_key", key, type_=key_column.type))
+        after = tuple_(key, result_id)
+        query = query.filter(keyset < after if descending else keyset > after)
+
+    if descending:
+        query = query.order_by(sort_key.desc(), ResumeResult.result_id.desc())
+    else:
+        query = query.order_by(sort_key.asc(), ResumeResult.result_id.asc())
+
+    # One extra row tells whether there is a next page
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(
+            sort, getattr(last, key_column.key), last.result_id
+        )
 
+    return [dict(row._asdict(), job_title=job_title) for row in rows]
@@ -0,0 +1,30 @@
+from sqlalchemy import Text, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def array_overlap(db, column, values: list):
+    """
+    `column && values` for a TextArray column on the session's dialect:
+    true when the stored list shares any element with `values`. Postgres
+    uses the array operator (GIN-indexed); SQLite keeps the list as JSON
+    and checks its elements with json_each.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return type_coerce(column, ARRAY(Text)).overlap(values)
+    if dialect == "sqlite":
+        elements = func.json_each(column).table_valued("value")
+        return exists(select(1).select_from(elements).where(elements.c.value.in_(values)))
+    raise NotImplementedError(f"array_overlap: unsupported dialect {dialect!r}")
+
+
+def sortable_timestamp(db, expression):
+    """
+    A TIMESTAMP column or bound value in a form that orders correctly on the
+    session's dialect. SQLite keeps timestamps as text — 'YYYY-MM-DD HH:MM:SS'
+    from the server default, with microseconds when SQLAlchemy writes them —
+    and the two do not compare as strings; julianday() reads both.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.julianday(expression)
+    return expression
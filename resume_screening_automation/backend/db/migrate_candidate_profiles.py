@@ -4,13 +4,20 @@ Migration: create candidate_profiles table and backfill from existing extracted_
 Run once:
     cd backend
     python -m db.migrate_candidate_profiles
+
+Safe to re-run — resumes that already have a profile are skipped. The
+newest successful result of each resume becomes its profile; the worker
+keeps profiles current from then on.
 """
 
 from db.session import engine, SessionLocal
 from db.models import Base, CandidateProfile, ResumeResult
+from db.upsert import insert_ignore_conflicts
 from email_validator import validate_email, EmailNotValidError
+from services.scoring_engine import current_tables
+from services.talent_pool import profile_row
 
-BATCH_SIZE = 20
+BATCH_SIZE = 500
 
 
 def _safe_email(value):
@@ -28,63 +35,49 @@ def run():
     db = SessionLocal()
     try:
         # 2. Count total rows to process
-        total = db.query(ResumeResult.result_id).count()
+        total = db.query(ResumeResult.result_id).filter(ResumeResult.extracted_data.isnot(None)).count()
         print(f"Total resume results found: {total}")
 
+        tables = current_tables()
+        existing = db.query(CandidateProfile.profile_id).count()
         seen = set()
-        created = 0
         skipped = 0
-        offset = 0
+        processed = 0
+        last_id = None
 
+        # Newest first, so the first result seen per resume is its latest
         while True:
-            batch = (
-                db.query(ResumeResult)
-                .order_by(ResumeResult.result_id)
-                .offset(offset)
-                .limit(BATCH_SIZE)
-                .all()
-            )
+            query = db.query(
+                ResumeResult.result_id, ResumeResult.resume_id, ResumeResult.extracted_data
+            ).filter(ResumeResult.extracted_data.isnot(None))
+            if last_id is not None:
+                query = query.filter(ResumeResult.result_id < last_id)
+            batch = query.order_by(ResumeResult.result_id.desc()).limit(BATCH_SIZE).all()
             if not batch:
                 break
+            last_id = batch[-1].result_id
+            processed += len(batch)
 
+            rows = []
             for r in batch:
-                if r.resume_id in seen:
-                    skipped += 1
-                    continue
-                seen.add(r.resume_id)
-
                 data = r.extracted_data
-                if not data:
-                    skipped += 1
-                    continue
-
-                # Skip if profile already exists
-                exists = db.query(CandidateProfile.profile_id).filter_by(resume_id=r.resume_id).scalar()
-                if exists:
+                if r.resume_id in seen or not isinstance(data, dict):
                     skipped += 1
                     continue
+                seen.add(r.resume_id)
 
-                personal = data.get("personal_details") or {}
-                raw_year = data.get("passed_out_year")
-
-                profile = CandidateProfile(
-                    resume_id        = r.resume_id,
-                    full_name        = personal.get("full_name"),
-                    email            = _safe_email(personal.get("email")),
-                    phone            = personal.get("phone"),
-                    experience_years = data.get("experience_years"),
-                    passed_out_year  = int(raw_year) if raw_year is not None else None,
-                    skills           = data.get("skills", []),
-                    education        = data.get("education", []),
-                    projects         = data.get("projects", []),
-                )
-                db.add(profile)
-                created += 1
+                personal = data.get("personal_details")
+                if isinstance(personal, dict):
+                    personal["email"] = _safe_email(personal.get("email"))
+                rows.append(profile_row(r.resume_id, data, tables))
 
+            # Resumes that already have a profile are left as they are
+            if rows:
+                db.execute(insert_ignore_conflicts(db, CandidateProfile), rows)
             db.commit()
-            offset += BATCH_SIZE
-            print(f"  Processed {min(offset, total)}/{total} — created so far: {created}")
+            print(f"  Processed {processed}/{total}")
 
+        created = db.query(CandidateProfile.profile_id).count() - existing
         print(f"\nDone. Created: {created}, Skipped: {skipped}")
 
     finally:
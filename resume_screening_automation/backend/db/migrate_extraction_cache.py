@@ -0,0 +1,67 @@
+"""
+Migration: create extraction_cache table and seed it from existing extracted_data.
+
+Existing extractions carry no record of the prompt/model that produced them.
+This script stamps them with the CURRENT model + prompt hash (which includes
+the text preprocessing version), so only run it if RESUME_EXTRACTION_PROMPT
+and the preprocessing have not changed since those resumes were screened.
+Without it, previously screened resumes are simply re-extracted once.
+
+Run once:
+    cd backend
+    python -m db.migrate_extraction_cache
+"""
+
+from db.session import engine, SessionLocal
+from db.models import Base, ExtractionCache, ResumeFile, ResumeResult
+from services.extraction_cache import store_extraction
+
+BATCH_SIZE = 200
+
+
+def run():
+    # 1. Create table if it doesn't exist
+    Base.metadata.create_all(engine, tables=[ExtractionCache.__table__])
+    print("Table extraction_cache ensured.")
+
+    db = SessionLocal()
+    try:
+        seen = set()
+        seeded = 0
+        last_id = 0
+
+        while True:
+            # One cache row per file — the first extraction found is kept
+            batch = (
+                db.query(ResumeResult.result_id, ResumeResult.extracted_data, ResumeFile.file_hash)
+                .join(ResumeFile, ResumeFile.resume_id == ResumeResult.resume_id)
+                .filter(
+                    ResumeResult.result_id > last_id,
+                    ResumeResult.extracted_data.isnot(None)
+                )
+                .order_by(ResumeResult.result_id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not batch:
+                break
+
+            for result_id, extracted_data, file_hash in batch:
+                last_id = result_id
+                if file_hash in seen:
+                    continue
+                seen.add(file_hash)
+                store_extraction(db, file_hash, extracted_data)
+                seeded += 1
+
+            db.commit()
+            print(f"  Up to result_id {last_id} — seeded so far: {seeded}")
+
+        print(f"\nDone. Seeded: {seeded}")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
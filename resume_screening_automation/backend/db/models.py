@@ -3,15 +3,23 @@ from sqlalchemy import (
     Integer,
     Text,
     Boolean,
+    Float,
     JSON,
+    LargeBinary,
     ForeignKey,
-    TIMESTAMP
+    TIMESTAMP,
+    UniqueConstraint
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import declarative_base, deferred
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Postgres TEXT[] / JSONB (GIN-indexed, see migrations/); plain JSON on other databases
+TextArray = JSON().with_variant(ARRAY(Text), "postgresql")
+JSONBDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class JobConfig(Base):
     __tablename__ = "job_configs"
@@ -20,6 +28,7 @@ class JobConfig(Base):
     job_title = Column(Text, nullable=False)
     job_config = Column(JSON, nullable=False)
     version = Column(Integer, default=1)
+    parent_job_id = Column(Integer, ForeignKey("job_configs.job_id"))  # version this one replaced
     is_active = Column(Boolean, default=True)
     created_at = Column(TIMESTAMP, server_default=func.now())
 
@@ -34,6 +43,7 @@ class ResumeRun(Base):
     processed_count = Column(Integer, default=0)
     failed_count = Column(Integer, default=0)
     status = Column(Text, default="running")
+    run_type = Column(Text, nullable=False, default="screening")  # screening | rescore | talent_pool
     started_at = Column(TIMESTAMP, server_default=func.now())
     ended_at = Column(TIMESTAMP)
 
@@ -69,3 +79,82 @@ class ResumeResult(Base):
     ai_status       = Column(Text)
     error_message   = Column(Text)
     processed_at    = Column(TIMESTAMP, server_default=func.now())
+
+
+class CandidateProfile(Base):
+    """
+    One deduplicated extracted profile per resume file (latest extraction
+    wins). The typed columns hold the job-independent scoring keys
+    (scoring_engine.scoring_keys()), written together with extracted_data,
+    so talent-pool scoring and profile filters never decode the document.
+    """
+    __tablename__ = "candidate_profiles"
+
+    profile_id       = Column(Integer, primary_key=True)
+    resume_id        = Column(Integer, ForeignKey("resume_files.resume_id"), unique=True, nullable=False)
+
+    full_name        = Column(Text)
+    email            = Column(Text)
+    phone            = Column(Text)
+    experience_years = Column(Float)
+    passed_out_year  = Column(Integer)
+    extracted_data   = Column(JSON, nullable=False)
+
+    skills           = Column(TextArray)                 # resolved canonical skills; NULL = score from extracted_data
+    degrees          = Column(TextArray)                 # canonical degree / degree-group ids
+    project_domains  = Column(JSONBDocument)             # one list of domain tokens per project
+    keys_version     = Column(Text)                      # alias tables version the keys were built with
+    updated_at       = Column(TIMESTAMP, server_default=func.now())
+
+
+class ExtractionCache(Base):
+    """AI extraction output keyed by file content + the model/prompt that produced it."""
+    __tablename__ = "extraction_cache"
+
+    cache_id       = Column(Integer, primary_key=True)
+    file_hash      = Column(Text, nullable=False)
+    model          = Column(Text, nullable=False)
+    prompt_hash    = Column(Text, nullable=False)
+    extracted_data = Column(JSON, nullable=False)
+    created_at     = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("file_hash", "model", "prompt_hash", name="uq_extraction_cache_key"),
+    )
+
+
+class ScreeningItem(Base):
+    """Work queue: one row per resume per run, claimed by screening workers."""
+    __tablename__ = "screening_items"
+
+    item_id       = Column(Integer, primary_key=True)
+    run_id        = Column(Integer, ForeignKey("resume_runs.run_id"), nullable=False)
+    job_id        = Column(Integer, ForeignKey("job_configs.job_id"), nullable=False)
+    seq           = Column(Integer, nullable=False)      # position in the uploaded ZIP
+    file_name     = Column(Text, nullable=False)         # member path inside the ZIP
+    content       = deferred(Column(LargeBinary))        # resume bytes; cleared once processed
+    file_hash     = Column(Text)                         # hashed while enqueueing
+    resume_id     = Column(Integer, ForeignKey("resume_files.resume_id"))
+    source_result_id = Column(Integer, ForeignKey("resume_results.result_id"))  # re-score runs: stored extraction, no content
+
+    status        = Column(Text, nullable=False, default="pending")  # pending | processing | done | failed
+    attempts      = Column(Integer, nullable=False, default=0)
+    claimed_by    = Column(Text)
+    claimed_at    = Column(TIMESTAMP)
+    finished_at   = Column(TIMESTAMP)
+    error_message = Column(Text)
+
+    text_extractor = Column(Text)                        # backend that produced the text
+    extract_ms     = Column(Integer)                     # text extraction time
+
+
+class GroqBudget(Base):
+    """The Groq requests/tokens bucket shared by every process (services/rate_limiter)."""
+    __tablename__ = "groq_budget"
+
+    name         = Column(Text, primary_key=True)
+    requests     = Column(Float, nullable=False)   # requests left in the bucket
+    tokens       = Column(Float, nullable=False)   # tokens left (negative = debt from settle)
+    updated_at   = Column(Float, nullable=False)   # epoch seconds of the last refill, database clock
+    paused_until = Column(Float, nullable=False, default=0)  # epoch seconds; set on 429
+    grant_id     = Column(Text)                    # the last acquire() that got through
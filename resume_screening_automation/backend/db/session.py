@@ -1,6 +1,10 @@
 import os
+import threading
+from uuid import uuid4
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 
 # 🔑 LOAD .env FILE
@@ -11,9 +15,172 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise RuntimeError("DATABASE_URL is not set in .env")
 
+# Pool per engine, per process. The API process has two engines (sync + async),
+# so it can hold up to 2 × (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Connections older than this are replaced on checkout. Keep it below the
+# server's / proxy's idle-connection timeout (Neon suspends after 5 min idle).
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+
+# "1": ping every connection on checkout (one extra round trip per checkout,
+# catches any dropped connection). "0": rely on DB_POOL_RECYCLE alone.
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+# Server-side statement_timeout for every connection; 0 disables
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "60000"))
+
+# "1" when DATABASE_URL points at pgbouncer (or Neon's -pooler endpoint) in
+# transaction mode: no startup parameters, no server-side prepared statements.
+# Set statement_timeout on the role instead:
+#   ALTER ROLE app_user SET statement_timeout = '60s';
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "0") == "1"
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size":     DB_POOL_SIZE,
+        "max_overflow":  DB_MAX_OVERFLOW,
+        "pool_timeout":  DB_POOL_TIMEOUT,
+        "pool_recycle":  DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _sync_connect_args(url: str) -> dict:
+    if make_url(url).get_backend_name() != "postgresql" or DB_PGBOUNCER or not DB_STATEMENT_TIMEOUT_MS:
+        return {}
+    return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+
+# ── Pool metrics ───────────────────────────────────────────────────────────────
+
+_pool_counters = {}
+_pool_counters_lock = threading.Lock()
+
+
+def _count(engine_name: str, counter: str):
+    with _pool_counters_lock:
+        _pool_counters[engine_name][counter] += 1
+
+
+def _track_pool(engine_name: str, sync_engine):
+    """Count new connections, checkouts and invalidated (dropped/failed-ping) connections."""
+    with _pool_counters_lock:
+        _pool_counters[engine_name] = {"connects": 0, "checkouts": 0, "invalidations": 0}
+    event.listen(sync_engine, "connect", lambda *_: _count(engine_name, "connects"))
+    event.listen(sync_engine, "checkout", lambda *_: _count(engine_name, "checkouts"))
+    event.listen(sync_engine, "invalidate", lambda *_: _count(engine_name, "invalidations"))
+
+
+def _pool_snapshot(engine_name: str, pool) -> dict:
+    snapshot = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+    # QueuePool gauges; other pool classes (e.g. tests on SQLite) lack them
+    if hasattr(pool, "checkedout"):
+        snapshot["checked_in"] = pool.checkedin()
+        snapshot["checked_out"] = pool.checkedout()
+        snapshot["overflow"] = max(0, pool.overflow())  # negative while below pool_size
+    with _pool_counters_lock:
+        snapshot.update(_pool_counters.get(engine_name, {}))
+    return snapshot
+
+
+def pool_status() -> dict:
+    """Gauges and counters for each engine this process has created."""
+    status = {"sync": _pool_snapshot("sync", engine.pool)}
+    if _async_engine is not None:
+        status["async"] = _pool_snapshot("async", _async_engine.sync_engine.pool)
+    return status
+
+
+# ── Engines ────────────────────────────────────────────────────────────────────
+
+# Sync engine: screening workers, migrations scripts and the upload route
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True
+    connect_args=_sync_connect_args(DATABASE_URL),
+    **_pool_options()
 )
+_track_pool("sync", engine)
 
 SessionLocal = sessionmaker(bind=engine)
+
+
+def async_url(url: str):
+    """
+    DATABASE_URL rewritten for an async driver, plus its connect_args.
+    libpq-only query options asyncpg rejects are translated: sslmode becomes
+    asyncpg's `ssl` argument (same mode names), channel_binding is dropped.
+    """
+    url = make_url(url)
+    connect_args = {}
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            connect_args["ssl"] = sslmode
+        if DB_PGBOUNCER:
+            # pgbouncer hands each transaction a different server connection,
+            # so no statement may be cached, and one-off names must not collide
+            query["prepared_statement_cache_size"] = "0"
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        elif DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url, connect_args
+
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def get_async_engine():
+    """
+    asyncpg engine for the API's async routes. Created on first use, so
+    worker processes that only use the sync engine never open it.
+    """
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        url, connect_args = async_url(DATABASE_URL)
+        _async_engine = create_async_engine(url, connect_args=connect_args, **_pool_options())
+        _track_pool("async", _async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _AsyncSessionLocal = None
+
+
+def async_session():
+    """A new AsyncSession, for async code that outlives a request dependency."""
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_db():
+    """FastAPI dependency: one AsyncSession per request, closed when it ends."""
+    async with async_session() as db:
+        yield db
+
+
+def get_sync_db():
+    """
+    FastAPI dependency for the few routes that do blocking work (ZIP upload
+    hashing) and therefore run in the threadpool with a sync Session.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
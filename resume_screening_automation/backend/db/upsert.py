@@ -0,0 +1,34 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def insert_ignore_conflicts(db, model):
+    """
+    INSERT ... ON CONFLICT DO NOTHING for `model` on the session's dialect.
+    Lets concurrent workers insert the same natural key without racing on
+    a unique-constraint error.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    raise NotImplementedError(f"insert_ignore_conflicts: unsupported dialect {dialect!r}")
+
+
+def upsert(db, model, index_elements: list, update_columns: list):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO UPDATE SET col = excluded.col
+    for `update_columns`, on the session's dialect. A multi-row statement
+    must not contain the same key twice.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model)
+    else:
+        raise NotImplementedError(f"upsert: unsupported dialect {dialect!r}")
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={c: stmt.excluded[c] for c in update_columns},
+    )
@@ -1,21 +1,55 @@
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Response
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from api.jobs import router as jobs_router
 from api.screening import router as screening_router
+from db.session import dispose_async_engine, pool_status
 from security import verify_api_key
+from services.screening_worker import INLINE_WORKER, start_inline_worker
+from services.run_events import start_listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Screening runs are drained by `python worker.py`; the inline worker is
+    # a development convenience (SCREENING_INLINE_WORKER=1)
+    stop_worker = start_inline_worker() if INLINE_WORKER else None
+    if not INLINE_WORKER:
+        print("[WORKER] Inline worker off — queued runs wait for `python worker.py`")
+    # Run progress for GET /screening/runs/{run_id}/events
+    events_task = start_listener()
+    yield
+    if events_task:
+        events_task.cancel()
+    if stop_worker:
+        stop_worker.set()
+    await dispose_async_engine()
+
 
 app = FastAPI(
     title="Resume Screening Backend",
-    swagger_ui_parameters={"persistAuthorization": True}
+    swagger_ui_parameters={"persistAuthorization": True},
+    lifespan=lifespan
 )
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 @app.head("/health", include_in_schema=False)
-def health_head():
+async def health_head():
     pass
 
+@app.get("/health/pool", dependencies=[Depends(verify_api_key)])
+async def health_pool():
+    """Connection pool gauges (checked in / out, overflow) and counters per engine."""
+    return pool_status()
+
+@app.get("/metrics", dependencies=[Depends(verify_api_key)], include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this process (API routes + inline worker)."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # 🔒 Protect all routes with API key
 app.include_router(jobs_router, prefix="/jobs", dependencies=[Depends(verify_api_key)])
 app.include_router(screening_router, dependencies=[Depends(verify_api_key)])
@@ -8,7 +8,7 @@ API_KEY = os.getenv("API_KEY")
 # Header name
 api_key_header = APIKeyHeader(name="x-api-key", auto_error=False)
 
-def verify_api_key(api_key: str = Security(api_key_header)):
+async def verify_api_key(api_key: str = Security(api_key_header)):
     if API_KEY is None:
         raise HTTPException(status_code=500, detail="API key not configured")
 
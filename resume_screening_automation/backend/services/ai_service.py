@@ -2,8 +2,12 @@ import os
 import json
 from groq import Groq
 from prompts.recruiter_prompt import JOB_CONFIG_PROMPT
+from services.rate_limiter import call_with_rate_limit, estimate_tokens
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Retries are handled by the shared rate limiter, not the SDK
+client = Groq(api_key=os.getenv("GROQ_API_KEY"), max_retries=0)
+
+JOB_CONFIG_COMPLETION_TOKENS = 500
 
 def normalize_scoring_weights(weights: dict) -> dict:
     total = sum(weights.values())
@@ -27,7 +31,12 @@ def normalize_scoring_weights(weights: dict) -> dict:
 
 
 def generate_job_config(job_description: str) -> dict:
-    response = client.chat.completions.create(
+    response = call_with_rate_limit(
+        client.chat.completions.create,
+        estimate_tokens(
+            JOB_CONFIG_PROMPT, job_description,
+            completion_tokens=JOB_CONFIG_COMPLETION_TOKENS
+        ),
         model="llama-3.1-8b-instant",
         messages=[
             {"role": "system", "content": JOB_CONFIG_PROMPT},
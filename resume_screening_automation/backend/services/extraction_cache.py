@@ -0,0 +1,118 @@
+import os
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from db.models import ExtractionCache
+from db.upsert import insert_ignore_conflicts
+from services.resume_ai_extractor import EXTRACTION_MODEL, EXTRACTION_PROMPT_HASH
+from services.resume_processor import preprocessing_version
+from services.metrics import EXTRACTION_CACHE_LOOKUPS
+
+# Entries kept in the per-process LRU in front of the extraction_cache table
+EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "2048"))
+
+
+class _LRU:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_lru = _LRU(EXTRACTION_CACHE_SIZE)
+
+
+@lru_cache(maxsize=1)
+def _prompt_hash() -> str:
+    """
+    The prompt_hash column: the prompt and the text preprocessing the
+    extraction was produced with, so changing either (or the token budget)
+    invalidates cached results.
+    """
+    key = f"{EXTRACTION_PROMPT_HASH}:{preprocessing_version()}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _key(file_hash: str) -> tuple:
+    return (file_hash, EXTRACTION_MODEL, _prompt_hash())
+
+
+def get_cached_extractions(db, file_hashes: list) -> dict:
+    """
+    file_hash → extracted data under the current model + prompt, for every
+    hash that has one. LRU first, then a single lookup on the unique
+    (file_hash, model, prompt_hash) index for the misses. Values are copies —
+    callers may mutate them.
+    """
+    found = {}
+    misses = []
+    for file_hash in set(file_hashes):
+        data = _lru.get(_key(file_hash))
+        if data is None:
+            misses.append(file_hash)
+        else:
+            found[file_hash] = data
+    EXTRACTION_CACHE_LOOKUPS.labels("lru_hit").inc(len(found))
+
+    if misses:
+        rows = db.query(ExtractionCache.file_hash, ExtractionCache.extracted_data).filter(
+            ExtractionCache.file_hash.in_(misses),
+            ExtractionCache.model == EXTRACTION_MODEL,
+            ExtractionCache.prompt_hash == _prompt_hash(),
+        ).all()
+        for file_hash, data in rows:
+            _lru.put(_key(file_hash), data)
+            found[file_hash] = data
+        EXTRACTION_CACHE_LOOKUPS.labels("db_hit").inc(len(rows))
+        EXTRACTION_CACHE_LOOKUPS.labels("miss").inc(len(misses) - len(rows))
+
+    return {h: copy.deepcopy(d) for h, d in found.items()}
+
+
+def store_extractions(db, extractions: dict):
+    """
+    Cache fresh AI extractions, file_hash → extracted data, in one statement
+    (caller commits, then calls remember_extractions). First writer wins on
+    a race.
+    """
+    if not extractions:
+        return
+    prompt_hash = _prompt_hash()
+    db.execute(insert_ignore_conflicts(db, ExtractionCache), [
+        {
+            "file_hash":      file_hash,
+            "model":          EXTRACTION_MODEL,
+            "prompt_hash":    prompt_hash,
+            "extracted_data": extracted_data,
+        }
+        for file_hash, extracted_data in extractions.items()
+    ])
+
+
+def remember_extractions(extractions: dict):
+    """Put committed extractions in the per-process LRU."""
+    for file_hash, extracted_data in extractions.items():
+        _lru.put(_key(file_hash), copy.deepcopy(extracted_data))
+
+
+def store_extraction(db, file_hash: str, extracted_data: dict):
+    """Cache a fresh AI extraction (caller commits). First writer wins on a race."""
+    store_extractions(db, {file_hash: extracted_data})
+    remember_extractions({file_hash: extracted_data})
@@ -0,0 +1,130 @@
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+from db.session import pool_status
+
+# Each process keeps its own metrics: the API serves them on GET /metrics,
+# `python worker.py` on SCREENING_METRICS_PORT. Aggregate across processes
+# in Prometheus (sum by stage, etc.).
+
+# 0.5 ms … 2 min: covers hashing one file up to an LLM call stuck in retries
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# One observation per resume for unzip, hash, text_extract, preprocess, llm
+# and score; per claimed batch for db_lookup and score_batch; per flush for
+# commit and cache_write (the cache insert inside it)
+STAGE_SECONDS = Histogram(
+    "screening_stage_seconds",
+    "Time spent in each stage of the screening path",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+RESUMES = Counter(
+    "screening_resumes",
+    "Resumes whose result was committed, by outcome (done | failed)",
+    ["status"],
+)
+
+RUNS_STARTED = Counter(
+    "screening_runs_started",
+    "Runs queued, by run type",
+    ["run_type"],
+)
+
+RUNS_FINISHED = Counter(
+    "screening_runs_finished",
+    "Runs completed by a worker, or crashed while being queued (completed | crashed)",
+    ["status"],
+)
+
+EXTRACTION_CACHE_LOOKUPS = Counter(
+    "extraction_cache_lookups",
+    "Extraction cache lookups by outcome (lru_hit | db_hit | miss)",
+    ["result"],
+)
+
+RESUME_TEXT_TOKENS = Counter(
+    "resume_text_tokens",
+    "Tokens of parsed resume text before and after preprocessing (raw | sent); the difference is saved",
+    ["kind"],
+)
+
+RESUMES_TRUNCATED = Counter(
+    "resume_text_truncated",
+    "Resumes whose preprocessed text was cut to RESUME_TOKEN_BUDGET",
+)
+
+GROQ_REQUEST_SECONDS = Histogram(
+    "groq_request_seconds",
+    "Latency of one Groq chat completion request (excluding client-side waits)",
+    ["model"],
+    buckets=STAGE_BUCKETS,
+)
+
+GROQ_TOKENS = Counter(
+    "groq_tokens",
+    "Tokens used by Groq requests (prompt | completion)",
+    ["model", "kind"],
+)
+
+GROQ_RATE_LIMITED = Counter(
+    "groq_rate_limited",
+    "Groq requests rejected with 429",
+    ["model"],
+)
+
+BATCH_SCORE_FALLBACKS = Counter(
+    "screening_batch_score_fallbacks",
+    "Batches scored row by row because the vectorized scorer raised (screening | talent_pool)",
+    ["path"],
+)
+
+GROQ_BUDGET_WAIT_SECONDS = Histogram(
+    "groq_budget_wait_seconds",
+    "Time a Groq call waited for the client-side requests/tokens budget",
+    buckets=STAGE_BUCKETS,
+)
+
+
+@contextmanager
+def timed(stage: str):
+    """Observe the duration of the `with` block as `stage`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+class _PoolCollector:
+    """db_pool_* metrics from pool_status(), read at scrape time."""
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "db_pool_connections", "Connections per engine pool by state",
+            labels=["engine", "state"],
+        )
+        events = CounterMetricFamily(
+            "db_pool_events", "Pool events per engine (connects | checkouts | invalidations)",
+            labels=["engine", "event"],
+        )
+        for engine_name, snapshot in pool_status().items():
+            for state in ("checked_in", "checked_out", "overflow"):
+                if state in snapshot:
+                    connections.add_metric([engine_name, state], snapshot[state])
+            for event in ("connects", "checkouts", "invalidations"):
+                if event in snapshot:
+                    events.add_metric([engine_name, event], snapshot[event])
+        yield connections
+        yield events
+
+
+REGISTRY.register(_PoolCollector())
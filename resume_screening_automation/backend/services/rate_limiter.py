@@ -0,0 +1,208 @@
+import os
+import re
+import random
+import time
+from uuid import uuid4
+from groq import RateLimitError
+from sqlalchemy import text
+
+from db.session import engine
+from services.metrics import GROQ_REQUEST_SECONDS, GROQ_TOKENS, GROQ_RATE_LIMITED, GROQ_BUDGET_WAIT_SECONDS
+
+# Client-side budget for the whole Groq account, shared by every process that
+# calls Groq (kept in the groq_budget table). Defaults match the free tier for
+# llama-3.1-8b-instant — raise them for paid plans.
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))
+GROQ_TPM = int(os.getenv("GROQ_TPM", "6000"))
+
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "6"))
+# A 429 asking us to wait longer than this is a quota (e.g. the daily token
+# cap), not a burst — retrying inside the run would only stall it.
+GROQ_MAX_RETRY_WAIT = float(os.getenv("GROQ_MAX_RETRY_WAIT", "90"))
+
+_BACKOFF_BASE = 2.0
+_BACKOFF_CAP = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class RateLimiter:
+    """
+    Token bucket over two budgets: requests/min and tokens/min. Both refill
+    continuously. A 429 pauses every caller until the server's reset time.
+
+    The bucket is one groq_budget row, so the API's inline worker and every
+    `python worker.py` process draw on the same account-wide budget. Each
+    take is a single UPDATE ... RETURNING, timed by the database clock, so
+    it is atomic across processes and hosts without any lock held between
+    calls.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, name: str = "groq"):
+        self.rpm = max(1, requests_per_minute)
+        self.tpm = max(1, tokens_per_minute)
+        self.name = name
+        self._row_ready = False
+
+    @staticmethod
+    def _now_sql(dialect: str) -> str:
+        """Database clock as epoch seconds — one value for the whole statement."""
+        if dialect == "postgresql":
+            return "EXTRACT(EPOCH FROM now())"
+        return "((julianday('now') - 2440587.5) * 86400.0)"
+
+    def _ensure_row(self, conn, now: str):
+        if self._row_ready:
+            return
+        conn.execute(text(f"""
+            INSERT INTO groq_budget (name, requests, tokens, updated_at, paused_until)
+            VALUES (:name, :rpm, :tpm, {now}, 0)
+            ON CONFLICT (name) DO NOTHING
+        """), {"name": self.name, "rpm": self.rpm, "tpm": self.tpm})
+
+    def _take(self, tokens: int, grant_id: str):
+        """Refill the bucket and take one request + `tokens` if they fit. Returns the row."""
+        try:
+            row = self._update(tokens, grant_id)
+        except Exception:
+            # The row may be gone, or its insert never committed — insert it again next time
+            self._row_ready = False
+            raise
+        # Other threads may skip the INSERT only once the row is committed:
+        # before that, their UPDATE can run ahead of our commit and find no row.
+        self._row_ready = True
+        return row
+
+    def _update(self, tokens: int, grant_id: str):
+        with engine.begin() as conn:
+            now = self._now_sql(conn.dialect.name)
+            self._ensure_row(conn, now)
+            requests = f"requests + ({now} - updated_at) * :rpm / 60.0"
+            refilled_requests = f"(CASE WHEN {requests} < :rpm THEN {requests} ELSE :rpm END)"
+            budget = f"tokens + ({now} - updated_at) * :tpm / 60.0"
+            refilled_tokens = f"(CASE WHEN {budget} < :tpm THEN {budget} ELSE :tpm END)"
+            fits = f"(paused_until <= {now} AND {refilled_requests} >= 1 AND {refilled_tokens} >= :tokens)"
+            return conn.execute(text(f"""
+                UPDATE groq_budget SET
+                    requests   = CASE WHEN {fits} THEN {refilled_requests} - 1 ELSE {refilled_requests} END,
+                    tokens     = CASE WHEN {fits} THEN {refilled_tokens} - :tokens ELSE {refilled_tokens} END,
+                    grant_id   = CASE WHEN {fits} THEN :grant_id ELSE grant_id END,
+                    updated_at = {now}
+                WHERE name = :name
+                RETURNING requests, tokens, updated_at, paused_until, grant_id
+            """), {"name": self.name, "rpm": self.rpm, "tpm": self.tpm,
+                   "tokens": tokens, "grant_id": grant_id}).one()
+
+    def acquire(self, tokens: int):
+        """Block until one request and `tokens` tokens fit in the budget."""
+        tokens = min(tokens, self.tpm)
+        grant_id = uuid4().hex
+        while True:
+            row = self._take(tokens, grant_id)
+            if row.grant_id == grant_id:
+                return
+            wait = max(
+                row.paused_until - row.updated_at,
+                (1 - row.requests) * 60 / self.rpm,
+                (tokens - row.tokens) * 60 / self.tpm,
+            )
+            # Jitter spreads out processes that were all waiting on the same refill
+            time.sleep(max(wait, 0.01) + random.uniform(0, 0.05))
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token budget once the real usage is known (may go into debt)."""
+        with engine.begin() as conn:
+            conn.execute(
+                text("UPDATE groq_budget SET tokens = tokens - :delta WHERE name = :name"),
+                {"name": self.name, "delta": actual - estimated},
+            )
+
+    def pause(self, seconds: float):
+        """Hold every caller, in every process, for `seconds` — used when the server returns 429."""
+        with engine.begin() as conn:
+            until = f"{self._now_sql(conn.dialect.name)} + :seconds"
+            conn.execute(text(f"""
+                UPDATE groq_budget
+                SET paused_until = CASE WHEN paused_until < {until} THEN {until} ELSE paused_until END
+                WHERE name = :name
+            """), {"name": self.name, "seconds": seconds})
+
+
+groq_limiter = RateLimiter(GROQ_RPM, GROQ_TPM)
+
+
+def estimate_tokens(*texts: str, completion_tokens: int = 0) -> int:
+    """Rough prompt size (~4 chars per token) plus the expected completion."""
+    return sum(len(t) for t in texts) // 4 + completion_tokens
+
+
+def _parse_duration(value: str):
+    """Parse Groq reset headers: '12', '7.66s', '2m59.56s', '450ms'."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(n) * scale[unit] for n, unit in parts)
+
+
+def _retry_after(error: RateLimitError):
+    """Seconds the server asked us to wait, or None if it didn't say."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    for header in ("retry-after", "x-ratelimit-reset-tokens", "x-ratelimit-reset-requests"):
+        wait = _parse_duration(headers.get(header))
+        if wait is not None:
+            return wait
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+
+
+def call_with_rate_limit(create, estimated_tokens: int, **kwargs):
+    """
+    Call `create(**kwargs)` (a Groq chat completion) inside the shared budget.
+    429s are retried after the server's retry-after (plus jitter) or a jittered
+    exponential backoff. RateLimitError is only raised once retries run out or
+    the server asks for a wait longer than GROQ_MAX_RETRY_WAIT.
+    """
+    model = kwargs.get("model", "")
+    for attempt in range(GROQ_MAX_RETRIES + 1):
+        started = time.perf_counter()
+        groq_limiter.acquire(estimated_tokens)
+        GROQ_BUDGET_WAIT_SECONDS.observe(time.perf_counter() - started)
+        started = time.perf_counter()
+        try:
+            response = create(**kwargs)
+        except RateLimitError as e:
+            GROQ_RATE_LIMITED.labels(model).inc()
+            server_wait = _retry_after(e)
+            if server_wait is not None:
+                wait = server_wait + random.uniform(0, 1)
+            else:
+                wait = _backoff(attempt)
+            if attempt == GROQ_MAX_RETRIES or wait > GROQ_MAX_RETRY_WAIT:
+                raise
+            print(f"[groq] 429 — retrying in {wait:.1f}s (attempt {attempt + 1}/{GROQ_MAX_RETRIES})")
+            groq_limiter.pause(wait)
+            continue
+        finally:
+            GROQ_REQUEST_SECONDS.labels(model).observe(time.perf_counter() - started)
+
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "total_tokens", None) is not None:
+            groq_limiter.settle(estimated_tokens, usage.total_tokens)
+            GROQ_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", None) or 0)
+            GROQ_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", None) or 0)
+        return response
@@ -1,20 +1,41 @@
 import os
 import json
+import hashlib
 from groq import Groq
 from prompts.resume_extraction_prompt import RESUME_EXTRACTION_PROMPT
+from services.rate_limiter import call_with_rate_limit, estimate_tokens
+from services.metrics import timed
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Retries are handled by the shared rate limiter, not the SDK
+client = Groq(api_key=os.getenv("GROQ_API_KEY"), max_retries=0)
+
+EXTRACTION_MODEL = "llama-3.1-8b-instant"
+
+# Identifies the prompt an extraction was produced with — part of the
+# extraction cache key (with the text preprocessing version, see
+# extraction_cache), so editing the prompt invalidates cached results.
+EXTRACTION_PROMPT_HASH = hashlib.sha256(RESUME_EXTRACTION_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+# Typical size of the extracted JSON — reserved up front, settled after the call
+EXTRACTION_COMPLETION_TOKENS = 800
 
 
 def extract_resume_data(resume_text: str) -> dict:
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[
-            {"role": "system", "content": RESUME_EXTRACTION_PROMPT},
-            {"role": "user", "content": resume_text}
-        ],
-        temperature=0.1
-    )
+    # `llm` stage: what a resume waits, including budget waits and 429 retries
+    with timed("llm"):
+        response = call_with_rate_limit(
+            client.chat.completions.create,
+            estimate_tokens(
+                RESUME_EXTRACTION_PROMPT, resume_text,
+                completion_tokens=EXTRACTION_COMPLETION_TOKENS
+            ),
+            model=EXTRACTION_MODEL,
+            messages=[
+                {"role": "system", "content": RESUME_EXTRACTION_PROMPT},
+                {"role": "user", "content": resume_text}
+            ],
+            temperature=0.1
+        )
 
     content = response.choices[0].message.content.strip()
 
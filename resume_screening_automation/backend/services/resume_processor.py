@@ -1,37 +1,191 @@
-import pdfplumber
-from docx import Document
 import os
-import logging
+import re
+import threading
+from collections import Counter
+from services.text_extractor import extract_text
 from services.resume_ai_extractor import extract_resume_data
+from services.metrics import RESUME_TEXT_TOKENS, RESUMES_TRUNCATED, timed
 
-logging.getLogger("pdfminer").setLevel(logging.ERROR)
+try:
+    import tiktoken
+except ImportError:  # token counts fall back to the ~4 chars/token estimate
+    tiktoken = None
 
-def extract_text_from_pdf(path: str) -> str:
-    text = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text.append(page_text)
-    return "\n".join(text)
+# Resume text sent to the LLM is cut to this many tokens after cleanup
+# (0 = no cap). The prompt and the reserved completion come on top.
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
 
+# tiktoken encoding used to count tokens locally. Llama 3's tokenizer is
+# built on cl100k_base's merges, so counts land close to Groq's. tiktoken
+# downloads the encoding once — on offline hosts point TIKTOKEN_CACHE_DIR
+# at a copy.
+RESUME_TOKENIZER = os.getenv("RESUME_TOKENIZER", "cl100k_base")
 
-def extract_text_from_docx(path: str) -> str:
-    doc = Document(path)
-    return "\n".join([para.text for para in doc.paragraphs])
+# Bump when the cleanup rules below change: with the budget and tokenizer it
+# forms preprocessing_version(), part of the extraction cache key
+PREPROCESSING_RULES = 1
 
+# Lines at the top / bottom of each PDF page checked for running headers
+# and footers, and the share of pages a line must repeat on to be dropped
+FURNITURE_LINES = 3
+FURNITURE_MIN_SHARE = 0.5
 
-def process_single_resume(resume_path: str) -> dict:
-    if resume_path.lower().endswith(".pdf"):
-        resume_text = extract_text_from_pdf(resume_path)
-    elif resume_path.lower().endswith(".docx"):
-        resume_text = extract_text_from_docx(resume_path)
+# Repeats of lines at least this long are dropped wherever they appear;
+# shorter ones (titles, dates, "Responsibilities:") only when back to back
+DEDUP_MIN_CHARS = 30
+
+_SPACES = re.compile(r"[^\S\n\f]+")
+_CONTROL = re.compile(r"[\x00-\x08\x0b\x0e-\x1f\x7f\xad\u200b-\u200d\ufeff]")
+_PAGE_NUMBER = re.compile(r"(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?|[-–—]\s*\d{1,3}\s*[-–—]", re.I)
+_PAGE_REF = re.compile(r"\bpage\s*\d", re.I)
+_DIGITS = re.compile(r"\d+")
+
+_encoding_lock = threading.Lock()
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """The tiktoken encoding, loaded once; None when it is unavailable."""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    with _encoding_lock:
+        if not _encoding_loaded:
+            if tiktoken is not None:
+                try:
+                    _encoding = tiktoken.get_encoding(RESUME_TOKENIZER)
+                except Exception as e:
+                    print(f"[preprocess] WARNING: tokenizer {RESUME_TOKENIZER} unavailable, "
+                          f"estimating ~4 chars/token: {e}")
+            _encoding_loaded = True
+    return _encoding
+
+
+def preprocessing_version() -> str:
+    """
+    Identifies how resume text is prepared for the LLM (rules, tokenizer,
+    budget), as configured. A process that falls back to the chars/token
+    estimate keeps the same version: only the tail of resumes over the
+    budget is cut differently, and keying on it would split the cache
+    between processes that could and could not load the encoding.
+    """
+    return f"rules{PREPROCESSING_RULES}:{RESUME_TOKENIZER}:{RESUME_TOKEN_BUDGET}"
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode_ordinary(text))
+
+
+def _truncate(text: str, budget: int) -> str:
+    """The longest run of whole lines from the start that fits in `budget` tokens."""
+    encoding = _get_encoding()
+    if encoding is None:
+        head = text[:budget * 4]
     else:
-        raise Exception("Unsupported format")
+        head = encoding.decode(encoding.encode_ordinary(text)[:budget])
+    if len(head) < len(text) and "\n" in head:
+        head = head[:head.rindex("\n")]
+    return head.rstrip()
+
+
+def _furniture_key(line: str) -> str:
+    # "Jane Doe · Page 2" and "Jane Doe · Page 3" are the same footer; other
+    # numbers must match exactly ("2019 – 2021" vs "2016 – 2018" are content)
+    key = line.casefold()
+    return _DIGITS.sub("#", key) if _PAGE_REF.search(key) else key
+
+
+def _strip_furniture(pages: list) -> list:
+    """
+    Drop running headers/footers — lines repeated in the first or last
+    FURNITURE_LINES lines of most pages — and bare page numbers there.
+    """
+    def edges(lines):
+        body = [i for i, line in enumerate(lines) if line]
+        return set(body[:FURNITURE_LINES] + body[-FURNITURE_LINES:])
+
+    zones = [edges(lines) for lines in pages]
+    repeated = set()
+    if len(pages) > 1:
+        seen = Counter()
+        for lines, zone in zip(pages, zones):
+            seen.update({_furniture_key(lines[i]) for i in zone})
+        needed = max(2, len(pages) * FURNITURE_MIN_SHARE)
+        repeated = {key for key, pages_with in seen.items() if pages_with >= needed}
+
+    return [
+        [
+            line for i, line in enumerate(lines)
+            if i not in zone or not (_furniture_key(line) in repeated or _PAGE_NUMBER.fullmatch(line))
+        ]
+        for lines, zone in zip(pages, zones)
+    ]
+
+
+def preprocess_text(text: str) -> tuple:
+    """
+    (text for the LLM, raw tokens, sent tokens). Strips repeated page
+    furniture and control characters, collapses whitespace, drops repeated
+    lines and cuts the result to RESUME_TOKEN_BUDGET on a line boundary.
+    PDF pages arrive separated by form feeds (see text_extractor).
+    """
+    raw_tokens = count_tokens(text)
+
+    text = _CONTROL.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    pages = [
+        [_SPACES.sub(" ", line).strip() for line in page.split("\n")]
+        for page in text.split("\f")
+    ]
+    pages = _strip_furniture(pages)
+
+    kept, seen = [], set()
+    for line in (line for lines in pages for line in lines):
+        key = line.casefold()
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if (kept and kept[-1].casefold() == key) or (len(line) >= DEDUP_MIN_CHARS and key in seen):
+            continue
+        seen.add(key)
+        kept.append(line)
+    text = "\n".join(kept).strip()
+
+    if RESUME_TOKEN_BUDGET > 0 and count_tokens(text) > RESUME_TOKEN_BUDGET:
+        text = _truncate(text, RESUME_TOKEN_BUDGET)
+        RESUMES_TRUNCATED.inc()
+
+    sent_tokens = count_tokens(text)
+    RESUME_TEXT_TOKENS.labels("raw").inc(raw_tokens)
+    RESUME_TEXT_TOKENS.labels("sent").inc(sent_tokens)
+    return text, raw_tokens, sent_tokens
+
+
+def process_single_resume(resume_path: str, content: bytes = None, parsed=None) -> dict:
+    """
+    Extract text + AI data for one resume. When `content` is given (a member
+    read straight out of the uploaded ZIP) it is parsed in memory and
+    `resume_path` is only used for its extension and name.
+
+    `parsed` is a Future for the text, already submitted to the
+    text-extraction process pool. When it is given, the text is taken from
+    it instead of being parsed on this thread.
+    """
+    if parsed is not None:
+        resume_text, text_extractor, extract_ms = parsed.result()
+    else:
+        resume_text, text_extractor, extract_ms = extract_text(resume_path, content)
 
     if not resume_text.strip():
         raise Exception("Empty resume content")
 
+    with timed("preprocess"):
+        resume_text, raw_tokens, sent_tokens = preprocess_text(resume_text)
+
     # 🔥 AI extraction step
     extracted_data = extract_resume_data(resume_text)
     print("AI extracted:", extracted_data)
@@ -39,5 +193,9 @@ def process_single_resume(resume_path: str) -> dict:
 
     return {
         "resume_file": os.path.basename(resume_path),
-        "extracted_data": extracted_data
+        "extracted_data": extracted_data,
+        "text_extractor": text_extractor,
+        "extract_ms": extract_ms,
+        "text_tokens": sent_tokens,
+        "tokens_saved": raw_tokens - sent_tokens
     }
@@ -0,0 +1,189 @@
+import os
+import json
+import asyncio
+import threading
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from db.session import DATABASE_URL, async_url
+
+# Postgres NOTIFY channel carrying run events between workers and API processes
+CHANNEL = "run_events"
+
+# NOTIFY payloads are capped at 8000 bytes; larger events are split by items
+MAX_PAYLOAD = 7500
+
+# Events buffered per stream; a slow client drops events rather than memory
+# (counters are absolute, so the next event catches it up)
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# LISTEN needs a session-level connection. Behind pgbouncer in transaction
+# mode (DB_PGBOUNCER=1) point this at the direct, unpooled endpoint.
+RUN_EVENTS_DATABASE_URL = os.getenv("RUN_EVENTS_DATABASE_URL") or DATABASE_URL
+
+# Seconds before a dropped LISTEN connection is retried, and between checks
+# that an idle one is still alive
+RECONNECT_SECONDS = 5
+HEALTH_CHECK_SECONDS = 60
+
+USE_NOTIFY = make_url(DATABASE_URL).get_backend_name() == "postgresql"
+
+
+# ── Publishing (any process, inside the caller's transaction) ──────────────────
+
+def publish(db, run_id: int, **fields):
+    """
+    Queue a run event on `db`. It is sent only if the transaction commits:
+    as NOTIFY on Postgres (delivered to every API process at commit), else to
+    this process's broker after the commit. Fields are partial run state —
+    absolute counters, status — plus optional per-resume `items`.
+    """
+    db.info.setdefault("run_events", []).append(dict(fields, run_id=run_id))
+
+
+def result_item(file_name: str, status: str, row: dict = None, error: str = None) -> dict:
+    """One resume's outcome as carried in an event's `items`."""
+    row = row or {}
+    return {
+        "file_name": file_name[-200:],
+        "status":    status,
+        "ai_status": row.get("ai_status"),
+        "score":     row.get("score"),
+        "decision":  row.get("decision"),
+        "error":     error[:200] if error else None,
+    }
+
+
+def _payloads(run_event: dict) -> list:
+    payload = json.dumps(run_event, default=str)
+    if len(payload.encode()) <= MAX_PAYLOAD:
+        return [payload]
+
+    base = {k: v for k, v in run_event.items() if k != "items"}
+    payloads, items = [], []
+    for item in run_event["items"]:
+        chunk = json.dumps(dict(base, items=items + [item]), default=str)
+        if items and len(chunk.encode()) > MAX_PAYLOAD:
+            payloads.append(json.dumps(dict(base, items=items), default=str))
+            items = [item]
+        else:
+            items.append(item)
+    payloads.append(json.dumps(dict(base, items=items), default=str))
+    return payloads
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_staged(db):
+    if not USE_NOTIFY or not db.info.get("run_events"):
+        return
+    for run_event in db.info.pop("run_events"):
+        for payload in _payloads(run_event):
+            db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_staged(db):
+    for run_event in db.info.pop("run_events", ()):
+        broker.publish_threadsafe(run_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_staged(db):
+    db.info.pop("run_events", None)
+
+
+# ── Subscribing (API process) ──────────────────────────────────────────────────
+
+class RunEventBroker:
+    """In-process fan-out of run events to the streams subscribed to each run."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def subscribe(self, run_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(run_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, run_id: int, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(run_id)
+            if queues:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[run_id]
+
+    def dispatch(self, run_event: dict):
+        """Hand an event to its run's subscribers (event-loop thread only)."""
+        with self._lock:
+            queues = list(self._subscribers.get(run_event.get("run_id"), ()))
+        for queue in queues:
+            try:
+                queue.put_nowait(run_event)
+            except asyncio.QueueFull:
+                pass
+
+    def publish_threadsafe(self, run_event: dict):
+        """Dispatch from any thread (e.g. the inline worker); no-op outside the API."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.dispatch, run_event)
+
+
+broker = RunEventBroker()
+
+
+def _on_notify(connection, pid, channel, payload):
+    try:
+        broker.dispatch(json.loads(payload))
+    except Exception as e:
+        print(f"[EVENTS] ⚠️ Bad run event payload: {e}")
+
+
+async def _listen_forever():
+    url, connect_args = async_url(RUN_EVENTS_DATABASE_URL)
+    query = {k: v for k, v in url.query.items() if k != "prepared_statement_cache_size"}
+    dsn = url.set(drivername="postgresql", query=query).render_as_string(hide_password=False)
+    while True:
+        try:
+            connection = await asyncpg.connect(dsn, ssl=connect_args.get("ssl"))
+        except Exception as e:
+            print(f"[EVENTS] ⚠️ LISTEN connection failed, retrying in {RECONNECT_SECONDS}s: {e}")
+            await asyncio.sleep(RECONNECT_SECONDS)
+            continue
+
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(CHANNEL, _on_notify)
+            print(f"[EVENTS] Listening on '{CHANNEL}'")
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), timeout=HEALTH_CHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    # A silently dropped connection never reports termination
+                    await connection.execute("SELECT 1", timeout=10)
+        except Exception as e:
+            print(f"[EVENTS] ⚠️ LISTEN connection check failed: {e}")
+        finally:
+            connection.terminate()
+        print(f"[EVENTS] ⚠️ LISTEN connection lost, reconnecting in {RECONNECT_SECONDS}s")
+        await asyncio.sleep(RECONNECT_SECONDS)
+
+
+def start_listener():
+    """
+    Bind the broker to the running loop and, on Postgres, start the LISTEN
+    task. Returns the task (cancel it on shutdown) or None.
+    """
+    broker.bind(asyncio.get_running_loop())
+    if not USE_NOTIFY:
+        return None
+    return asyncio.create_task(_listen_forever(), name="run-events-listener")
@@ -1,91 +1,117 @@
-# Canonical skill aliases — keys are variants, value is the canonical form.
-# Both job config and resume skills are resolved to canonical before matching.
-# Canonical degree groups — any degree in the same group matches any other.
-_DEGREE_GROUPS: list[set[str]] = [
-    {"btech", "be", "bachelor of technology", "bachelor of engineering",
-     "bachelors", "bachelor", "bachelor of science", "bs", "bsc",
-     "bachelor of computer science", "bca", "bachelor of computer applications",
-     "b tech", "b e", "b sc", "b s"},
-    {"mtech", "me", "master of technology", "master of engineering",
-     "masters", "master", "master of science", "ms", "msc",
-     "master of computer science", "mca", "master of computer applications",
-     "m tech", "m e", "m sc", "m s"},
-    {"mba", "master of business administration", "pgdm"},
-    {"phd", "ph d", "doctorate", "doctor of philosophy"},
-    {"diploma", "polytechnic"},
-    {"12th", "hsc", "higher secondary", "intermediate", "plus two", "+2"},
-    {"10th", "ssc", "secondary", "matriculation"},
-]
+import os
+import json
+import time
+import hashlib
+import threading
+from functools import lru_cache
+import numpy as np
+from scipy import sparse
+
+# Skill aliases (variant → canonical form) and degree groups (any degree in a
+# group matches any other) live in a data file, so they can grow without a
+# deploy. The file is re-read when it changes — checked at most every
+# SCORING_ALIASES_CHECK_SECONDS.
+SCORING_ALIASES_FILE = os.getenv(
+    "SCORING_ALIASES_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "scoring_aliases.json"),
+)
+SCORING_ALIASES_CHECK_SECONDS = float(os.getenv("SCORING_ALIASES_CHECK_SECONDS", "5"))
+
+
+class AliasTables:
+    """
+    One loaded version of the alias data plus its lookup indexes:
+    canonical skill → variants, and degree → group id. Immutable once built;
+    a reload swaps in a new instance.
+    """
+
+    def __init__(self, skill_aliases: dict, degree_groups: list, version: str, mtime_ns: int = None):
+        self.skill_aliases = dict(skill_aliases)
+        self.version = version
+        self.mtime_ns = mtime_ns
+
+        variants = {}
+        for variant, canonical in self.skill_aliases.items():
+            variants.setdefault(canonical, set()).add(variant)
+        self.variants = {c: frozenset(v) for c, v in variants.items()}
+
+        # First group wins if a degree is listed twice
+        self.degree_ids = {}
+        for i, group in enumerate(degree_groups):
+            for degree in group:
+                self.degree_ids.setdefault(degree, f"__group_{i}__")
+
+        chained = {v for v, c in self.skill_aliases.items() if c in self.skill_aliases and self.skill_aliases[c] != c}
+        if chained:
+            print(f"[scoring] WARNING: aliases point at other aliases (not followed): {sorted(chained)[:10]}")
+
+    def resolve_skill(self, text: str) -> str:
+        n = normalize(text)
+        return self.skill_aliases.get(n, n)
+
+    def degree_id(self, degree_norm: str) -> str:
+        return self.degree_ids.get(degree_norm, degree_norm)
+
+    def skill_targets(self, skill: str) -> frozenset:
+        """
+        Resolved resume skills that match a resolved job skill. Equivalent to
+        `skill in expand_skills(resume_skills)`, without expanding every
+        resume: a job skill matches its own canonical form, or the canonical
+        it is an alias of.
+        """
+        if skill in self.skill_aliases:
+            return frozenset({skill, self.skill_aliases[skill]})
+        return frozenset({skill})
+
+
+def _read_tables(path: str) -> AliasTables:
+    with open(path, "rb") as f:
+        raw = f.read()
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+    data = json.loads(raw)
+    return AliasTables(
+        data.get("skill_aliases", {}),
+        data.get("degree_groups", []),
+        version=hashlib.sha256(raw).hexdigest()[:12],
+        mtime_ns=mtime_ns,
+    )
+
+
+_tables = _read_tables(SCORING_ALIASES_FILE)
+_next_check = time.monotonic() + SCORING_ALIASES_CHECK_SECONDS
+_failed_mtime_ns = None
+_reload_lock = threading.Lock()
+
+
+def current_tables() -> AliasTables:
+    """The alias tables in effect, reloading the data file if it changed."""
+    global _tables, _next_check, _failed_mtime_ns
+    if time.monotonic() < _next_check:
+        return _tables
+    with _reload_lock:
+        if time.monotonic() < _next_check:
+            return _tables
+        _next_check = time.monotonic() + SCORING_ALIASES_CHECK_SECONDS
+        try:
+            mtime_ns = os.stat(SCORING_ALIASES_FILE).st_mtime_ns
+        except OSError as e:
+            print(f"[scoring] WARNING: alias file unavailable, keeping loaded tables: {e}")
+            return _tables
+        if mtime_ns in (_tables.mtime_ns, _failed_mtime_ns):
+            return _tables
+        try:
+            _tables = _read_tables(SCORING_ALIASES_FILE)
+            print(f"[scoring] Reloaded alias tables (version {_tables.version})")
+        except Exception as e:
+            # Keep scoring with the last good tables until the file changes again
+            _failed_mtime_ns = mtime_ns
+            print(f"[scoring] WARNING: could not reload {SCORING_ALIASES_FILE}: {e}")
+    return _tables
 
 
 def _degree_canonical(degree_norm: str) -> str:
     """Return a canonical group ID for a degree, or the degree itself if unknown."""
-    for i, group in enumerate(_DEGREE_GROUPS):
-        if degree_norm in group:
-            return f"__group_{i}__"
-    return degree_norm
-
-
-_SKILL_ALIASES: dict[str, str] = {
-    "js":                   "javascript",
-    "node":                 "nodejs",
-    "node js":              "nodejs",
-    "node.js":              "nodejs",
-    "react js":             "reactjs",
-    "react.js":             "reactjs",
-    "vue js":               "vuejs",
-    "vue.js":               "vuejs",
-    "ts":                   "typescript",
-    "py":                   "python",
-    "ml":                   "machine learning",
-    "dl":                   "deep learning",
-    "ai":                   "artificial intelligence",
-    "nlp":                  "natural language processing",
-    "cv":                   "computer vision",
-    "c sharp":              "c#",
-    "csharp":               "c#",
-    "c plus plus":          "c++",
-    "golang":               "go",
-    "k8s":                  "kubernetes",
-    "postgres":             "postgresql",
-    "mongo":                "mongodb",
-    "aws":                  "amazon web services",
-    "gcp":                  "google cloud platform",
-    "azure":                "microsoft azure",
-    "rest":                 "rest api",
-    "restful":              "rest api",
-    "rest apis":            "rest api",
-    "restful apis":         "rest api",
-    "oop":                  "object oriented programming",
-    "object oriented":      "object oriented programming",
-    "data structures":      "data structures and algorithms",
-    "dsa":                  "data structures and algorithms",
-    "os":                   "operating systems",
-    "dbms":                 "database management systems",
-    "sql server":           "microsoft sql server",
-    "mssql":                "microsoft sql server",
-    "scss":                 "css",
-    "sass":                 "css",
-    "html5":                "html",
-    "css3":                 "css",
-    "es6":                  "javascript",
-    "es2015":               "javascript",
-    "next":                 "nextjs",
-    "next js":              "nextjs",
-    "next.js":              "nextjs",
-    "nuxt":                 "nuxtjs",
-    "nuxt.js":              "nuxtjs",
-    "express":              "expressjs",
-    "express.js":           "expressjs",
-    "flask":                "flask",
-    "django rest framework": "django",
-    "drf":                  "django",
-    "tf":                   "tensorflow",
-    "sklearn":              "scikit-learn",
-    "scikit learn":         "scikit-learn",
-    "pandas":               "pandas",
-    "numpy":                "numpy",
-}
+    return current_tables().degree_id(degree_norm)
 
 
 def normalize(text: str) -> str:
@@ -105,8 +131,7 @@ def normalize(text: str) -> str:
 
 def resolve_skill(text: str) -> str:
     """Normalize then apply alias resolution so 'JS' matches 'JavaScript'."""
-    n = normalize(text)
-    return _SKILL_ALIASES.get(n, n)
+    return current_tables().resolve_skill(text)
 
 
 def expand_skills(skill_set: set[str]) -> set[str]:
@@ -115,155 +140,434 @@ def expand_skills(skill_set: set[str]) -> set[str]:
     resolve to any skill already in the set, so matching works both ways.
     E.g. if 'javascript' is in the set, 'js' / 'es6' also become valid.
     """
-    resolved = {resolve_skill(s) for s in skill_set}
-    # Build reverse map: canonical → all its variants
-    for variant, canonical in _SKILL_ALIASES.items():
-        if canonical in resolved:
-            resolved.add(variant)
+    tables = current_tables()
+    resolved = {tables.resolve_skill(s) for s in skill_set}
+    for canonical in list(resolved):
+        resolved |= tables.variants.get(canonical, frozenset())
     return resolved
 
 
+def _is_number(value) -> bool:
+    """A value float64 holds exactly, so array comparisons match Python's."""
+    return isinstance(value, float) or (isinstance(value, int) and abs(value) < 2 ** 53)
+
+
 _EXPECTED_WEIGHT_KEYS = {
     "required_skills", "nice_to_have_skills", "projects", "education", "eligibility"
 }
 
 
+class CompiledJob:
+    """
+    A job_config preprocessed for scoring: resolved skill sets, normalized
+    project domains, canonical degree ids and validated weights. Build it
+    once (see compile_job) and call score() per resume — the per-resume cost
+    then depends only on the resume. Scoring uses the alias tables it was
+    compiled with, so one run is scored consistently across a reload.
+    """
+
+    def __init__(self, job_config: dict, tables: AliasTables = None):
+        self.tables = tables = tables or current_tables()
+        weights = job_config.get("scoring_weights", {})
+
+        # Warn about misconfigured weights (logged, not raised — screening must not crash)
+        missing_keys = _EXPECTED_WEIGHT_KEYS - set(weights.keys())
+        if missing_keys:
+            print(f"[scoring] WARNING: scoring_weights missing keys {missing_keys} — they default to 0")
+        weight_total = sum(weights.get(k, 0) for k in _EXPECTED_WEIGHT_KEYS)
+        if weight_total != 100:
+            print(f"[scoring] WARNING: scoring_weights sum to {weight_total}, not 100")
+
+        self.required_weight = weights.get("required_skills", 0)
+        self.nice_weight     = weights.get("nice_to_have_skills", 0)
+        self.project_weight  = weights.get("projects", 0)
+        self.education_weight = weights.get("education", 0)
+        self.elig_weight     = weights.get("eligibility", 0)
+
+        self.required_skills = frozenset(
+            tables.resolve_skill(s) for s in job_config.get("required_skills", [])
+        )
+        self.nice_skills = frozenset(
+            tables.resolve_skill(s) for s in job_config.get("nice_to_have_skills", [])
+        )
+        self.required_targets = tuple(tables.skill_targets(s) for s in self.required_skills)
+        self.nice_targets     = tuple(tables.skill_targets(s) for s in self.nice_skills)
+
+        self.job_domains = frozenset(
+            normalize(d)
+            for d in job_config
+            .get("project_expectations", {})
+            .get("domains", [])
+        )
+
+        self.allowed_degrees = frozenset(
+            tables.degree_id(normalize(d))
+            for d in job_config.get("education_requirements", [])
+        )
+
+        self.candidate_type = job_config.get("candidate_type", "any")
+        self.required_exp   = job_config.get("required_experience_years")
+        self.max_exp        = job_config.get("max_experience_years")
+        self.checks_min_exp = self.candidate_type == "experienced" or self.required_exp is not None
+        self.min_exp        = self.required_exp if self.required_exp is not None else 1
+
+        # Odd config values (huge ints as weights, non-numeric experience
+        # bounds) are scored row by row from extracted_data, not in arrays
+        weights = (self.required_weight, self.nice_weight, self.project_weight,
+                   self.education_weight, self.elig_weight)
+        self.vectorizable = all(_is_number(w) for w in weights) and (
+            not self.checks_min_exp
+            or (_is_number(self.min_exp) and (self.max_exp is None or _is_number(self.max_exp)))
+        )
+
+    def disqualify_reason(self, raw_exp) -> str:
+        """Why a resume with this experience_years is disqualified, or None."""
+        # None means AI couldn't determine experience — treat as 0 for comparisons
+        # but note the ambiguity in the reason string
+        resume_exp = raw_exp if raw_exp is not None else 0
+
+        if self.candidate_type == "student" and resume_exp > 0:
+            return f"Not a student (resume shows {resume_exp} yrs experience)"
+
+        if self.checks_min_exp:
+            exp_label = "unknown" if raw_exp is None else f"{resume_exp} yrs"
+            if resume_exp < self.min_exp:
+                return f"Insufficient experience: {exp_label} (required {self.min_exp} yrs)"
+            if self.max_exp is not None and resume_exp > self.max_exp:
+                return f"Overqualified: {exp_label} experience (max {self.max_exp} yrs)"
+
+        return None
+
+    def reason(self, required_matched: int, nice_matched: int, project_score,
+               education_met: bool, disqualify_reason: str = None) -> str:
+        """The reason string for one resume's score components."""
+        reasons = []
+        if self.required_skills:
+            reasons.append(f"Required skills matched {required_matched}/{len(self.required_skills)}")
+        if self.nice_skills:
+            reasons.append(f"Nice-to-have skills matched {nice_matched}/{len(self.nice_skills)}")
+        reasons.append(f"Project score {project_score}")
+        if education_met:
+            reasons.append("Education requirement met")
+        if disqualify_reason is not None:
+            reasons.insert(0, disqualify_reason)
+        else:
+            reasons.append("Eligibility requirement met")
+        return "; ".join(reasons)
+
+    def score(self, extracted_data: dict) -> tuple[int, str, bool]:
+        """
+        Returns (score, reason_string, disqualified).
+        disqualified=True means the candidate must be rejected regardless of score.
+        """
+        score = 0
+
+        # -------------------------------------------------
+        # 1️⃣ REQUIRED SKILLS
+        # -------------------------------------------------
+        resume_skills = {
+            self.tables.resolve_skill(s) for s in extracted_data.get("skills") or []
+        }
+
+        required_matched = sum(1 for t in self.required_targets if not t.isdisjoint(resume_skills))
+        if self.required_skills:
+            score += int(
+                (required_matched / len(self.required_skills)) * self.required_weight
+            )
+
+        # -------------------------------------------------
+        # 2️⃣ NICE TO HAVE SKILLS
+        # -------------------------------------------------
+        nice_matched = sum(1 for t in self.nice_targets if not t.isdisjoint(resume_skills))
+        if self.nice_skills:
+            score += int(
+                (nice_matched / len(self.nice_skills)) * self.nice_weight
+            )
+
+        # -------------------------------------------------
+        # 3️⃣ PROJECTS (CAPPED)
+        # -------------------------------------------------
+        project_score = 0
+
+        for project in extracted_data.get("projects") or []:
+            # normalize turns "web/backend" → "web backend"; split so each token
+            # is checked individually against job_domains
+            project_domain_tokens = normalize(project.get("domain", "")).split()
+            if any(token in self.job_domains for token in project_domain_tokens):
+                project_score += 10  # raw points per relevant project
+
+        # 🔒 CAP PROJECT SCORE TO WEIGHT
+        project_score = min(project_score, self.project_weight)
+        score += project_score
+
+        # -------------------------------------------------
+        # 4️⃣ EDUCATION
+        # -------------------------------------------------
+        resume_degrees = {
+            self.tables.degree_id(normalize(e.get("degree", "")))
+            for e in extracted_data.get("education") or []
+        }
+
+        education_met = not self.allowed_degrees.isdisjoint(resume_degrees)
+        if education_met:
+            score += self.education_weight
+
+        # -------------------------------------------------
+        # 5️⃣ ELIGIBILITY
+        # -------------------------------------------------
+        disqualify_reason = self.disqualify_reason(extracted_data.get("experience_years"))
+        disqualified = disqualify_reason is not None
+        if not disqualified:
+            score += self.elig_weight
+
+        # -------------------------------------------------
+        # FINALIZE
+        # -------------------------------------------------
+        final_score = min(int(score), 100)
+        reason = self.reason(required_matched, nice_matched, project_score, education_met, disqualify_reason)
+
+        return final_score, reason, disqualified
+
+
+@lru_cache(maxsize=64)
+def _compile_cached(config_key: str, tables: AliasTables) -> CompiledJob:
+    return CompiledJob(json.loads(config_key), tables)
+
+
+def compile_job(job_config: dict, tables: AliasTables = None) -> CompiledJob:
+    """
+    CompiledJob for `job_config`, shared across batches and runs of the same
+    config. Keyed by the config's content and the alias tables version, so
+    an edited job or a reloaded alias file compiles afresh.
+    """
+    return _compile_cached(json.dumps(job_config, sort_keys=True), tables or current_tables())
+
+
 def score_resume(job_config: dict, extracted_data: dict) -> tuple[int, str, bool]:
     """
     Returns (score, reason_string, disqualified).
     disqualified=True means the candidate must be rejected regardless of score.
+    One-off scoring — when scoring many resumes, compile_job() once instead.
     """
-    score = 0
-    reasons = []
-
-    weights = job_config.get("scoring_weights", {})
-
-    # Warn about misconfigured weights (logged, not raised — screening must not crash)
-    missing_keys = _EXPECTED_WEIGHT_KEYS - set(weights.keys())
-    if missing_keys:
-        print(f"[scoring] WARNING: scoring_weights missing keys {missing_keys} — they default to 0")
-    weight_total = sum(weights.get(k, 0) for k in _EXPECTED_WEIGHT_KEYS)
-    if weight_total != 100:
-        print(f"[scoring] WARNING: scoring_weights sum to {weight_total}, not 100")
-
-    # -------------------------------------------------
-    # 1️⃣ REQUIRED SKILLS
-    # -------------------------------------------------
-    required_skills = {
-        resolve_skill(s) for s in job_config.get("required_skills", [])
-    }
-    resume_skills = expand_skills({
-        normalize(s) for s in extracted_data.get("skills") or []
-    })
-
-    if required_skills:
-        matched = len(required_skills & resume_skills)
-        skill_score = int(
-            (matched / len(required_skills)) * weights.get("required_skills", 0)
-        )
-        score += skill_score
-        reasons.append(
-            f"Required skills matched {matched}/{len(required_skills)}"
-        )
+    return CompiledJob(job_config).score(extracted_data)
+
+
+# -------------------------------------------------
+# BATCH SCORING
+# -------------------------------------------------
 
-    # -------------------------------------------------
-    # 2️⃣ NICE TO HAVE SKILLS
-    # -------------------------------------------------
-    nice_skills = {
-        resolve_skill(s) for s in job_config.get("nice_to_have_skills", [])
+def scoring_keys(extracted_data: dict, tables: AliasTables = None) -> dict:
+    """
+    The job-independent part of scoring one resume, as JSON-ready lists:
+    resolved skills, canonical degree ids and each project's domain tokens.
+    Valid for the alias tables version it was built with. Raises on data
+    CandidateMatrix cannot encode (scored with CompiledJob.score instead).
+    """
+    tables = tables or current_tables()
+    raw_exp = extracted_data.get("experience_years")
+    if raw_exp is not None and not _is_number(raw_exp):
+        raise TypeError("experience_years is not a number")
+    return {
+        "skills": sorted({tables.resolve_skill(s) for s in extracted_data.get("skills") or []}),
+        "degrees": sorted({
+            tables.degree_id(normalize(e.get("degree", "")))
+            for e in extracted_data.get("education") or []
+        }),
+        "projects": [
+            sorted(set(normalize(p.get("domain", "")).split()))
+            for p in extracted_data.get("projects") or []
+        ],
     }
 
-    if nice_skills:
-        matched = len(nice_skills & resume_skills)
-        nice_score = int(
-            (matched / len(nice_skills)) * weights.get("nice_to_have_skills", 0)
-        )
-        score += nice_score
-        reasons.append(
-            f"Nice-to-have skills matched {matched}/{len(nice_skills)}"
+
+class CandidateMatrix:
+    """
+    Resumes encoded once for scoring against any number of jobs: resolved
+    skills, canonical degrees and project domain tokens become integer ids
+    in one shared vocabulary, held as sparse 0/1 matrices (CSR).
+
+    `keys` optionally gives each row's scoring_keys(), built earlier with
+    the same alias tables (None where missing) — encoding then skips alias
+    resolution and normalization for those rows.
+
+    Rows whose data has an unexpected shape (non-numeric experience, a
+    project without a string domain, ...) are not encoded; they are scored
+    with CompiledJob.score, which behaves exactly as score_resume does.
+    """
+
+    def __init__(self, resumes: list, tables: AliasTables = None, keys: list = None):
+        self.tables = tables = tables or current_tables()
+        self.resumes = resumes
+        self.vocab = {}
+        self.irregular = []
+
+        n = len(resumes)
+        skill_rows, skill_cols = [], []
+        degree_rows, degree_cols = [], []
+        project_rows, project_cols, project_owner = [], [], []
+        self.experience = np.zeros(n, dtype=np.float64)
+
+        for i, data in enumerate(resumes):
+            try:
+                row_keys = keys[i] if keys is not None else None
+                if row_keys is None:
+                    row_keys = scoring_keys(data, tables)
+                skills = row_keys["skills"]
+                degrees = row_keys["degrees"]
+                projects = row_keys["projects"]
+                raw_exp = data.get("experience_years")
+            except Exception:
+                self.irregular.append(i)
+                continue
+
+            for skill in skills:
+                skill_rows.append(i)
+                skill_cols.append(self._id(skill))
+            for degree in degrees:
+                degree_rows.append(i)
+                degree_cols.append(self._id(degree))
+            for tokens in projects:
+                project = len(project_owner)
+                project_owner.append(i)
+                for token in tokens:
+                    project_rows.append(project)
+                    project_cols.append(self._id(token))
+            self.experience[i] = raw_exp if raw_exp is not None else 0
+
+        width = len(self.vocab)
+        self.skills = self._csr(skill_rows, skill_cols, (n, width))
+        self.degrees = self._csr(degree_rows, degree_cols, (n, width))
+        self.projects = self._csr(project_rows, project_cols, (len(project_owner), width))
+        self.project_owner = np.asarray(project_owner, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.resumes)
+
+    def _id(self, token: str) -> int:
+        return self.vocab.setdefault(token, len(self.vocab))
+
+    @staticmethod
+    def _csr(rows: list, cols: list, shape: tuple):
+        data = np.ones(len(rows), dtype=np.int32)
+        return sparse.csr_matrix((data, (rows, cols)), shape=shape)
+
+    def _indicator(self, tokens) -> np.ndarray:
+        """0/1 vector over the vocabulary; tokens no resume has are dropped."""
+        vector = np.zeros(len(self.vocab), dtype=np.int32)
+        ids = [self.vocab[t] for t in tokens if t in self.vocab]
+        vector[ids] = 1
+        return vector
+
+    def _matched(self, targets: tuple) -> np.ndarray:
+        """Per resume, how many of the job skills (each a set of targets) it has."""
+        if not targets:
+            return np.zeros(len(self), dtype=np.int64)
+        rows, cols = [], []
+        for j, target in enumerate(targets):
+            for token in target:
+                if token in self.vocab:
+                    rows.append(self.vocab[token])
+                    cols.append(j)
+        hits = self.skills @ self._csr(rows, cols, (len(self.vocab), len(targets)))
+        return np.asarray(hits.getnnz(axis=1), dtype=np.int64)
+
+    def score(self, job: CompiledJob) -> "BatchScores":
+        """Score every resume against `job` — same results as job.score() per row."""
+        if job.tables is not self.tables:
+            raise ValueError("CompiledJob and CandidateMatrix were built from different alias tables")
+        return BatchScores(self, job)
+
+
+class BatchScores:
+    """
+    Scores for a CandidateMatrix against one job: `scores` (int64) and
+    `disqualified` (bool) arrays, computed in a handful of array operations.
+    Reason strings are only formatted when asked for (reason(i) / results()).
+    """
+
+    def __init__(self, matrix: CandidateMatrix, job: CompiledJob):
+        self.matrix = matrix
+        self.job = job
+        n = len(matrix)
+
+        if not job.vectorizable:
+            self._exact = {i: job.score(data) for i, data in enumerate(matrix.resumes)}
+            self.scores = np.array([self._exact[i][0] for i in range(n)], dtype=np.int64)
+            self.disqualified = np.array([self._exact[i][2] for i in range(n)], dtype=bool)
+            return
+
+        score = np.zeros(n, dtype=np.float64)
+
+        # 1️⃣ / 2️⃣ SKILLS — int((matched / total) * weight), as in CompiledJob.score
+        self.required_matched = matrix._matched(job.required_targets)
+        if job.required_skills:
+            score += np.trunc((self.required_matched / len(job.required_skills)) * job.required_weight)
+        self.nice_matched = matrix._matched(job.nice_targets)
+        if job.nice_skills:
+            score += np.trunc((self.nice_matched / len(job.nice_skills)) * job.nice_weight)
+
+        # 3️⃣ PROJECTS — 10 per project with a matching domain token, capped
+        relevant = (matrix.projects @ matrix._indicator(job.job_domains)) > 0
+        self.relevant_projects = np.bincount(matrix.project_owner[relevant], minlength=n)
+        score += np.minimum(self.relevant_projects * 10, job.project_weight)
+
+        # 4️⃣ EDUCATION
+        self.education_met = (matrix.degrees @ matrix._indicator(job.allowed_degrees)) > 0
+        score += np.where(self.education_met, job.education_weight, 0)
+
+        # 5️⃣ ELIGIBILITY
+        exp = matrix.experience
+        disqualified = np.zeros(n, dtype=bool)
+        if job.candidate_type == "student":
+            disqualified |= exp > 0
+        if job.checks_min_exp:
+            disqualified |= exp < job.min_exp
+            if job.max_exp is not None:
+                disqualified |= exp > job.max_exp
+        score += np.where(disqualified, 0, job.elig_weight)
+
+        self.scores = np.minimum(np.trunc(score), 100).astype(np.int64)
+        self.disqualified = disqualified
+
+        self._exact = {i: job.score(matrix.resumes[i]) for i in matrix.irregular}
+        if self._exact:
+            rows = list(self._exact)
+            self.scores[rows] = [self._exact[i][0] for i in rows]
+            self.disqualified[rows] = [self._exact[i][2] for i in rows]
+
+    def __len__(self):
+        return len(self.scores)
+
+    def reason(self, i: int) -> str:
+        if i in self._exact:
+            return self._exact[i][1]
+        job = self.job
+        project_score = min(int(self.relevant_projects[i]) * 10, job.project_weight)
+        disqualify_reason = None
+        if self.disqualified[i]:
+            disqualify_reason = job.disqualify_reason(self.matrix.resumes[i].get("experience_years"))
+        return job.reason(
+            int(self.required_matched[i]),
+            int(self.nice_matched[i]),
+            project_score,
+            bool(self.education_met[i]),
+            disqualify_reason,
         )
 
-    # -------------------------------------------------
-    # 3️⃣ PROJECTS (CAPPED)
-    # -------------------------------------------------
-    project_score = 0
+    def result(self, i: int) -> tuple[int, str, bool]:
+        """(score, reason_string, disqualified) for row i, as score_resume returns it."""
+        return int(self.scores[i]), self.reason(i), bool(self.disqualified[i])
 
-    job_domains = {
-        normalize(d)
-        for d in job_config
-        .get("project_expectations", {})
-        .get("domains", [])
-    }
+    def results(self):
+        for i in range(len(self)):
+            yield self.result(i)
 
-    for project in extracted_data.get("projects") or []:
-        # normalize turns "web/backend" → "web backend"; split so each token
-        # is checked individually against job_domains
-        project_domain_tokens = normalize(project.get("domain", "")).split()
-        if any(token in job_domains for token in project_domain_tokens):
-            project_score += 10  # raw points per relevant project
-
-    # 🔒 CAP PROJECT SCORE TO WEIGHT
-    project_weight = weights.get("projects", 0)
-    project_score = min(project_score, project_weight)
-
-    score += project_score
-    reasons.append(f"Project score {project_score}")
-
-    # -------------------------------------------------
-    # 4️⃣ EDUCATION
-    # -------------------------------------------------
-    allowed_degrees = {
-        _degree_canonical(normalize(d))
-        for d in job_config.get("education_requirements", [])
-    }
-    resume_degrees = {
-        _degree_canonical(normalize(e.get("degree", "")))
-        for e in extracted_data.get("education") or []
-    }
 
-    if allowed_degrees & resume_degrees:
-        edu_score = weights.get("education", 0)
-        score += edu_score
-        reasons.append("Education requirement met")
-
-    # -------------------------------------------------
-    # 5️⃣ ELIGIBILITY
-    # -------------------------------------------------
-    candidate_type    = job_config.get("candidate_type", "any")
-    required_exp      = job_config.get("required_experience_years")
-    max_exp           = job_config.get("max_experience_years")
-    # None means AI couldn't determine experience — treat as 0 for comparisons
-    # but note the ambiguity in the reason string
-    raw_exp           = extracted_data.get("experience_years")
-    resume_exp        = raw_exp if raw_exp is not None else 0
-    exp_unknown       = raw_exp is None
-    elig_weight       = weights.get("eligibility", 0)
-    disqualified      = False
-    disqualify_reason = None
-
-    if candidate_type == "student" and resume_exp > 0:
-        disqualified      = True
-        disqualify_reason = f"Not a student (resume shows {resume_exp} yrs experience)"
-
-    elif candidate_type == "experienced" or required_exp is not None:
-        min_exp = required_exp if required_exp is not None else 1
-        exp_label = "unknown" if exp_unknown else f"{resume_exp} yrs"
-        if resume_exp < min_exp:
-            disqualified      = True
-            disqualify_reason = f"Insufficient experience: {exp_label} (required {min_exp} yrs)"
-        elif max_exp is not None and resume_exp > max_exp:
-            disqualified      = True
-            disqualify_reason = f"Overqualified: {exp_label} experience (max {max_exp} yrs)"
-
-    if disqualified:
-        reasons.insert(0, disqualify_reason)
-    else:
-        score += elig_weight
-        reasons.append("Eligibility requirement met")
-
-    # -------------------------------------------------
-    # FINALIZE
-    # -------------------------------------------------
-    final_score = min(int(score), 100)
-
-    return final_score, "; ".join(reasons), disqualified
+def score_batch(job_config: dict, resumes: list) -> BatchScores:
+    """
+    Score many extracted_data dicts against one job. Equivalent to calling
+    score_resume on each — to score the same resumes against several jobs,
+    build one CandidateMatrix and call .score(compile_job(...)) per job.
+    """
+    tables = current_tables()
+    return CandidateMatrix(resumes, tables).score(compile_job(job_config, tables))
@@ -0,0 +1,510 @@
+import os
+import time
+import hashlib
+import zipfile
+from datetime import datetime, timedelta
+from sqlalchemy import insert, update, or_, and_, exists, func
+from sqlalchemy.orm import aliased
+
+from db.models import ResumeRun, ResumeFile, ResumeResult, ScreeningItem, ExtractionCache, JobConfig
+from db.upsert import insert_ignore_conflicts
+from services.run_events import publish
+from services.metrics import observe_stage, RUNS_FINISHED
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+# Queue rows inserted per statement while a ZIP is being enqueued, and the
+# most member bytes buffered before they are inserted — whichever is hit
+# first. Together with MAX_RESUME_BYTES this bounds what an upload holds.
+ENQUEUE_CHUNK = 50
+ENQUEUE_BYTES = int(os.getenv("SCREENING_ENQUEUE_BYTES", str(8 * 1024 * 1024)))
+
+# Items claimed per batch by a re-score run. No AI call is made for them, so
+# the claim is not capped by the worker's AI concurrency.
+RESCORE_BATCH_SIZE = int(os.getenv("SCREENING_RESCORE_BATCH_SIZE", "500"))
+
+# Bytes read from a ZIP member per step while hashing it
+READ_CHUNK = 64 * 1024
+
+# Largest resume accepted from a ZIP, in decompressed bytes. Bigger members
+# (or members that inflate past their declared size) are failed at enqueue
+# instead of being read into memory and stored in screening_items.
+MAX_RESUME_BYTES = int(os.getenv("SCREENING_MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+
+# A claim older than this is treated as abandoned (worker died / redeployed)
+# and the item becomes claimable again.
+LEASE_SECONDS = int(os.getenv("SCREENING_LEASE_SECONDS", "900"))
+
+# Items reclaimed more often than this are failed instead of retried forever
+MAX_ATTEMPTS = int(os.getenv("SCREENING_MAX_ATTEMPTS", "3"))
+
+UNFINISHED = ("pending", "processing")
+
+
+def _resume_members(zip_ref: zipfile.ZipFile) -> list:
+    """Archive entries that look like resumes, read from the central directory only."""
+    return [
+        info for info in zip_ref.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS)
+    ]
+
+
+def hash_content(chunks) -> tuple:
+    """
+    (content, sha256, md5) from an iterable of byte chunks, in a single pass.
+    sha256 is the file_hash; md5 is only used to find rows hashed before the
+    switch (see resolve_resume_ids).
+    """
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    # Appended in place, so each chunk is dropped once copied in — no list of
+    # parts plus a joined copy of the whole member
+    content = bytearray()
+    hashing = 0.0
+    for chunk in chunks:
+        started = time.perf_counter()
+        sha256.update(chunk)
+        md5.update(chunk)
+        hashing += time.perf_counter() - started
+        content += chunk
+    observe_stage("hash", hashing)
+    return content, sha256.hexdigest(), md5.hexdigest()
+
+
+def _timed_reads(member, limit: int):
+    """
+    A ZIP member's chunks; the decompression time is observed as `unzip`.
+    Raises ValueError as soon as more than `limit` bytes come out, so a
+    member whose header understates its size is never read in full.
+    """
+    reading = 0.0
+    total = 0
+    while True:
+        started = time.perf_counter()
+        chunk = member.read(READ_CHUNK)
+        reading += time.perf_counter() - started
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > limit:
+            observe_stage("unzip", reading)
+            raise ValueError(f"Decompressed past its declared size ({limit} bytes)")
+        yield chunk
+    observe_stage("unzip", reading)
+
+
+def iter_resume_members(zip_ref: zipfile.ZipFile, members: list):
+    """
+    Yield (member_name, content, sha256, md5, error) one resume at a time,
+    straight out of the archive. Each member is decompressed once, in
+    READ_CHUNK steps, and hashed as it is read. Nothing is extracted to disk
+    and nothing is kept between members; the caller decides how many it
+    buffers (enqueue_zip: at most ENQUEUE_BYTES).
+
+    A member declared larger than MAX_RESUME_BYTES is not read at all, and
+    one that inflates past its declared size (or fails its CRC, which is how
+    zipfile reports data cut at the declared size) is abandoned mid-stream.
+    These come back with content None and the reason in `error`.
+    """
+    for info in members:
+        if info.file_size > MAX_RESUME_BYTES:
+            yield info.filename, None, None, None, (
+                f"Resume is {info.file_size} bytes, over the {MAX_RESUME_BYTES}-byte limit"
+            )
+            continue
+        try:
+            with zip_ref.open(info) as member:
+                content, sha256, md5 = hash_content(_timed_reads(member, info.file_size))
+        except (ValueError, zipfile.BadZipFile) as e:
+            yield info.filename, None, None, None, str(e)
+            continue
+        yield info.filename, content, sha256, md5, None
+
+
+def _upgrade_legacy_hashes(db, files: dict):
+    """
+    resume_files / extraction_cache rows written before the switch to SHA-256
+    are keyed by MD5. Re-key the ones matching this upload in place so their
+    resume_id, results and cached extraction carry over (caller commits).
+    """
+    legacy = {f["legacy_hash"]: sha for sha, f in files.items() if f.get("legacy_hash")}
+    if not legacy:
+        return
+    found = [
+        h for (h,) in db.query(ResumeFile.file_hash)
+        .filter(ResumeFile.file_hash.in_(list(legacy)))
+        .all()
+    ]
+    for md5 in found:
+        db.query(ResumeFile).filter(ResumeFile.file_hash == md5).update(
+            {"file_hash": legacy[md5]}, synchronize_session=False
+        )
+        db.query(ExtractionCache).filter(ExtractionCache.file_hash == md5).update(
+            {"file_hash": legacy[md5]}, synchronize_session=False
+        )
+
+
+def resolve_resume_ids(db, files: list) -> dict:
+    """
+    Map file_hash → resume_id for `files` (dicts with file_hash, file_name and
+    optionally legacy_hash, the MD5), creating missing resume_files rows. One
+    bulk INSERT ... ON CONFLICT DO NOTHING plus one SELECT, however many
+    files (caller commits).
+    """
+    by_hash = {}
+    for f in files:
+        by_hash.setdefault(f["file_hash"], f)
+    if not by_hash:
+        return {}
+
+    _upgrade_legacy_hashes(db, by_hash)
+
+    new_files = {
+        file_hash: {
+            "file_name": os.path.basename(f["file_name"]),
+            "file_hash": file_hash,
+            "file_path": f["file_name"],
+        }
+        for file_hash, f in by_hash.items()
+    }
+    db.execute(insert_ignore_conflicts(db, ResumeFile), list(new_files.values()))
+    return dict(
+        db.query(ResumeFile.file_hash, ResumeFile.resume_id)
+        .filter(ResumeFile.file_hash.in_(list(new_files)))
+        .all()
+    )
+
+
+def _insert_items(db, rows: list):
+    resume_ids = resolve_resume_ids(db, rows)
+    for row in rows:
+        row["resume_id"] = resume_ids[row["file_hash"]]
+        del row["legacy_hash"]
+    db.execute(insert(ScreeningItem), rows)
+
+
+def enqueue_zip(db, run: ResumeRun, zip_path: str) -> int:
+    """
+    Queue one ScreeningItem per resume in the ZIP and commit them together
+    with run.total_resumes — a run is either fully queued or not at all.
+    Files are hashed and resolved to resume_ids here, in bulk, so workers
+    never look them up one by one. Members over MAX_RESUME_BYTES are queued
+    already failed, with no content, and counted in run.failed_count.
+    Returns the number of resumes in the run.
+
+    Runs inside the upload request: the client waits until every member is
+    written to screening_items, so upload time grows with the ZIP. Memory
+    does not — rows are inserted every ENQUEUE_CHUNK members or
+    ENQUEUE_BYTES of content, whichever comes first.
+    """
+    rows = []
+    buffered = 0
+    oversized = []
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        members = _resume_members(zip_ref)
+        members_iter = iter_resume_members(zip_ref, members)
+        for seq, (file_name, content, sha256, md5, error) in enumerate(members_iter):
+            if error:
+                print(f"[RUN {run.run_id}] ❌ Skipped {file_name}: {error}")
+                oversized.append({
+                    "run_id":        run.run_id,
+                    "job_id":        run.job_id,
+                    "seq":           seq,
+                    "file_name":     file_name,
+                    "status":        "failed",
+                    "attempts":      0,
+                    "finished_at":   datetime.utcnow(),
+                    "error_message": error,
+                })
+                continue
+            rows.append({
+                "run_id":      run.run_id,
+                "job_id":      run.job_id,
+                "seq":         seq,
+                "file_name":   file_name,
+                "content":     content,
+                "file_hash":   sha256,
+                "legacy_hash": md5,
+                "status":      "pending",
+                "attempts":    0,
+            })
+            buffered += len(content)
+            if len(rows) >= ENQUEUE_CHUNK or buffered >= ENQUEUE_BYTES:
+                _insert_items(db, rows)
+                rows = []
+                buffered = 0
+        if rows:
+            _insert_items(db, rows)
+    if oversized:
+        db.execute(insert(ScreeningItem), oversized)
+
+    run.total_resumes = len(members)
+    run.failed_count = len(oversized)
+    if len(oversized) == len(members):
+        run.status = "completed"
+        run.ended_at = datetime.utcnow()
+    db.commit()
+    return len(members)
+
+
+def previous_versions(db, job: JobConfig) -> list:
+    """job_ids of every version `job` replaced, newest first."""
+    job_ids = []
+    parent_id = job.parent_job_id
+    while parent_id is not None and parent_id not in job_ids:
+        job_ids.append(parent_id)
+        parent_id = db.query(JobConfig.parent_job_id).filter_by(job_id=parent_id).scalar()
+    return job_ids
+
+
+def enqueue_rescore(db, run: ResumeRun, source_job_ids: list) -> int:
+    """
+    Queue one ScreeningItem per resume screened under `source_job_ids` and not
+    yet under run.job_id. Items carry no bytes: each points at the resume's
+    latest successful result, whose extracted_data the worker re-scores —
+    no text extraction, no LLM call. Commits together with
+    run.total_resumes. Returns the number of resumes queued.
+    """
+    latest = (
+        db.query(func.max(ResumeResult.result_id).label("result_id"))
+        .filter(
+            ResumeResult.job_id.in_(source_job_ids),
+            ResumeResult.extracted_data.isnot(None),
+        )
+        .group_by(ResumeResult.resume_id)
+        .subquery()
+    )
+    screened = aliased(ResumeResult)
+    rows = (
+        db.query(ResumeResult.result_id, ResumeFile.resume_id, ResumeFile.file_name, ResumeFile.file_hash)
+        .join(latest, ResumeResult.result_id == latest.c.result_id)
+        .join(ResumeFile, ResumeFile.resume_id == ResumeResult.resume_id)
+        .filter(~exists().where(
+            screened.resume_id == ResumeResult.resume_id,
+            screened.job_id == run.job_id,
+            screened.extracted_data.isnot(None),
+        ))
+        .order_by(ResumeResult.result_id)
+        .all()
+    )
+
+    if rows:
+        db.execute(insert(ScreeningItem), [
+            {
+                "run_id":           run.run_id,
+                "job_id":           run.job_id,
+                "seq":              seq,
+                "file_name":        row.file_name,
+                "file_hash":        row.file_hash,
+                "resume_id":        row.resume_id,
+                "source_result_id": row.result_id,
+                "status":           "pending",
+                "attempts":         0,
+            }
+            for seq, row in enumerate(rows)
+        ])
+
+    run.total_resumes = len(rows)
+    if not rows:
+        run.status = "completed"
+        run.ended_at = datetime.utcnow()
+    db.commit()
+    return len(rows)
+
+
+def _claimable(cutoff: datetime):
+    return or_(
+        ScreeningItem.status == "pending",
+        and_(ScreeningItem.status == "processing", ScreeningItem.claimed_at < cutoff),
+    )
+
+
+def claim_items(db, worker_id: str, max_items: int, run_id: int = None):
+    """
+    Claim the next items of the oldest run that has work, up to
+    min(run.batch_size, max_items) — or run.batch_size for re-score and
+    talent-pool runs, which make no AI calls. Only the items are locked
+    (SELECT ... FOR UPDATE SKIP LOCKED), so any number of workers can drain
+    the queue without double-processing or waiting on each other; the run
+    row is read without a lock. The claim itself is one
+    UPDATE ... WHERE item_id IN.
+    Returns (run_id, [item dict, ...]) — (None, []) when the queue is empty
+    or the given run_id does not exist.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=LEASE_SECONDS)
+
+    if run_id is None:
+        # The run is chosen by locking its first free item: items other
+        # workers hold are skipped, so a later run with work is found even
+        # when every claimable item of the oldest run is already taken.
+        # The lock is ours until commit, so the claim below gets at least
+        # that item.
+        run_id = (
+            db.query(ScreeningItem.run_id)
+            .filter(_claimable(cutoff))
+            .order_by(ScreeningItem.run_id, ScreeningItem.seq)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar()
+        )
+        if run_id is None:
+            db.commit()
+            return None, []
+
+    run = db.query(ResumeRun).filter_by(run_id=run_id).first()
+    if run is None:
+        db.commit()
+        return None, []
+    if run.run_type in ("rescore", "talent_pool"):
+        limit = max(1, run.batch_size)
+    else:
+        limit = max(1, min(run.batch_size, max_items))
+
+    rows = (
+        db.query(
+            ScreeningItem.item_id,
+            ScreeningItem.seq,
+            ScreeningItem.file_name,
+            ScreeningItem.content,
+            ScreeningItem.file_hash,
+            ScreeningItem.resume_id,
+            ScreeningItem.source_result_id,
+            ScreeningItem.attempts,
+        )
+        .filter(ScreeningItem.run_id == run_id, _claimable(cutoff))
+        .order_by(ScreeningItem.seq)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    items = [dict(row._asdict(), attempts=row.attempts + 1) for row in rows]
+
+    if items:
+        db.query(ScreeningItem).filter(
+            ScreeningItem.item_id.in_([item["item_id"] for item in items])
+        ).update(
+            {
+                ScreeningItem.status:     "processing",
+                ScreeningItem.claimed_by: worker_id,
+                ScreeningItem.claimed_at: datetime.utcnow(),
+                ScreeningItem.attempts:   ScreeningItem.attempts + 1,
+            },
+            synchronize_session=False,
+        )
+        started = db.query(ResumeRun).filter(
+            ResumeRun.run_id == run_id,
+            ResumeRun.status == "queued"
+        ).update({"status": "running"}, synchronize_session=False)
+        if started:
+            publish(db, run_id, status="running")
+
+    db.commit()
+    db.expunge_all()
+    return run_id, items
+
+
+def touch_items(db, item_ids: list):
+    """Extend the lease on items still being worked on (caller commits)."""
+    if not item_ids:
+        return
+    db.query(ScreeningItem).filter(
+        ScreeningItem.item_id.in_(item_ids)
+    ).update({"claimed_at": datetime.utcnow()}, synchronize_session=False)
+
+
+def release_items(db, item_ids: list):
+    """
+    Hand unfinished items back to the queue without waiting for the lease to
+    expire. `attempts` is kept, so an item that keeps breaking its worker is
+    still failed after MAX_ATTEMPTS (caller commits).
+    """
+    if not item_ids:
+        return
+    db.query(ScreeningItem).filter(
+        ScreeningItem.item_id.in_(item_ids),
+        ScreeningItem.status == "processing",
+    ).update({"status": "pending", "claimed_by": None, "claimed_at": None}, synchronize_session=False)
+
+
+def finish_items(db, finished: list):
+    """
+    Mark items done/failed and drop their bytes. `finished` is a list of dicts
+    with item_id, status, error_message and, for resumes whose text was
+    extracted, text_extractor / extract_ms. Items with identical values share
+    one UPDATE ... WHERE item_id IN, so a large batch of plain successes is a
+    single statement (caller commits).
+    """
+    groups = {}
+    for f in finished:
+        key = (f["status"], f.get("error_message"), f.get("text_extractor"), f.get("extract_ms"))
+        groups.setdefault(key, []).append(f["item_id"])
+
+    now = datetime.utcnow()
+    for (status, error_message, text_extractor, extract_ms), item_ids in groups.items():
+        db.query(ScreeningItem).filter(ScreeningItem.item_id.in_(item_ids)).update(
+            {
+                ScreeningItem.status:         status,
+                ScreeningItem.content:        None,
+                ScreeningItem.finished_at:    now,
+                ScreeningItem.error_message:  error_message,
+                ScreeningItem.text_extractor: text_extractor,
+                ScreeningItem.extract_ms:     extract_ms,
+            },
+            synchronize_session=False,
+        )
+
+
+def bump_run_counters(db, run_id: int, processed: int = 0, failed: int = 0, items: list = None):
+    """
+    Atomic counter update — several workers may write to the same run, so a
+    read-modify-write through the ORM would lose increments (caller commits).
+    The new totals, plus the per-resume `items` written alongside, are
+    published as a run event when the caller's transaction commits.
+    """
+    counts = db.execute(
+        update(ResumeRun)
+        .where(ResumeRun.run_id == run_id)
+        .values(
+            processed_count=ResumeRun.processed_count + processed,
+            failed_count=ResumeRun.failed_count + failed,
+        )
+        .returning(ResumeRun.processed_count, ResumeRun.failed_count, ResumeRun.total_resumes)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if counts:
+        publish(
+            db, run_id,
+            processed_count=counts.processed_count,
+            failed_count=counts.failed_count,
+            total_resumes=counts.total_resumes,
+            items=items or [],
+        )
+
+
+def finish_run_if_drained(db, run_id: int) -> bool:
+    """Mark the run completed once no item is pending or processing."""
+    unfinished = db.query(
+        exists().where(
+            ScreeningItem.run_id == run_id,
+            ScreeningItem.status.in_(UNFINISHED),
+        )
+    ).scalar()
+    if unfinished:
+        db.commit()
+        return False
+
+    ended_at = datetime.utcnow()
+    updated = db.query(ResumeRun).filter(
+        ResumeRun.run_id == run_id,
+        ResumeRun.status.in_(("queued", "running")),
+    ).update(
+        {"status": "completed", "ended_at": ended_at},
+        synchronize_session=False,
+    )
+    if updated:
+        publish(db, run_id, status="completed", ended_at=ended_at)
+    db.commit()
+    if updated:
+        RUNS_FINISHED.labels("completed").inc()
+    return bool(updated)
@@ -0,0 +1,574 @@
+import os
+import socket
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from email_validator import validate_email, EmailNotValidError
+from groq import RateLimitError
+from sqlalchemy import insert, update
+
+from db.session import SessionLocal
+from db.models import ResumeRun, ResumeResult, JobConfig
+from services.resume_processor import process_single_resume
+from services.text_extractor import extract_text
+from services.scoring_engine import compile_job, CandidateMatrix
+from services.extraction_cache import get_cached_extractions, store_extractions, remember_extractions
+from services.talent_pool import profile_row, store_profiles, process_talent_pool_batch
+from services.run_events import result_item
+from services.metrics import timed, observe_stage, RESUMES, BATCH_SCORE_FALLBACKS
+from services.screening_queue import (
+    MAX_ATTEMPTS,
+    hash_content,
+    resolve_resume_ids,
+    claim_items,
+    touch_items,
+    release_items,
+    finish_items,
+    bump_run_counters,
+    finish_run_if_drained,
+)
+
+# Resumes in flight per worker process (AI extraction threads). A claimed
+# batch is min(run.batch_size, MAX_CONCURRENCY) items.
+MAX_CONCURRENCY = int(os.getenv("SCREENING_MAX_CONCURRENCY", "10"))
+
+# Processes parsing PDF/DOCX text ahead of the AI threads (pdfplumber is
+# CPU-bound pure Python and would serialise on the GIL in threads).
+# 0 parses on the AI threads instead.
+TEXT_WORKERS = int(os.getenv("SCREENING_TEXT_WORKERS", str(os.cpu_count() or 1)))
+
+# Result writes are buffered and committed every FLUSH_ROWS resumes or
+# FLUSH_SECONDS, whichever comes first (and at the end of every batch)
+FLUSH_ROWS = int(os.getenv("SCREENING_FLUSH_ROWS", "50"))
+FLUSH_SECONDS = float(os.getenv("SCREENING_FLUSH_SECONDS", "5"))
+
+# Seconds an idle worker waits before polling the queue again
+POLL_INTERVAL = float(os.getenv("SCREENING_POLL_INTERVAL", "2"))
+
+# "1": also run a worker thread inside the API process — a single-process
+# convenience for local development. It puts AI calls and a pool of
+# TEXT_WORKERS parser processes next to request handling, so deployments
+# run `python worker.py` instead and leave this off.
+INLINE_WORKER = os.getenv("SCREENING_INLINE_WORKER", "0") == "1"
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _normalize_email(extracted_data: dict) -> dict:
+    """Set personal_details.email to None if the AI returned a non-email string."""
+    personal = extracted_data.get("personal_details")
+    if not isinstance(personal, dict):
+        return extracted_data
+    raw = str(personal.get("email") or "").strip()
+    try:
+        personal["email"] = validate_email(raw, check_deliverability=False).email
+    except EmailNotValidError:
+        personal["email"] = None
+    return extracted_data
+
+
+def _new_entry(item: dict) -> dict:
+    return {
+        "item":            item,
+        "file_name":       os.path.basename(item["file_name"]),
+        "file_hash":       item["file_hash"],
+        "resume_id":       item["resume_id"],
+        "existing_result": None,
+        "cached":          None,
+        "scored":          None,
+        "future":          None,
+        "error":           None,
+        "text_extractor":  None,
+        "extract_ms":      None,
+    }
+
+
+def _prefetch_batch(db, job_id: int, items: list) -> list:
+    """
+    All DB reads for a claimed batch in a fixed number of queries: resume ids
+    (resolved at enqueue time), this job's existing results and cached
+    extractions — or, for re-score items, the stored result they point at —
+    are loaded in bulk into per-entry state. Per-resume errors are
+    captured on the entry so they are accounted for in order.
+    """
+    entries = [_new_entry(item) for item in items]
+    live = []
+    for entry in entries:
+        if entry["item"]["attempts"] > MAX_ATTEMPTS:
+            entry["error"] = RuntimeError(
+                f"Gave up after {MAX_ATTEMPTS} attempts "
+                "(worker stopped or timed out while processing this resume)"
+            )
+        else:
+            live.append(entry)
+    if not live:
+        return entries
+
+    try:
+        # Items queued before resume ids were resolved at enqueue time
+        unresolved = [e for e in live if e["resume_id"] is None]
+        if unresolved:
+            files = []
+            for entry in unresolved:
+                _, sha256, md5 = hash_content([entry["item"]["content"]])
+                entry["file_hash"] = sha256
+                files.append({
+                    "file_hash":   sha256,
+                    "legacy_hash": md5,
+                    "file_name":   entry["item"]["file_name"],
+                })
+            resume_ids = resolve_resume_ids(db, files)
+            db.commit()
+            for entry in unresolved:
+                entry["resume_id"] = resume_ids.get(entry["file_hash"])
+
+        # 🔎 Extracted before under the current model + prompt (any job)?
+        rescore = [e for e in live if e["item"]["source_result_id"]]
+        cached = get_cached_extractions(
+            db, [e["file_hash"] for e in live if not e["item"]["source_result_id"]]
+        )
+
+        # 🔁 Re-score items: the stored extraction, whatever prompt produced it
+        stored = {}
+        if rescore:
+            stored = dict(
+                db.query(ResumeResult.result_id, ResumeResult.extracted_data)
+                .filter(ResumeResult.result_id.in_([e["item"]["source_result_id"] for e in rescore]))
+                .all()
+            )
+
+        # 🔎 Already processed for this job (skip failed rows)?
+        existing = {}
+        rows = db.query(
+            ResumeResult.result_id,
+            ResumeResult.resume_id,
+            ResumeResult.extracted_data,
+            ResumeResult.passed_out_year,
+        ).filter(
+            ResumeResult.resume_id.in_({e["resume_id"] for e in live if e["resume_id"]}),
+            ResumeResult.job_id == job_id,
+            ResumeResult.extracted_data.isnot(None)
+        ).order_by(ResumeResult.result_id).all()
+        for row in rows:
+            existing.setdefault(row.resume_id, row._asdict())
+
+        for entry in live:
+            source_result_id = entry["item"]["source_result_id"]
+            if source_result_id:
+                entry["cached"] = stored.get(source_result_id)
+                if entry["cached"] is None:
+                    entry["error"] = RuntimeError("Stored extraction to re-score no longer exists")
+            else:
+                entry["cached"] = cached.get(entry["file_hash"])
+            entry["existing_result"] = existing.get(entry["resume_id"])
+    except Exception as e:
+        db.rollback()
+        for entry in live:
+            entry["error"] = e
+    return entries
+
+
+def _failure_write(run_id: int, job_id: int, entry: dict, ai_status: str, error) -> dict:
+    """Buffered write for a resume that could not be screened."""
+    insert_row = None
+    if entry["resume_id"]:
+        insert_row = {
+            "run_id":        run_id,
+            "resume_id":     entry["resume_id"],
+            "job_id":        job_id,
+            "ai_status":     ai_status,
+            "error_message": str(error),
+        }
+    return {"entry": entry, "insert": insert_row, "update": None, "profile": None,
+            "status": "failed", "error": str(error)}
+
+
+class ResultBuffer:
+    """
+    Result writes for one claimed batch, flushed every FLUSH_ROWS resumes or
+    FLUSH_SECONDS, and always at the end of the batch.
+
+    A flush is one transaction: the extraction_cache rows of new AI calls,
+    the result rows (bulk INSERT + bulk UPDATE by primary key), the
+    candidate profiles of new extractions, the run counter increments and
+    the queue status of exactly those items. It either lands completely or
+    not at all. If it fails, it is rolled back and replayed one resume per
+    transaction. A resume whose own write still fails is recorded as failed,
+    together with its cache row, so a retry costs no LLM call. If even that
+    cannot be written, its item stays `processing` and is reclaimed after the
+    lease expires; that, or a worker dying before the flush, re-pays the LLM
+    call for at most FLUSH_ROWS resumes.
+    """
+
+    def __init__(self, db, run_id: int, job_id: int):
+        self.db = db
+        self.run_id = run_id
+        self.job_id = job_id
+        self.writes = []
+        self.last_flush = time.monotonic()
+
+    def add(self, write: dict, pending_item_ids: list):
+        self.writes.append(write)
+        if (len(self.writes) >= FLUSH_ROWS
+                or time.monotonic() - self.last_flush >= FLUSH_SECONDS):
+            self.flush(pending_item_ids)
+
+    @staticmethod
+    def _extractions(writes: list) -> dict:
+        """file_hash → fresh AI extraction for the writes that made an LLM call."""
+        return dict(w["entry"]["extraction"] for w in writes if w["entry"].get("extraction"))
+
+    def _apply(self, writes: list):
+        with timed("cache_write"):
+            store_extractions(self.db, self._extractions(writes))
+        inserts = [w["insert"] for w in writes if w["insert"]]
+        updates = [w["update"] for w in writes if w["update"]]
+        if inserts:
+            self.db.execute(insert(ResumeResult), inserts)
+        if updates:
+            self.db.execute(update(ResumeResult), updates)
+        store_profiles(self.db, [w["profile"] for w in writes if w["profile"]])
+        finish_items(self.db, [
+            {
+                "item_id":        w["entry"]["item"]["item_id"],
+                "status":         w["status"],
+                "error_message":  w["error"],
+                "text_extractor": w["entry"]["text_extractor"],
+                "extract_ms":     w["entry"]["extract_ms"],
+            }
+            for w in writes
+        ])
+        bump_run_counters(
+            self.db, self.run_id,
+            processed=sum(1 for w in writes if w["status"] == "done"),
+            failed=sum(1 for w in writes if w["status"] == "failed"),
+            items=[
+                result_item(w["entry"]["file_name"], w["status"], w["insert"] or w["update"], w["error"])
+                for w in writes
+            ],
+        )
+
+    def _committed(self, writes: list):
+        remember_extractions(self._extractions(writes))
+        for write in writes:
+            RESUMES.labels(write["status"]).inc()
+
+    def flush(self, pending_item_ids: list = ()):
+        """Write everything buffered; extend the lease on items still in flight."""
+        writes, self.writes = self.writes, []
+        self.last_flush = time.monotonic()
+        if not writes:
+            return
+        try:
+            with timed("commit"):
+                self._apply(writes)
+                touch_items(self.db, list(pending_item_ids))
+                self.db.commit()
+            self._committed(writes)
+            return
+        except Exception as e:
+            self.db.rollback()
+            print(f"[RUN {self.run_id}] ⚠️ Bulk write of {len(writes)} result(s) failed, retrying one by one: {e}")
+
+        for write in writes:
+            file_name = write["entry"]["file_name"]
+            try:
+                self._apply([write])
+                self.db.commit()
+                self._committed([write])
+                continue
+            except Exception as e:
+                self.db.rollback()
+                print(f"[RUN {self.run_id}] ❌ Could not save result for {file_name}: {e}")
+                failure = _failure_write(self.run_id, self.job_id, write["entry"], "failed", e)
+            try:
+                self._apply([failure])
+                self.db.commit()
+                self._committed([failure])
+            except Exception as e:
+                self.db.rollback()
+                print(f"[RUN {self.run_id}] ❌ Left for retry after lease expiry: {file_name} ({e})")
+
+
+def process_batch(db, pool, run_id: int, job_id: int, job_config: dict,
+                  items: list, total_resumes: int, quota_exhausted_runs: set,
+                  text_pool=None):
+    """
+    Screen one claimed batch. DB work stays on this thread; the Groq call for
+    new resumes runs concurrently on `pool`. With a `text_pool`, every new
+    resume is parsed there first — all of them at once, across cores — and
+    each AI thread starts its call as soon as its own text is ready, so
+    parsing overlaps the network wait of earlier resumes. Results are built
+    in ZIP order and written through a ResultBuffer, so each flush commits
+    result rows, run counters and queue status together.
+    """
+    # 1️⃣ Resolve DB state for the whole batch and submit every resume that
+    #    needs AI extraction to the pool (once per distinct file)
+    with timed("db_lookup"):
+        entries = _prefetch_batch(db, job_id, items)
+    in_flight = {}
+    for entry in entries:
+        item = entry["item"]
+        needs_ai = (
+            entry["error"] is None
+            and entry["resume_id"] is not None
+            and entry["cached"] is None
+        )
+        if needs_ai and run_id not in quota_exhausted_runs:
+            if entry["file_hash"] not in in_flight:
+                parsed = None
+                if text_pool is not None:
+                    parsed = text_pool.submit(extract_text, item["file_name"], item["content"])
+                in_flight[entry["file_hash"]] = pool.submit(
+                    process_single_resume, item["file_name"], item["content"], parsed
+                )
+            entry["future"] = in_flight[entry["file_hash"]]
+
+    # 2️⃣ Score everything whose extracted_data is already known (cache hits,
+    #    re-score items) in one vectorized pass. If any row trips the batch
+    #    scorer, every row is scored on its own below instead, so the error
+    #    lands on that resume only.
+    scorer = compile_job(job_config)
+    known = [e for e in entries if e["error"] is None and e["cached"] is not None]
+    if known:
+        try:
+            with timed("score_batch"):
+                batch = CandidateMatrix([e["cached"] for e in known], scorer.tables).score(scorer)
+            for i, entry in enumerate(known):
+                entry["scored"] = batch.result(i)
+        except Exception as e:
+            BATCH_SCORE_FALLBACKS.labels("screening").inc()
+            print(f"[RUN {run_id}] ⚠️ Batch scoring of {len(known)} resume(s) failed, scoring one by one: {e}")
+
+    # 3️⃣ Collect results in ZIP order and buffer the writes
+    buffer = ResultBuffer(db, run_id, job_id)
+    for idx, entry in enumerate(entries):
+        item = entry["item"]
+        file_name = entry["file_name"]
+        resume_id = entry["resume_id"]
+        existing_result = entry["existing_result"]
+        extracted_data = entry["cached"]
+        pending_item_ids = [e["item"]["item_id"] for e in entries[idx + 1:]]
+
+        print(
+            f"[RUN {run_id}] Processing resume "
+            f"{item['seq'] + 1}/{total_resumes} → {file_name}"
+        )
+
+        try:
+            if entry["error"] is not None:
+                raise entry["error"]
+
+            if resume_id is None:
+                raise RuntimeError("Failed to create resume record")
+
+            if extracted_data is None:
+                if entry["future"] is None:
+                    # Reached after the Groq quota ran out — no AI call made
+                    print(f"[RUN {run_id}] ⏳ Skipping (Groq quota exhausted) → {file_name}")
+                    buffer.add(_failure_write(
+                        run_id, job_id, entry, "rate_limited",
+                        "Groq quota exhausted earlier in this run"
+                    ), pending_item_ids)
+                    continue
+
+                # 🚀 New resume → AI extraction (already running on the pool)
+                print(f"[RUN {run_id}] Waiting for AI extraction")
+
+                extracted = entry["future"].result()
+                extracted_data = _normalize_email(extracted["extracted_data"])
+                entry["text_extractor"] = extracted["text_extractor"]
+                entry["extract_ms"] = extracted["extract_ms"]
+                observe_stage("text_extract", extracted["extract_ms"] / 1000)
+                print(
+                    f"[RUN {run_id}] Text via {extracted['text_extractor']} in {extracted['extract_ms']} ms, "
+                    f"{extracted['text_tokens']} tokens sent ({extracted['tokens_saved']} saved)"
+                )
+
+                # Cached in the same flush as the result. It rides on the
+                # entry, so a failure write for this resume still stores it
+                # and the LLM call is not paid for again on a retry.
+                entry["extraction"] = (entry["file_hash"], extracted_data)
+
+            if existing_result and existing_result["extracted_data"] == extracted_data:
+                print(f"[RUN {run_id}] Reusing existing result for job")
+
+                reused = {
+                    "result_id":    existing_result["result_id"],
+                    "run_id":       run_id,
+                    "processed_at": datetime.utcnow(),
+                    "ai_status":    "reused",
+                }
+                # Backfill passed_out_year if missing but present in stored data
+                if existing_result["passed_out_year"] is None:
+                    raw_year = extracted_data.get("passed_out_year")
+                    reused["passed_out_year"] = int(raw_year) if raw_year is not None else None
+
+                write = {"insert": None, "update": reused, "profile": None}
+
+            else:
+                if entry["future"] is None:
+                    print(f"[RUN {run_id}] Reusing cached extraction, re-scoring")
+
+                personal = extracted_data.get("personal_details") or {}
+
+                # Score for this job (cache hits were scored in the batch pass)
+                if entry["scored"] is None:
+                    with timed("score"):
+                        entry["scored"] = scorer.score(extracted_data)
+                score, reason, disqualified = entry["scored"]
+
+                decision = "rejected" if disqualified or score < 60 else "shortlisted"
+
+                raw_year = extracted_data.get("passed_out_year")
+                passed_out_year = int(raw_year) if raw_year is not None else None
+
+                row = {
+                    "run_id":          run_id,
+                    "extracted_data":  extracted_data,
+                    "full_name":       personal.get("full_name"),
+                    "email":           personal.get("email"),
+                    "phone":           personal.get("phone"),
+                    "score":           score,
+                    "decision":        decision,
+                    "decision_reason": reason,
+                    "passed_out_year": passed_out_year,
+                    "ai_status":       "success",
+                    "error_message":   None,
+                }
+                # A result for this job from an older prompt/model is
+                # refreshed in place — one scored row per resume × job
+                # Latest extraction becomes the resume's talent-pool profile
+                # (a re-score only re-reads a stored one)
+                profile = None
+                if not item["source_result_id"]:
+                    profile = profile_row(resume_id, extracted_data, scorer.tables)
+
+                if existing_result:
+                    row.update(result_id=existing_result["result_id"], processed_at=datetime.utcnow())
+                    write = {"insert": None, "update": row, "profile": profile}
+                else:
+                    row.update(resume_id=resume_id, job_id=job_id)
+                    write = {"insert": row, "update": None, "profile": profile}
+
+            write.update(entry=entry, status="done", error=None)
+            buffer.add(write, pending_item_ids)
+
+        except BrokenProcessPool:
+            # A parser process died — which resume killed it is unknown.
+            # Save what is done and requeue the rest; run_worker restarts
+            # the pool.
+            db.rollback()
+            buffer.flush()
+            release_items(db, [e["item"]["item_id"] for e in entries[idx:]])
+            db.commit()
+            raise
+
+        except RateLimitError as e:
+            print(f"[RUN {run_id}] ⏳ Groq rate limit not recoverable: {file_name}")
+            quota_exhausted_runs.add(run_id)
+            db.rollback()
+            buffer.add(_failure_write(run_id, job_id, entry, "rate_limited", e), pending_item_ids)
+
+        except Exception as e:
+            print(f"[RUN {run_id}] ❌ Error processing {file_name}: {e}")
+            db.rollback()
+            buffer.add(_failure_write(run_id, job_id, entry, "failed", e), pending_item_ids)
+
+    buffer.flush()
+
+
+def work_once(pool, worker_id: str, quota_exhausted_runs: set, run_id: int = None,
+              text_pool=None) -> bool:
+    """Claim and process one batch. Returns False when there was nothing to do."""
+    db = SessionLocal()
+    try:
+        run_id, items = claim_items(db, worker_id, MAX_CONCURRENCY, run_id=run_id)
+        if not items:
+            return False
+
+        run = db.query(ResumeRun).filter_by(run_id=run_id).first()
+        job = db.query(JobConfig).filter_by(job_id=run.job_id).first()
+
+        print(
+            f"[RUN {run_id}] Worker {worker_id} claimed "
+            f"{len(items)} resume(s) starting at #{items[0]['seq'] + 1}"
+        )
+
+        if run.run_type == "talent_pool":
+            process_talent_pool_batch(db, run_id, job.job_id, job.job_config, items)
+        else:
+            process_batch(
+                db, pool, run_id, job.job_id, job.job_config,
+                items, run.total_resumes, quota_exhausted_runs, text_pool
+            )
+
+        if finish_run_if_drained(db, run_id):
+            quota_exhausted_runs.discard(run_id)
+            print(f"[RUN {run_id}] Completed")
+        return True
+    finally:
+        db.close()
+
+
+def _new_text_pool():
+    if TEXT_WORKERS <= 0:
+        return None
+    # spawn, not fork: the parent has DB connections and running threads
+    return ProcessPoolExecutor(
+        max_workers=TEXT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def run_worker(stop_event: threading.Event = None, worker_id: str = None):
+    """Drain the screening queue until `stop_event` is set."""
+    stop_event = stop_event or threading.Event()
+    worker_id = worker_id or default_worker_id()
+    quota_exhausted_runs = set()
+    text_pool = _new_text_pool()
+
+    print(
+        f"[WORKER {worker_id}] Started — up to {MAX_CONCURRENCY} resumes in flight, "
+        f"{TEXT_WORKERS} text extraction process(es)"
+    )
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="screening") as pool:
+            while not stop_event.is_set():
+                try:
+                    worked = work_once(pool, worker_id, quota_exhausted_runs, text_pool=text_pool)
+                except BrokenProcessPool as e:
+                    # A parser process died (e.g. OOM on a hostile PDF). Its
+                    # batch was requeued; start fresh processes.
+                    print(f"[WORKER {worker_id}] ❌ Text extraction pool broke, restarting: {e}")
+                    text_pool.shutdown(wait=False, cancel_futures=True)
+                    text_pool = _new_text_pool()
+                    worked = False
+                except Exception as e:
+                    print(f"[WORKER {worker_id}] ❌ Error: {e}")
+                    worked = False
+                if not worked:
+                    stop_event.wait(POLL_INTERVAL)
+    finally:
+        if text_pool is not None:
+            text_pool.shutdown(cancel_futures=True)
+
+    print(f"[WORKER {worker_id}] Stopped")
+
+
+def start_inline_worker() -> threading.Event:
+    """Run a worker on a daemon thread of the current (API) process."""
+    stop_event = threading.Event()
+    threading.Thread(
+        target=run_worker,
+        kwargs={"stop_event": stop_event, "worker_id": f"{default_worker_id()}:inline"},
+        name="screening-worker",
+        daemon=True,
+    ).start()
+    return stop_event
@@ -0,0 +1,346 @@
+"""
+Candidate profiles and talent-pool screening: every stored profile scored
+against a job in bulk, without the resumes and without any LLM call.
+"""
+
+import os
+from datetime import datetime
+from sqlalchemy import insert, update, select, literal, exists, bindparam, func, Integer, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from db.models import CandidateProfile, ResumeFile, ResumeResult, ResumeRun, ScreeningItem
+from db.dialect import array_overlap
+from db.upsert import upsert
+from services.scoring_engine import compile_job, current_tables, scoring_keys, CandidateMatrix
+from services.screening_queue import MAX_ATTEMPTS, release_items, finish_items, bump_run_counters
+from services.metrics import timed, RESUMES, RUNS_STARTED, RUNS_FINISHED, BATCH_SCORE_FALLBACKS
+
+# Profiles claimed and scored per batch by a talent-pool run
+TALENT_POOL_BATCH_SIZE = int(os.getenv("TALENT_POOL_BATCH_SIZE", "2000"))
+
+_PROFILE_UPDATE_COLUMNS = [
+    "full_name", "email", "phone", "experience_years", "passed_out_year",
+    "extracted_data", "skills", "degrees", "project_domains", "keys_version", "updated_at",
+]
+
+
+def profile_row(resume_id: int, extracted_data: dict, tables=None) -> dict:
+    """candidate_profiles row for one extraction, typed scoring-key columns included."""
+    tables = tables or current_tables()
+    personal = extracted_data.get("personal_details") or {}
+    try:
+        keys = scoring_keys(extracted_data, tables)
+    except Exception:
+        keys = None  # odd shape — talent-pool runs score it from extracted_data
+    keys = keys or {}
+    try:
+        raw_year = extracted_data.get("passed_out_year")
+        passed_out_year = int(raw_year) if raw_year is not None else None
+    except (TypeError, ValueError):
+        passed_out_year = None
+    return {
+        "resume_id":        resume_id,
+        "full_name":        personal.get("full_name"),
+        "email":            personal.get("email"),
+        "phone":            personal.get("phone"),
+        "experience_years": extracted_data.get("experience_years") if keys else None,
+        "passed_out_year":  passed_out_year,
+        "extracted_data":   extracted_data,
+        "skills":           keys.get("skills"),
+        "degrees":          keys.get("degrees"),
+        "project_domains":  keys.get("projects"),
+        "keys_version":     tables.version,
+        "updated_at":       datetime.utcnow(),
+    }
+
+
+def store_profiles(db, rows: list):
+    """Insert or refresh profiles by resume_id, one statement (caller commits)."""
+    by_resume = {row["resume_id"]: row for row in rows}
+    if by_resume:
+        db.execute(
+            upsert(db, CandidateProfile, ["resume_id"], _PROFILE_UPDATE_COLUMNS),
+            list(by_resume.values()),
+        )
+
+
+def profile_conditions(db, skills=(), min_experience: float = None, tables=None) -> list:
+    """
+    WHERE conditions on candidate_profiles for a skill / experience filter,
+    answered from the typed columns (skills is GIN-indexed on Postgres). A
+    skill matches the way scoring matches it: any of its alias targets.
+    """
+    tables = tables or current_tables()
+    conditions = []
+    for skill in filter(str.strip, skills):
+        targets = tables.skill_targets(tables.resolve_skill(skill))
+        conditions.append(array_overlap(db, CandidateProfile.skills, sorted(targets)))
+    if min_experience is not None:
+        conditions.append(CandidateProfile.experience_years >= min_experience)
+    return conditions
+
+
+def enqueue_talent_pool(db, run: ResumeRun) -> int:
+    """
+    Queue one ScreeningItem per candidate profile not yet screened for
+    run.job_id, in a single INSERT ... SELECT. Items carry no bytes; seq is
+    the profile_id. Commits together with run.total_resumes.
+    """
+    screened = exists().where(
+        ResumeResult.resume_id == CandidateProfile.resume_id,
+        ResumeResult.job_id == run.job_id,
+        ResumeResult.extracted_data.isnot(None),
+    )
+    profiles = (
+        select(
+            literal(run.run_id),
+            literal(run.job_id),
+            CandidateProfile.profile_id,
+            ResumeFile.file_name,
+            ResumeFile.file_hash,
+            CandidateProfile.resume_id,
+            literal("pending"),
+            literal(0),
+        )
+        .join_from(CandidateProfile, ResumeFile, ResumeFile.resume_id == CandidateProfile.resume_id)
+        .where(~screened)
+    )
+    total = db.execute(
+        insert(ScreeningItem).from_select(
+            ["run_id", "job_id", "seq", "file_name", "file_hash", "resume_id", "status", "attempts"],
+            profiles,
+        )
+    ).rowcount
+
+    run.total_resumes = total
+    if not total:
+        run.status = "completed"
+        run.ended_at = datetime.utcnow()
+    db.commit()
+    return total
+
+
+def start_talent_pool_run(db, job_id: int) -> ResumeRun:
+    """Create a talent-pool run for `job_id` and queue the profiles."""
+    run = ResumeRun(
+        job_id=job_id,
+        batch_size=TALENT_POOL_BATCH_SIZE,
+        total_resumes=0,
+        processed_count=0,
+        failed_count=0,
+        status="queued",
+        run_type="talent_pool"
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+
+    try:
+        total = enqueue_talent_pool(db, run)
+    except Exception as e:
+        db.rollback()
+        run.status = "crashed"
+        run.ended_at = datetime.utcnow()
+        db.commit()
+        RUNS_FINISHED.labels("crashed").inc()
+        print(f"[RUN {run.run_id}] ❌ Failed to queue talent pool: {e}")
+        raise
+
+    RUNS_STARTED.labels("talent_pool").inc()
+    print(f"[RUN {run.run_id}] Queued {total} candidate profile(s) from the talent pool")
+    return run
+
+
+def _stored_keys(profile):
+    """scoring_keys() as stored in the typed profile columns, or None."""
+    if profile.skills is None:
+        return None
+    return {"skills": profile.skills, "degrees": profile.degrees, "projects": profile.project_domains}
+
+
+def process_talent_pool_batch(db, run_id: int, job_id: int, job_config: dict, items: list):
+    """
+    Score one claimed batch of profiles from the typed scoring-key columns:
+    only experience_years is read out of extracted_data (server-side), and
+    the result rows copy extracted_data inside the INSERT. Whole documents
+    are loaded only for profiles whose keys are missing or were built with
+    older alias tables (rebuilt and written back) and for job configs that
+    cannot be scored in arrays. Results, item statuses and run counters are
+    committed together. On a DB error the batch is rolled back and handed
+    back to the queue.
+    """
+    failed = [
+        {"item_id": item["item_id"], "status": "failed",
+         "error_message": f"Gave up after {MAX_ATTEMPTS} attempts"}
+        for item in items if item["attempts"] > MAX_ATTEMPTS
+    ]
+    live = [item for item in items if item["attempts"] <= MAX_ATTEMPTS]
+
+    try:
+        resume_ids = [item["resume_id"] for item in live]
+        profiles = {
+            row.resume_id: row
+            for row in db.query(
+                CandidateProfile.profile_id,
+                CandidateProfile.resume_id,
+                CandidateProfile.extracted_data["experience_years"].label("raw_experience"),
+                CandidateProfile.skills,
+                CandidateProfile.degrees,
+                CandidateProfile.project_domains,
+                CandidateProfile.keys_version,
+            ).filter(CandidateProfile.resume_id.in_(resume_ids))
+        }
+        # Screened for this job since the run was queued
+        screened = {
+            resume_id for (resume_id,) in db.query(ResumeResult.resume_id).filter(
+                ResumeResult.resume_id.in_(resume_ids),
+                ResumeResult.job_id == job_id,
+                ResumeResult.extracted_data.isnot(None),
+            )
+        }
+
+        job = compile_job(job_config)
+        tables = job.tables
+        done, rows = [], []
+        for item in live:
+            profile = profiles.get(item["resume_id"])
+            if profile is None:
+                failed.append({"item_id": item["item_id"], "status": "failed",
+                               "error_message": "Candidate profile no longer exists"})
+                continue
+            if item["resume_id"] in screened:
+                done.append({"item_id": item["item_id"], "status": "done"})
+                continue
+            rows.append((item, profile))
+
+        needs_document = {
+            p.resume_id for _, p in rows
+            if not job.vectorizable or p.keys_version != tables.version or p.skills is None
+        }
+        documents = _load_documents(db, needs_document)
+
+        resumes, keys, refreshed = [], [], []
+        for _, profile in rows:
+            document = documents.get(profile.resume_id)
+            if document is None:
+                # Only experience_years is read outside the keys (eligibility + reason)
+                resumes.append({"experience_years": profile.raw_experience})
+                keys.append(_stored_keys(profile))
+                continue
+            row_keys = _stored_keys(profile)
+            if profile.keys_version != tables.version:
+                try:
+                    row_keys = scoring_keys(document, tables)
+                except Exception:
+                    row_keys = None
+                refreshed.append({
+                    "profile_id":      profile.profile_id,
+                    "skills":          row_keys and row_keys["skills"],
+                    "degrees":         row_keys and row_keys["degrees"],
+                    "project_domains": row_keys and row_keys["projects"],
+                    "keys_version":    tables.version,
+                })
+            resumes.append(document)
+            keys.append(row_keys)
+
+        try:
+            with timed("score_batch"):
+                matrix = CandidateMatrix(resumes, tables, keys)
+                results = list(matrix.score(job).results())
+        except Exception as e:
+            # A profile the scorer raises on — score one by one so only it fails
+            BATCH_SCORE_FALLBACKS.labels("talent_pool").inc()
+            print(f"[RUN {run_id}] ⚠️ Batch scoring of {len(rows)} profile(s) failed, scoring one by one: {e}")
+            documents.update(_load_documents(db, {p.resume_id for _, p in rows} - set(documents)))
+            results = []
+            for _, profile in rows:
+                try:
+                    results.append(job.score(documents[profile.resume_id]))
+                except Exception as e:
+                    results.append(e)
+
+        inserts = []
+        for (item, profile), result in zip(rows, results):
+            if isinstance(result, Exception):
+                failed.append({"item_id": item["item_id"], "status": "failed", "error_message": str(result)})
+                continue
+            score, reason, disqualified = result
+            inserts.append({
+                "resume_id":       profile.resume_id,
+                "score":           score,
+                "decision":        "rejected" if disqualified or score < 60 else "shortlisted",
+                "decision_reason": reason,
+            })
+            done.append({"item_id": item["item_id"], "status": "done"})
+
+        if refreshed:
+            db.execute(update(CandidateProfile), refreshed)
+        if inserts:
+            _insert_results(db, run_id, job_id, inserts)
+        finish_items(db, done + failed)
+        bump_run_counters(db, run_id, processed=len(done), failed=len(failed))
+        with timed("commit"):
+            db.commit()
+
+    except Exception:
+        db.rollback()
+        release_items(db, [item["item_id"] for item in items])
+        db.commit()
+        raise
+
+    RESUMES.labels("done").inc(len(done))
+    RESUMES.labels("failed").inc(len(failed))
+    print(f"[RUN {run_id}] Talent pool: scored {len(done)} profile(s), {len(failed)} failed")
+
+
+def _load_documents(db, resume_ids: set) -> dict:
+    """Full extracted_data of the given profiles, by resume_id."""
+    if not resume_ids:
+        return {}
+    return dict(
+        db.query(CandidateProfile.resume_id, CandidateProfile.extracted_data)
+        .filter(CandidateProfile.resume_id.in_(resume_ids))
+        .all()
+    )
+
+
+_PROFILE_RESULT_COLUMNS = ["extracted_data", "full_name", "email", "phone", "passed_out_year"]
+
+
+def _insert_results(db, run_id: int, job_id: int, scored: list):
+    """
+    Insert one result row per scored profile. The profile's extracted_data,
+    contact details and passed_out_year are copied inside the statement,
+    never loaded. On Postgres that is one INSERT ... SELECT joining the
+    unnest()ed scores to candidate_profiles; elsewhere a per-row subquery.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        rows = func.unnest(
+            bindparam("resume_ids", [r["resume_id"] for r in scored], type_=ARRAY(Integer)),
+            bindparam("scores", [r["score"] for r in scored], type_=ARRAY(Integer)),
+            bindparam("decisions", [r["decision"] for r in scored], type_=ARRAY(Text)),
+            bindparam("reasons", [r["decision_reason"] for r in scored], type_=ARRAY(Text)),
+        ).table_valued("resume_id", "score", "decision", "decision_reason").render_derived()
+        db.execute(insert(ResumeResult).from_select(
+            ["run_id", "job_id", "ai_status", "resume_id", "score", "decision", "decision_reason",
+             *_PROFILE_RESULT_COLUMNS],
+            select(
+                literal(run_id), literal(job_id), literal("success"),
+                rows.c.resume_id, rows.c.score, rows.c.decision, rows.c.decision_reason,
+                *(getattr(CandidateProfile, c) for c in _PROFILE_RESULT_COLUMNS),
+            ).join_from(rows, CandidateProfile, CandidateProfile.resume_id == rows.c.resume_id),
+        ))
+        return
+
+    def profile(column):
+        return (
+            select(getattr(CandidateProfile, column))
+            .where(CandidateProfile.resume_id == bindparam("profile_resume_id"))
+            .scalar_subquery()
+        )
+
+    db.execute(
+        insert(ResumeResult).values({c: profile(c) for c in _PROFILE_RESULT_COLUMNS}),
+        [dict(r, run_id=run_id, job_id=job_id, ai_status="success", profile_resume_id=r["resume_id"])
+         for r in scored],
+    )
@@ -0,0 +1,128 @@
+"""
+PDF / DOCX → plain text. Kept free of DB and Groq imports so it is cheap to
+load in the text-extraction worker processes (see screening_worker).
+
+PDFs go through PDF_EXTRACTORS in order: a fast text-only backend first,
+pdfplumber (full layout analysis) only when the fast one yields too little.
+"""
+
+import io
+import os
+import time
+import logging
+import threading
+import pdfplumber
+from docx import Document
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # fast path unavailable — pdfplumber only
+    pdfium = None
+
+logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+# Tried in order; unknown or uninstalled names are skipped
+PDF_EXTRACTORS = [
+    name.strip()
+    for name in os.getenv("PDF_EXTRACTORS", "pypdfium2,pdfplumber").split(",")
+    if name.strip()
+]
+
+# Fewer non-whitespace characters than this → try the next extractor
+# (scanned pages, text drawn as vector paths, broken encodings, ...)
+PDF_MIN_TEXT_CHARS = int(os.getenv("PDF_MIN_TEXT_CHARS", "200"))
+
+# pdfium is not thread-safe; only matters when parsing on the AI threads
+_pdfium_lock = threading.Lock()
+
+
+def extract_text_from_pdf(source) -> str:
+    """`source` is a file path or a binary file-like object."""
+    text = []
+    with pdfplumber.open(source) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text.append(page_text)
+    return "\f".join(text)
+
+
+def extract_text_from_pdf_fast(content: bytes) -> str:
+    """Text-only extraction with pdfium — no per-character layout analysis."""
+    text = []
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(content)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_bounded()
+                textpage.close()
+                page.close()
+                if page_text:
+                    text.append(page_text.replace("\r\n", "\n"))
+        finally:
+            pdf.close()
+    return "\f".join(text)
+
+
+def extract_text_from_docx(source) -> str:
+    """`source` is a file path or a binary file-like object."""
+    doc = Document(source)
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+def _pdfplumber_text(content: bytes) -> str:
+    return extract_text_from_pdf(io.BytesIO(content))
+
+
+_PDF_BACKENDS = {"pdfplumber": _pdfplumber_text}
+if pdfium is not None:
+    _PDF_BACKENDS["pypdfium2"] = extract_text_from_pdf_fast
+
+
+def _pdf_text(content: bytes) -> tuple:
+    """
+    (text, extractor) from the first backend that yields enough text. If none
+    does, the longest text wins. A backend that raises is skipped unless it
+    is the last one left.
+    """
+    backends = [name for name in PDF_EXTRACTORS if name in _PDF_BACKENDS] or ["pdfplumber"]
+    best, best_name = "", backends[0]
+    for i, name in enumerate(backends):
+        label = name if i == 0 else f"{name} (fallback)"
+        try:
+            text = _PDF_BACKENDS[name](content)
+        except Exception:
+            if i == len(backends) - 1 and not best:
+                raise
+            continue
+        chars = len("".join(text.split()))
+        if chars >= PDF_MIN_TEXT_CHARS:
+            return text, label
+        if chars > len("".join(best.split())):
+            best, best_name = text, label
+    return best, best_name
+
+
+def extract_text(resume_path: str, content: bytes = None) -> tuple:
+    """
+    (text, extractor, elapsed_ms) for one resume. When `content` is given it
+    is parsed in memory and `resume_path` is only used for its extension.
+    PDF pages are separated by form feeds ("\\f"), so page headers and
+    footers can be told apart from the body (see resume_processor).
+    Runs in a worker process when screening, so arguments and return value
+    must stay picklable.
+    """
+    if content is None:
+        with open(resume_path, "rb") as f:
+            content = f.read()
+
+    started = time.perf_counter()
+    if resume_path.lower().endswith(".pdf"):
+        text, extractor = _pdf_text(content)
+    elif resume_path.lower().endswith(".docx"):
+        text, extractor = extract_text_from_docx(io.BytesIO(content)), "python-docx"
+    else:
+        raise Exception("Unsupported format")
+
+    return text, extractor, round((time.perf_counter() - started) * 1000)
@@ -0,0 +1,45 @@
+"""
+Standalone screening worker — drains the `screening_items` queue.
+
+Run any number of these, on one machine or many, against the same database:
+    cd backend
+    python worker.py
+
+At least one must run for screening runs to progress (the API only queues
+them, unless SCREENING_INLINE_WORKER=1 for single-process development).
+With SCREENING_METRICS_PORT set, Prometheus metrics are served on
+http://<host>:<port>/metrics (no API key — keep the port internal).
+SIGTERM / Ctrl+C finish the batch in progress, then exit; anything left
+unfinished is reclaimed by another worker after SCREENING_LEASE_SECONDS.
+"""
+
+import os
+import signal
+import threading
+from prometheus_client import start_http_server
+
+from services.screening_worker import run_worker
+
+# Port for this worker's Prometheus metrics; 0 serves none
+METRICS_PORT = int(os.getenv("SCREENING_METRICS_PORT", "0"))
+
+
+def main():
+    stop_event = threading.Event()
+
+    def _stop(signum, frame):
+        print("Stopping after the current batch...")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+        print(f"[WORKER] Metrics on :{METRICS_PORT}/metrics")
+
+    run_worker(stop_event=stop_event)
+
+
+if __name__ == "__main__":
+    main()
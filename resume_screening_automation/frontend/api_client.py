@@ -1,3 +1,4 @@
+import json
 import requests
 import streamlit as st
 
@@ -12,12 +13,13 @@ def get_headers():
     }
 
 
-def create_job(job_title, job_config):
+def create_job(job_title, job_config, score_talent_pool=False):
     response = requests.post(
         f"{BACKEND_URL}/jobs",
         json={
             "job_title": job_title,
-            "job_config": job_config
+            "job_config": job_config,
+            "score_talent_pool": score_talent_pool
         },
         headers=get_headers(),
         timeout=30
@@ -57,10 +59,14 @@ def get_job(job_id):
     return response.json()
 
 
-def update_job(job_id, job_title, job_config):
+def update_job(job_id, job_title, job_config, score_talent_pool=False):
     response = requests.patch(
         f"{BACKEND_URL}/jobs/{job_id}",
-        json={"job_title": job_title, "job_config": job_config},
+        json={
+            "job_title": job_title,
+            "job_config": job_config,
+            "score_talent_pool": score_talent_pool
+        },
         headers=get_headers(),
         timeout=30
     )
@@ -78,6 +84,48 @@ def get_run_status(run_id):
     return response.json()
 
 
+def stream_run_events(run_id, stop=None):
+    """
+    Follow a run's Server-Sent Events stream. Yields (event, data) as the
+    backend pushes them, until the run finishes and the stream closes, or
+    until `stop` (a threading.Event) is set — checked on every line, so
+    within one of the server's 15s keepalives. The read timeout only has
+    to outlast those keepalives.
+    """
+    with requests.get(
+        f"{BACKEND_URL}/screening/runs/{run_id}/events",
+        headers=get_headers(),
+        stream=True,
+        timeout=(10, 60)
+    ) as response:
+        response.raise_for_status()
+        event, data = "message", []
+        for line in response.iter_lines(decode_unicode=True):
+            if stop is not None and stop.is_set():
+                return
+            if not line:
+                # A blank line ends one event
+                if data:
+                    yield event, json.loads("\n".join(data))
+                event, data = "message", []
+            elif line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].strip())
+            # lines starting with ":" are keepalive comments
+
+
+def rescore_job(job_id):
+    """Re-score candidates from earlier versions of a job — no ZIP, no AI calls."""
+    response = requests.post(
+        f"{BACKEND_URL}/screening/rescore/{job_id}",
+        headers=get_headers(),
+        timeout=120
+    )
+    response.raise_for_status()
+    return response.json()
+
+
 def update_decision(result_id: int, decision: str):
     """Update the decision for a screening result (HR override)."""
     response = requests.patch(
@@ -1,8 +1,9 @@
 import streamlit as st
 import json
 import requests
-from api_client import create_job, get_jobs, get_job, generate_job_config_ai, update_job, get_headers, get_run_status, update_decision
+from api_client import create_job, get_jobs, get_job, generate_job_config_ai, update_job, get_headers, update_decision, rescore_job
 from email_db_client import get_session, seed_candidate
+from run_progress import follow_run
 import pandas as pd
 from io import BytesIO
 
@@ -105,6 +106,15 @@ def login_page():
 
 
 
+def show_talent_pool_run(result):
+    """Report the talent-pool run a saved job queued (or why it could not be queued)."""
+    if result.get("run_id"):
+        st.session_state.current_run_id = result["run_id"]
+        st.info(f"Talent pool scoring started — Run ID {result['run_id']} (progress on the Resume Screening tab)")
+    elif result.get("talent_pool_error"):
+        st.warning(f"Talent pool scoring could not be queued: {result['talent_pool_error']} — retry with POST /screening/talent-pool/{result['job_id']}")
+
+
 if not st.session_state.logged_in:
     login_page()
     st.stop()
@@ -172,6 +182,12 @@ with tab2:
                 key="new_job_config_text"
             )
 
+            score_talent_pool = st.checkbox(
+                "Also score every candidate already in the talent pool",
+                help="Scores all previously screened candidates against this job in the background. No AI calls.",
+                key="new_job_talent_pool"
+            )
+
             with col2:
                 if st.button("Save Job Config", key="save_new"):
                     if not job_title:
@@ -179,8 +195,9 @@ with tab2:
                     else:
                         try:
                             final_job_config = json.loads(job_config_text)
-                            result = create_job(job_title, final_job_config)
+                            result = create_job(job_title, final_job_config, score_talent_pool)
                             st.success(f"Job config saved (ID: {result['job_id']})")
+                            show_talent_pool_run(result)
                             st.session_state.job_config = None
                         except json.JSONDecodeError:
                             st.error("Invalid JSON format")
@@ -234,6 +251,12 @@ with tab2:
                     key="update_method"
                 )
 
+                update_talent_pool = st.checkbox(
+                    "Also score every candidate already in the talent pool",
+                    help="Scores all previously screened candidates against the new version in the background. No AI calls.",
+                    key="update_job_talent_pool"
+                )
+
                 if update_method == "Edit JSON directly":
                     st.caption(
                         "**Experience fields:** `required_experience_years` sets the minimum (e.g. `1`). "
@@ -252,10 +275,11 @@ with tab2:
                     if st.button("Save Updated Job Config", key="save_update_json"):
                         try:
                             final_config = json.loads(updated_config_text)
-                            result = update_job(selected_job_id, updated_title, final_config)
+                            result = update_job(selected_job_id, updated_title, final_config, update_talent_pool)
                             st.success(
                                 f"Updated! New Job ID: {result['job_id']} — Version: v{result['version']}"
                             )
+                            show_talent_pool_run(result)
                             st.session_state.job_config = None
                             st.session_state.edit_job_id = None
                         except json.JSONDecodeError:
@@ -297,10 +321,11 @@ with tab2:
                         if st.button("Save as New Version", key="save_update_ai"):
                             try:
                                 final_config = json.loads(reviewed_config_text)
-                                result = update_job(selected_job_id, updated_title, final_config)
+                                result = update_job(selected_job_id, updated_title, final_config, update_talent_pool)
                                 st.success(
                                     f"Updated! New Job ID: {result['job_id']} — Version: v{result['version']}"
                                 )
+                                show_talent_pool_run(result)
                                 st.session_state.job_config = None
                                 st.session_state.edit_job_id = None
                                 st.session_state.update_generated_config = None
@@ -365,7 +390,8 @@ with tab1:
                     files=files,
                     data=data,
                     headers=get_headers(),
-                    timeout=30
+                    # upload + queueing every resume happen before the response
+                    timeout=120
                 )
 
                 if res.status_code == 200:
@@ -383,33 +409,65 @@ with tab1:
                 st.error(f"Error calling backend: {e}")
                 st.session_state.screening_started = False
 
-    # ---------- Live Progress (30s polling) ----------
+    # ---------- Re-score after a job update ----------
+    if st.button(
+        "Re-score Previous Candidates",
+        help="Score everyone screened under earlier versions of this job against its current config. "
+             "No upload needed and no AI calls are made."
+    ):
+        try:
+            response = rescore_job(selected_job_id)
+            st.session_state.current_run_id = response["run_id"]
+            st.success(f"Re-score started ✅ — {response['total_resumes']} candidates")
+            st.markdown(f"**Run ID:** {response['run_id']}")
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 400:
+                st.warning("This job has no previous versions to re-score from")
+            else:
+                st.error(f"Error calling backend: {e}")
+        except Exception as e:
+            st.error(f"Error calling backend: {e}")
+
+    # ---------- Live Progress (pushed by the backend's event stream) ----------
     if st.session_state.current_run_id:
 
-        @st.fragment(run_every=30)
+        # Redraws from the tracker's memory only — no backend call per refresh
+        @st.fragment(run_every=2)
         def show_run_progress():
             run_id = st.session_state.current_run_id
             if not run_id:
                 return
-            try:
-                status = get_run_status(run_id)
-                total      = status["total_resumes"] or 1
-                processed  = status["processed_count"]
-                failed     = status["failed_count"]
-                run_status = status["status"]
-
-                if run_status == "completed":
-                    st.success(f"✅ Run {run_id} complete — {processed} processed · {failed} failed")
-                    st.session_state.current_run_id = None
-                elif run_status == "crashed":
-                    st.error(f"❌ Run {run_id} crashed — {processed} processed · {failed} failed")
-                    st.session_state.current_run_id = None
+            status, recent, error = follow_run(run_id).snapshot()
+            if status is None:
+                st.caption(f"Connecting to run {run_id}... {error or ''}")
+                return
+
+            total      = status["total_resumes"] or 1
+            processed  = status["processed_count"]
+            failed     = status["failed_count"]
+            run_status = status["status"]
+
+            if run_status == "completed":
+                # current_run_id stays set so the outcome stays on screen;
+                # a finished tracker makes no further backend calls
+                st.success(f"✅ Run {run_id} complete — {processed} processed · {failed} failed")
+            elif run_status == "crashed":
+                st.error(f"❌ Run {run_id} crashed — {processed} processed · {failed} failed")
+            elif run_status == "queued":
+                st.caption(f"🕒 Run {run_id} queued — {total} resumes waiting for a worker")
+            else:
+                progress_val = (processed + failed) / total if total > 0 else 0
+                st.progress(min(progress_val, 1.0))
+                st.caption(f"⏳ Run {run_id} — {processed} / {total} processed · {failed} failed")
+                if error:
+                    st.caption(f"Reconnecting to live updates... ({error})")
+
+            # Latest per-resume outcomes, newest first
+            for item in recent:
+                if item["status"] == "failed":
+                    st.caption(f"⚠️ {item['file_name']} — failed: {item['error'] or 'unknown error'}")
                 else:
-                    progress_val = processed / total if total > 0 else 0
-                    st.progress(progress_val)
-                    st.caption(f"⏳ Run {run_id} — {processed} / {total} processed · {failed} failed")
-            except Exception:
-                st.caption("Checking run status...")
+                    st.caption(f"📄 {item['file_name']} — {item['score']} · {item['decision'] or item['ai_status']}")
 
         show_run_progress()
 
@@ -435,38 +493,6 @@ with tab3:
     )
     selected_job_id = job_options[selected_job]
 
-    # ----------------------------
-    # FETCH DATA (ONCE PER JOB)
-    # ----------------------------
-
-    @st.cache_data(ttl=300)
-    def fetch_all_results(job_id, limit=500, offset=0):
-        res = requests.get(
-            f"{BACKEND_URL}/screening/results/{job_id}",
-            params={"limit": limit, "offset": offset},
-            headers=get_headers(),
-            timeout=30
-        )
-        if res.status_code != 200:
-            return pd.DataFrame()
-        return pd.DataFrame(res.json())
-
-    df = fetch_all_results(selected_job_id)
-
-    if df.empty:
-        st.info("No results found for this job.")
-        st.stop()
-
-    # Convert datetime safely
-    if "processed_at" in df.columns:
-        df["processed_at"] = pd.to_datetime(df["processed_at"])
-
-    # Convert passed_out_year to nullable int (avoids 2025.0 display)
-    if "passed_out_year" in df.columns:
-        df["passed_out_year"] = pd.to_numeric(
-            df["passed_out_year"], errors="coerce"
-        ).astype("Int64")
-
     # ----------------------------
     # FILTERS
     # ----------------------------
@@ -503,6 +529,24 @@ with tab3:
             key="results_year_filter"
         )
 
+    col5, col6 = st.columns(2)
+
+    with col5:
+        skills_filter = st.text_input(
+            "Has Skills (comma-separated)",
+            key="results_skills_filter",
+            placeholder="e.g. python, sql"
+        )
+
+    with col6:
+        min_experience = st.number_input(
+            "Min Experience (yrs)",
+            min_value=0.0,
+            step=0.5,
+            value=0.0,
+            key="results_min_experience"
+        )
+
     min_score = st.slider(
         "Minimum Score",
         0,
@@ -518,44 +562,67 @@ with tab3:
     )
 
     # ----------------------------
-    # LOCAL FILTERING
+    # FETCH DATA (filtered + sorted by the backend)
     # ----------------------------
 
-    filtered_df = df.copy()
+    _SORTS = {
+        "Recently Processed": "recent",
+        "Score: High to Low": "score_desc",
+        "Score: Low to High": "score_asc",
+    }
 
+    filters = {"sort": _SORTS[sort_order], "min_score": min_score}
     if from_date:
-        filtered_df = filtered_df[
-            filtered_df["processed_at"] >= pd.to_datetime(from_date)
-        ]
-
+        filters["from_date"] = from_date.isoformat()
     if to_date:
-        filtered_df = filtered_df[
-            filtered_df["processed_at"] < pd.to_datetime(to_date) + pd.Timedelta(days=1)
-        ]
-
+        filters["to_date"] = to_date.isoformat()
     if decision_filter != "All":
-        filtered_df = filtered_df[
-            filtered_df["decision"] == decision_filter
-        ]
-
-    if year_filter != "All" and "passed_out_year" in filtered_df.columns:
-        min_year = int(year_filter.split("&")[0].strip())
-        filtered_df = filtered_df[
-            filtered_df["passed_out_year"].notna() &
-            (filtered_df["passed_out_year"] >= min_year)
-        ]
-
-    filtered_df = filtered_df[
-        filtered_df["score"] >= min_score
-    ]
+        filters["decision"] = decision_filter
+    if year_filter != "All":
+        filters["min_passed_out_year"] = int(year_filter.split("&")[0].strip())
+    skills = [s.strip() for s in skills_filter.split(",") if s.strip()]
+    if skills:
+        filters["skills"] = skills
+    if min_experience > 0:
+        filters["min_experience"] = min_experience
 
-    if sort_order == "Recently Processed":
-        filtered_df = filtered_df.sort_values(by="processed_at", ascending=False)
-    else:
-        filtered_df = filtered_df.sort_values(
-            by="score",
-            ascending=(sort_order == "Score: Low to High")
-        )
+    @st.cache_data(ttl=300)
+    def fetch_all_results(job_id, filters, page_size=500):
+        """Every matching result, one keyset page at a time."""
+        rows = []
+        cursor = None
+        while True:
+            params = dict(filters, limit=page_size)
+            if cursor:
+                params["cursor"] = cursor
+            res = requests.get(
+                f"{BACKEND_URL}/screening/results/{job_id}",
+                params=params,
+                headers=get_headers(),
+                timeout=30
+            )
+            if res.status_code != 200:
+                return pd.DataFrame()
+            rows.extend(res.json())
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                return pd.DataFrame(rows)
+
+    filtered_df = fetch_all_results(selected_job_id, filters)
+
+    if filtered_df.empty:
+        st.info("No results found for this job and filters.")
+        st.stop()
+
+    # Convert datetime safely
+    if "processed_at" in filtered_df.columns:
+        filtered_df["processed_at"] = pd.to_datetime(filtered_df["processed_at"])
+
+    # Convert passed_out_year to nullable int (avoids 2025.0 display)
+    if "passed_out_year" in filtered_df.columns:
+        filtered_df["passed_out_year"] = pd.to_numeric(
+            filtered_df["passed_out_year"], errors="coerce"
+        ).astype("Int64")
 
     # ----------------------------
     # SUMMARY METRICS
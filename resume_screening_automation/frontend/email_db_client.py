@@ -83,14 +83,38 @@ class EmailQueue(Base):
 
 # ── Engine / Session ───────────────────────────────────────────────────────────
 
+@st.cache_resource
 def get_engine():
-    return create_engine(st.secrets["DATABASE_URL"], pool_pre_ping=True)
+    """
+    One pooled engine per Streamlit server process, shared by every session
+    and rerun. Pool settings are optional secrets with the same names as the
+    backend's env vars (see backend/db/session.py).
+    """
+    connect_args = {}
+    statement_timeout = int(st.secrets.get("DB_STATEMENT_TIMEOUT_MS", 60000))
+    if statement_timeout and not st.secrets.get("DB_PGBOUNCER", False):
+        connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+
+    engine = create_engine(
+        st.secrets["DATABASE_URL"],
+        pool_size=int(st.secrets.get("DB_POOL_SIZE", 5)),
+        max_overflow=int(st.secrets.get("DB_MAX_OVERFLOW", 10)),
+        pool_timeout=float(st.secrets.get("DB_POOL_TIMEOUT", 30)),
+        pool_recycle=int(st.secrets.get("DB_POOL_RECYCLE", 300)),
+        pool_pre_ping=bool(st.secrets.get("DB_POOL_PRE_PING", True)),
+        connect_args=connect_args,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@st.cache_resource
+def _session_factory():
+    return sessionmaker(bind=get_engine())
 
 
 def get_session():
-    engine = get_engine()
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine)()
+    return _session_factory()()
 
 
 # ── EmailLog helpers ───────────────────────────────────────────────────────────
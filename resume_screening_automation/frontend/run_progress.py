@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict, deque
+import requests
+from api_client import stream_run_events
+
+# Per-resume outcomes kept for the progress panel
+RECENT_ITEMS = 10
+
+# Seconds before a dropped event stream is reopened
+RECONNECT_SECONDS = 3
+
+# Runs followed at once by this Streamlit server; the least recently viewed
+# tracker is stopped beyond this
+MAX_TRACKERS = 50
+
+
+class RunProgress:
+    """
+    Latest state of one run, kept current by a background thread that holds
+    the run's event stream open. Pages read it from memory, so any number of
+    sessions watching a run cost the backend one connection.
+    """
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.state = None
+        self.recent = deque(maxlen=RECENT_ITEMS)
+        self.error = None
+        self.finished = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._follow, name=f"run-{run_id}-events", daemon=True).start()
+
+    def _follow(self):
+        while not self.finished and not self._stopped.is_set():
+            try:
+                # Every (re)connect starts with the full run state, so
+                # nothing is lost while the stream was down
+                for event, data in stream_run_events(self.run_id, stop=self._stopped):
+                    with self._lock:
+                        self.recent.extendleft(data.pop("items", []))
+                        self.state = data
+                        self.error = None
+                        self.finished = event == "done"
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    with self._lock:
+                        self.error = "Run not found"
+                        self.finished = True
+                    return
+                self.error = str(e)
+            except Exception as e:
+                self.error = str(e)
+            if not self.finished:
+                self._stopped.wait(RECONNECT_SECONDS)
+
+    def stop(self):
+        """Close the event stream and end the thread (within one server keepalive)."""
+        self._stopped.set()
+
+    def snapshot(self):
+        """(run state or None before the first event, newest items first, last error)."""
+        with self._lock:
+            return self.state, list(self.recent), self.error
+
+
+_trackers = OrderedDict()
+_trackers_lock = threading.Lock()
+
+
+def follow_run(run_id) -> RunProgress:
+    """
+    One shared tracker per run for this Streamlit server. At most
+    MAX_TRACKERS are kept; the least recently viewed one beyond that is
+    stopped, so its thread and connection do not outlive it.
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(run_id)
+        if tracker is None:
+            tracker = _trackers[run_id] = RunProgress(run_id)
+        _trackers.move_to_end(run_id)
+        while len(_trackers) > MAX_TRACKERS:
+            _, evicted = _trackers.popitem(last=False)
+            evicted.stop()
+        return tracker
@@ -0,0 +1,141 @@
+"""
+GET /screening/results/{job_id} paged with X-Next-Cursor must return every
+scored result exactly once, in the sort's order, for every sort, and the
+profile skill filter must select the same candidates on SQLite as on Postgres.
+
+Usage:
+    cd Resume-Screening
+    python -m pytest tests/test_results_pagination.py
+
+Runs against a scratch SQLite database. Results are written both with an
+explicit processed_at (as the worker does) and with the server default (as
+the talent pool's INSERT ... SELECT does), with many rows on the same second
+and the same score, so every page boundary falls inside a tie.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent / "resume_screening_automation" / "backend"
+sys.path.insert(0, str(BACKEND))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/pagination.db"
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from api.screening import RESULT_SORTS, router  # noqa: E402
+from db.models import Base, CandidateProfile, JobConfig, ResumeFile, ResumeResult, ResumeRun  # noqa: E402
+from db.session import SessionLocal, engine  # noqa: E402
+
+ROWS = 300
+PAGE = 7
+# Resolved skills per profile, cycled; None = keys not built yet
+SKILLS = [["python", "sql"], ["java"], None, ["sql"]]
+
+
+@pytest.fixture(scope="module")
+def client():
+    Base.metadata.create_all(engine)
+    rnd = random.Random(3)
+    db = SessionLocal()
+    job = JobConfig(job_title="Backend Engineer", job_config={})
+    db.add(job)
+    db.commit()
+    run = ResumeRun(job_id=job.job_id, batch_size=10, total_resumes=ROWS)
+    db.add(run)
+    db.commit()
+    db.execute(insert(ResumeFile), [{"file_name": f"r{i}.pdf", "file_hash": f"h{i}"} for i in range(ROWS)])
+
+    base = datetime(2026, 10, 1, 9, 30)
+    rows = [
+        {
+            "run_id": run.run_id,
+            "job_id": job.job_id,
+            "resume_id": i + 1,
+            "ai_status": "success",
+            "score": None if i % 20 == 0 else rnd.choice([40, 55, 70]),
+            "decision": rnd.choice(["shortlisted", "rejected"]),
+            "processed_at": base + timedelta(seconds=rnd.randint(0, 5), microseconds=rnd.choice([0, 250000])),
+        }
+        for i in range(ROWS // 2)
+    ]
+    db.execute(insert(ResumeResult), rows)
+    # The server default: every row of the statement on the same second
+    defaulted = [dict(row, resume_id=row["resume_id"] + ROWS // 2) for row in rows]
+    for row in defaulted:
+        del row["processed_at"]
+    db.execute(insert(ResumeResult), defaulted)
+    db.execute(insert(CandidateProfile), [
+        {"resume_id": i + 1, "extracted_data": {}, "skills": SKILLS[i % len(SKILLS)]}
+        for i in range(ROWS)
+    ])
+    db.commit()
+    job_id = job.job_id
+    db.close()
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        client.job_id = job_id
+        yield client
+
+
+def expected_ids(sort: str) -> list:
+    key_column, descending = RESULT_SORTS[sort]
+    db = SessionLocal()
+    try:
+        rows = db.query(ResumeResult.result_id, key_column).filter(key_column.isnot(None)).all()
+    finally:
+        db.close()
+    rows.sort(key=lambda row: (row[1], row.result_id), reverse=descending)
+    return [row.result_id for row in rows]
+
+
+@pytest.mark.parametrize("sort", sorted(RESULT_SORTS))
+def test_pages_cover_every_result_once(client, sort):
+    seen, cursor = [], None
+    for _ in range(ROWS):
+        params = {"sort": sort, "limit": PAGE}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/screening/results/{client.job_id}", params=params)
+        assert response.status_code == 200
+        seen += [row["result_id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == expected_ids(sort)
+
+
+def test_cursor_is_tied_to_its_sort(client):
+    response = client.get(f"/screening/results/{client.job_id}", params={"sort": "recent", "limit": PAGE})
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(f"/screening/results/{client.job_id}", params={"sort": "score_desc", "cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("skills", [["python"], ["sql"], ["python", "sql"], ["rust"]])
+def test_skill_filter_matches_profiles(client, skills):
+    response = client.get(
+        f"/screening/results/{client.job_id}",
+        params={"sort": "score_desc", "limit": ROWS, "skills": skills},
+    )
+    assert response.status_code == 200
+    db = SessionLocal()
+    try:
+        resume_ids = dict(db.query(ResumeResult.result_id, ResumeResult.resume_id))
+    finally:
+        db.close()
+    wanted = {
+        result_id for result_id in expected_ids("score_desc")
+        if set(skills) <= set(SKILLS[(resume_ids[result_id] - 1) % len(SKILLS)] or ())
+    }
+    assert {row["result_id"] for row in response.json()} == wanted